@@ -0,0 +1,283 @@
+"""
+Benchmarks do pipeline de minimização.
+
+Mede separadamente cada etapa do pipeline sobre gramáticas sintéticas
+(ver geradores.py) e compara com os resultados de referência guardados
+em referencia.json, para detectar regressões de desempenho.
+
+Etapas medidas:
+    parsear_gramatica, converter_gramatica_para_afn, determinizar_afn,
+    remover_inalcancaveis, minimizar_afd_poco_implicito (minimizar_afd
+    com poço implícito, como no pipeline de main.py) e reconhecer_palavra
+    (sobre um conjunto fixo de palavras aleatórias)
+
+Para comparação, mede também o caminho com poço explícito, que o
+pipeline não usa mais: completar_com_estado_poco, minimizar_afd e
+remover_estado_poco, a partir do mesmo AFD sem inalcançáveis.
+
+Uso: python benchmarks/executar.py [--salvar] [--repeticoes=N]
+                                   [--tolerancia=0.3] [--caso=nome]
+    - Sem --salvar: executa os casos e, se existir referencia.json,
+      compara com ela; sai com código 1 se alguma etapa ficou mais lenta
+      que a referência além da tolerância (relativa). Sem referência, só
+      mostra os tempos
+    - Com --salvar: grava os resultados como nova referência
+
+referencia.json não faz parte do repositório (está no .gitignore): os
+tempos dependem da máquina, então cada máquina grava a sua referência
+com --salvar antes de comparar.
+
+Cada tempo é o menor entre 'repeticoes' rodadas do pipeline inteiro, o
+que reduz o ruído de outros processos da máquina. A cada rodada é medida
+também uma carga de calibração fixa (Python puro, sem código do projeto); a
+comparação usa os tempos divididos pela calibração, o que compensa
+variações de velocidade da máquina entre uma execução e outra. Ainda
+assim, as referências só são realmente comparáveis na mesma máquina.
+"""
+
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+# Permite importar os módulos do projeto ao executar o script diretamente
+DIRETORIO_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DIRETORIO_BENCHMARKS))
+
+from gramatica import parsear_gramatica
+from conversao import converter_gramatica_para_afn, determinizar_afn
+from minimizacao import remover_inalcancaveis, completar_com_estado_poco, minimizar_afd, remover_estado_poco
+from automato import reconhecer_palavra
+
+import geradores
+
+
+# Arquivo com os resultados de referência
+ARQUIVO_REFERENCIA = os.path.join(DIRETORIO_BENCHMARKS, 'referencia.json')
+
+REPETICOES_PADRAO = 9
+TOLERANCIA_PADRAO = 0.3
+
+# Etapas abaixo deste tempo (em segundos) não são comparadas: o ruído
+# de medição é maior que qualquer diferença real
+TEMPO_MINIMO_COMPARACAO = 0.001
+
+# Tamanho da carga de calibração
+TAMANHO_CALIBRACAO = 200000
+
+# Palavras reconhecidas por caso na etapa reconhecer_palavra
+NUM_PALAVRAS = 2000
+COMPRIMENTO_MAXIMO_PALAVRA = 40
+
+# Casos: nome → texto da gramática
+CASOS = {
+    'aleatoria_100': lambda: geradores.gramatica_aleatoria(100, 4, semente=1),
+    'aleatoria_2000': lambda: geradores.gramatica_aleatoria(2000, 8, producoes_por_nao_terminal=2, semente=2),
+    'cadeia_5000': lambda: geradores.gramatica_cadeia(5000),
+    'explosao_12': lambda: geradores.gramatica_explosao(12),
+    'alfabeto_300': lambda: geradores.gramatica_alfabeto_grande(300, num_nao_terminais=6, semente=3),
+    'equivalentes_500x4': lambda: geradores.gramatica_equivalentes(500, comprimento=4),
+}
+
+
+def medir(funcao):
+    """
+    Executa a função uma vez e mede o tempo.
+    Como no timeit, o coletor de lixo fica desativado durante a medição
+    (as coletas dependem do que foi alocado antes e causam ruído).
+    
+    Retorna: (tempo em segundos, resultado da função)
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        resultado = funcao()
+        return time.perf_counter() - inicio, resultado
+    finally:
+        gc.enable()
+
+
+def _carga_calibracao():
+    """Carga fixa com dicionários, listas e laços, parecida com a do pipeline."""
+    tabela = {}
+    for i in range(TAMANHO_CALIBRACAO):
+        tabela[i % 1000] = tabela.get(i % 1000, 0) + i
+    return sorted(tabela.values())
+
+
+def executar_rodada(texto, palavras):
+    """
+    Executa cada etapa do pipeline uma vez, cada uma sobre o resultado
+    da anterior, e mede cada uma separadamente.
+    
+    Retorna: (tempos {etapa: segundos}, tamanhos {etapa: estados}, AFD final)
+    """
+    tempos = {}
+    tamanhos = {}
+    
+    tempos['parsear_gramatica'], (gramatica, inicial) = medir(
+        lambda: parsear_gramatica(texto)
+    )
+    
+    etapas = [
+        ('converter_gramatica_para_afn', lambda _: converter_gramatica_para_afn(gramatica, inicial)),
+        ('determinizar_afn', determinizar_afn),
+        ('remover_inalcancaveis', remover_inalcancaveis),
+        ('completar_com_estado_poco', completar_com_estado_poco),
+        ('minimizar_afd', minimizar_afd),
+        ('remover_estado_poco', remover_estado_poco),
+    ]
+    
+    automato = None
+    for nome, funcao in etapas:
+        tempos[nome], automato = medir(lambda: funcao(automato))
+        tamanhos[nome] = len(automato.estados)
+        if nome == 'remover_inalcancaveis':
+            alcancavel = automato
+    
+    # Caminho usado pelo pipeline (main.py): minimização com poço implícito
+    tempos['minimizar_afd_poco_implicito'], afd_minimo = medir(
+        lambda: minimizar_afd(alcancavel, poco_implicito=True)
+    )
+    tamanhos['minimizar_afd_poco_implicito'] = len(afd_minimo.estados)
+    
+    if palavras is not None:
+        tempos['reconhecer_palavra'], _ = medir(
+            lambda: [reconhecer_palavra(automato, p) for p in palavras]
+        )
+    
+    return tempos, tamanhos, automato
+
+
+def executar_caso(texto, repeticoes):
+    """
+    Mede todas as etapas do pipeline para uma gramática.
+    
+    O pipeline inteiro é executado 'repeticoes' vezes (rodadas), e não
+    cada etapa várias vezes seguidas: assim uma fase lenta da máquina
+    atinge uma rodada só, e o menor tempo de cada etapa a descarta.
+    A calibração é medida a cada rodada, da mesma forma.
+    
+    Retorna: {'calibracao': segundos, 'tempos': {etapa: segundos},
+              'tamanhos': {etapa: estados}}
+    """
+    # Rodada inicial (não medida) só para obter o alfabeto do AFD final
+    _, _, afd = executar_rodada(texto, None)
+    palavras = geradores.gerar_palavras(
+        afd.alfabeto, NUM_PALAVRAS, COMPRIMENTO_MAXIMO_PALAVRA
+    )
+    
+    calibracao = float('inf')
+    tempos = {}
+    
+    for _ in range(repeticoes):
+        calibracao = min(calibracao, medir(_carga_calibracao)[0])
+        tempos_rodada, tamanhos, _ = executar_rodada(texto, palavras)
+        for etapa, tempo in tempos_rodada.items():
+            tempos[etapa] = min(tempos.get(etapa, tempo), tempo)
+    
+    return {'calibracao': calibracao, 'tempos': tempos, 'tamanhos': tamanhos}
+
+
+def comparar(resultados, referencia, tolerancia):
+    """
+    Compara os tempos com a referência, normalizados pela calibração
+    de cada execução. Imprime uma linha por etapa e retorna a lista de
+    regressões (caso, etapa, tempo de referência, tempo atual).
+    """
+    regressoes = []
+    
+    for caso, resultado in resultados.items():
+        referencia_caso = referencia.get('casos', {}).get(caso)
+        if referencia_caso is None:
+            print(f"{caso}: sem referência")
+            continue
+        
+        if referencia_caso['tamanhos'] != resultado['tamanhos']:
+            print(f"{caso}: AVISO - tamanhos dos autômatos diferentes da referência")
+        
+        # Fator que leva os tempos atuais para a velocidade da referência
+        fator = referencia_caso['calibracao'] / resultado['calibracao']
+        
+        for etapa, atual in resultado['tempos'].items():
+            anterior = referencia_caso['tempos'].get(etapa)
+            if anterior is None:
+                continue
+            
+            atual *= fator
+            variacao = (atual - anterior) / anterior if anterior else 0.0
+            marca = ''
+            if max(atual, anterior) >= TEMPO_MINIMO_COMPARACAO and variacao > tolerancia:
+                marca = '  << REGRESSÃO'
+                regressoes.append((caso, etapa, anterior, atual))
+            
+            print(f"  {caso:22} {etapa:30} {anterior * 1000:10.3f} ms "
+                  f"→ {atual * 1000:10.3f} ms ({variacao:+.1%}){marca}")
+    
+    return regressoes
+
+
+def imprimir_resultados(resultados):
+    """Mostra o tempo de cada etapa de cada caso."""
+    for caso, resultado in resultados.items():
+        for etapa, tempo in resultado['tempos'].items():
+            print(f"  {caso:22} {etapa:30} {tempo * 1000:10.3f} ms")
+
+
+def obter_opcao(nome, padrao=None):
+    """Obtém o valor de uma opção no formato --nome=valor."""
+    prefixo = nome + '='
+    for arg in sys.argv[1:]:
+        if arg.startswith(prefixo):
+            return arg[len(prefixo):]
+    return padrao
+
+
+def main():
+    """Executa os casos e salva ou compara com a referência."""
+    repeticoes = int(obter_opcao('--repeticoes', REPETICOES_PADRAO))
+    tolerancia = float(obter_opcao('--tolerancia', TOLERANCIA_PADRAO))
+    filtro = obter_opcao('--caso')
+    
+    resultados = {}
+    for caso, gerar in CASOS.items():
+        if filtro and caso != filtro:
+            continue
+        print(f"Executando {caso}...")
+        resultados[caso] = executar_caso(gerar(), repeticoes)
+    
+    if '--salvar' in sys.argv:
+        dados = {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'repeticoes': repeticoes,
+            'casos': resultados,
+        }
+        with open(ARQUIVO_REFERENCIA, 'w', encoding='utf-8') as arquivo:
+            json.dump(dados, arquivo, indent=2, sort_keys=True)
+            arquivo.write('\n')
+        print(f"Referência salva em: {ARQUIVO_REFERENCIA}")
+        return
+    
+    if not os.path.exists(ARQUIVO_REFERENCIA):
+        imprimir_resultados(resultados)
+        print("\nSem referência para comparar; grave uma nesta máquina com --salvar.")
+        return
+    
+    with open(ARQUIVO_REFERENCIA, 'r', encoding='utf-8') as arquivo:
+        referencia = json.load(arquivo)
+    
+    regressoes = comparar(resultados, referencia, tolerancia)
+    
+    if regressoes:
+        print(f"\n{len(regressoes)} regressão(ões) acima de {tolerancia:.0%}")
+        sys.exit(1)
+    
+    print("\nNenhuma regressão encontrada")
+
+
+if __name__ == '__main__':
+    main()
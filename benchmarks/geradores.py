@@ -0,0 +1,159 @@
+"""
+Geradores de gramáticas sintéticas para os benchmarks.
+
+Cada gerador retorna o texto de uma gramática no formato de entrada.txt
+(BNF regular à direita), pronto para parsear_gramatica. Os geradores
+aleatórios recebem uma semente, então a mesma chamada gera sempre a
+mesma gramática.
+
+Formas disponíveis:
+    - gramatica_aleatoria: produções a<B> e a sorteadas
+    - gramatica_cadeia: a^n a* b, uma cadeia longa de não-terminais
+    - gramatica_explosao: "o n-ésimo símbolo a partir do fim é a"
+      (AFD com 2^n estados)
+    - gramatica_alfabeto_grande: muitos símbolos, poucos não-terminais
+    - gramatica_equivalentes: muitos estados equivalentes, que a
+      minimização junta em poucos
+"""
+
+import random
+
+
+# Símbolos terminais usados pelos geradores, na ordem em que são escolhidos
+TERMINAIS = 'abcdefghijklmnopqrstuvwxyz0123456789'
+
+
+def simbolos_terminais(quantidade):
+    """
+    Retorna 'quantidade' símbolos terminais de um caractere.
+    Depois dos símbolos ASCII de TERMINAIS, usa letras gregas e outros
+    caracteres Unicode a partir de U+03B1 (sem '<', '>', '|' nem 'ε').
+    """
+    simbolos = list(TERMINAIS[:quantidade])
+    ponto = 0x03B1
+    
+    while len(simbolos) < quantidade:
+        caractere = chr(ponto)
+        if caractere != 'ε':
+            simbolos.append(caractere)
+        ponto += 1
+    
+    return simbolos
+
+
+def formatar_gramatica(producoes):
+    """
+    Converte {nao_terminal: [producoes]} em texto BNF.
+    O primeiro não-terminal do dicionário é o inicial.
+    """
+    linhas = []
+    for nao_terminal, alternativas in producoes.items():
+        linhas.append(f"<{nao_terminal}> ::= {' | '.join(alternativas)}")
+    return '\n'.join(linhas) + '\n'
+
+
+def gramatica_aleatoria(num_nao_terminais, num_simbolos, producoes_por_nao_terminal=3,
+                        prob_terminal=0.1, semente=0):
+    """
+    Gramática regular aleatória.
+    
+    Cada não-terminal recebe 'producoes_por_nao_terminal' produções
+    a<B> com símbolo e destino sorteados; com probabilidade
+    'prob_terminal' a produção é só o terminal (leva ao estado final).
+    """
+    gerador = random.Random(semente)
+    simbolos = simbolos_terminais(num_simbolos)
+    nomes = [f"N{i}" for i in range(num_nao_terminais)]
+    producoes = {}
+    
+    for nome in nomes:
+        alternativas = []
+        for _ in range(producoes_por_nao_terminal):
+            simbolo = gerador.choice(simbolos)
+            if gerador.random() < prob_terminal:
+                alternativas.append(simbolo)
+            else:
+                alternativas.append(f"{simbolo}<{gerador.choice(nomes)}>")
+        producoes[nome] = alternativas
+    
+    return formatar_gramatica(producoes)
+
+
+def gramatica_cadeia(comprimento):
+    """
+    Cadeia a^n a* b: 'comprimento' não-terminais em sequência, o último
+    com um laço em 'a' e a saída por 'b'. AFD mínimo com n + 2 estados.
+    """
+    producoes = {}
+    
+    for i in range(comprimento):
+        producoes[f"C{i}"] = [f"a<C{i + 1}>"]
+    producoes[f"C{comprimento}"] = [f"a<C{comprimento}>", "b"]
+    
+    return formatar_gramatica(producoes)
+
+
+def gramatica_explosao(n):
+    """
+    Palavras sobre {a, b} cujo n-ésimo símbolo a partir do fim é 'a'.
+    O AFN tem n + 2 estados; o AFD (já mínimo) tem 2^n estados.
+    """
+    producoes = {'S': ['a<S>', 'b<S>', 'a<X1>' if n > 1 else 'a']}
+    
+    for i in range(1, n):
+        if i == n - 1:
+            producoes[f"X{i}"] = ['a', 'b']
+        else:
+            producoes[f"X{i}"] = [f"a<X{i + 1}>", f"b<X{i + 1}>"]
+    
+    return formatar_gramatica(producoes)
+
+
+def gramatica_alfabeto_grande(num_simbolos, num_nao_terminais=4, semente=0):
+    """
+    Alfabeto grande: cada não-terminal tem uma produção por símbolo,
+    com destino sorteado, e um terço dos não-terminais aceita ε.
+    """
+    gerador = random.Random(semente)
+    simbolos = simbolos_terminais(num_simbolos)
+    nomes = [f"L{i}" for i in range(num_nao_terminais)]
+    producoes = {}
+    
+    for i, nome in enumerate(nomes):
+        alternativas = [f"{s}<{gerador.choice(nomes)}>" for s in simbolos]
+        if i % 3 == 0:
+            alternativas.append('ε')
+        producoes[nome] = alternativas
+    
+    return formatar_gramatica(producoes)
+
+
+def gramatica_equivalentes(num_copias, comprimento=4):
+    """
+    Muitos estados equivalentes: 'num_copias' ciclos idênticos de
+    'comprimento' não-terminais, ligados em sequência. Todos os
+    não-terminais na mesma posição do ciclo são equivalentes, então o
+    AFD com num_copias * comprimento estados minimiza para
+    'comprimento' estados (mais o final).
+    """
+    producoes = {}
+    
+    for copia in range(num_copias):
+        proxima_copia = (copia + 1) % num_copias
+        for i in range(comprimento):
+            destino = (f"E{copia}_{i + 1}" if i + 1 < comprimento
+                       else f"E{proxima_copia}_0")
+            producoes[f"E{copia}_{i}"] = [f"a<{destino}>", f"b<{destino}>"]
+        producoes[f"E{copia}_0"].append('c')
+    
+    return formatar_gramatica(producoes)
+
+
+def gerar_palavras(simbolos, quantidade, comprimento_maximo, semente=0):
+    """Gera palavras aleatórias sobre os símbolos dados."""
+    gerador = random.Random(semente)
+    simbolos = sorted(simbolos)
+    return [
+        ''.join(gerador.choices(simbolos, k=gerador.randint(0, comprimento_maximo)))
+        for _ in range(quantidade)
+    ]
@@ -0,0 +1,405 @@
+"""
+Módulo de busca em texto com o AFD mínimo.
+
+Este módulo é responsável por:
+- Encontrar, em um texto, os trechos (inicio, fim) que pertencem à
+  linguagem do AFD, com semântica "mais à esquerda, mais longo"
+- Fazer isso em uma única passada da esquerda para a direita, sem
+  recomeçar a simulação a partir de cada posição inicial
+
+Funcionamento:
+    Cada posição do texto inicia uma "linha de execução" no estado
+    inicial. Linhas que chegam ao mesmo estado do AFD têm o mesmo futuro,
+    então são fundidas; assim existem no máximo |Q| linhas ativas e cada
+    símbolo custa O(|Q|).
+
+Modos:
+    - Padrão: para cada posição inicial, o trecho mais longo que começa
+      nela (trechos podem se sobrepor). Cada grupo de linhas fundidas
+      guarda as suas posições iniciais como faixas [a, b) e o último fim
+      registrado. Um grupo que já tinha fim vira, ao ser fundido, um
+      subgrupo do novo grupo: se o novo grupo chegar a um estado final,
+      o fim dele vale para todas as posições (e os subgrupos são
+      absorvidos); senão, cada subgrupo fica com o seu. Quando um grupo
+      morre (ou o texto acaba), os resultados das suas faixas são
+      resolvidos
+    - sem_sobreposicao=True: o trecho mais à esquerda e mais longo; a
+      busca continua a partir do fim dele. Das linhas que chegam ao
+      mesmo estado só a mais à esquerda continua (a outra vira uma
+      ocorrência candidata, se já tinha um fim). Quando uma linha chega a
+      um estado final, as posições iniciais à direita dela ficam dentro
+      da ocorrência dela, ou de outra que termina depois, e são
+      descartadas
+
+Memória:
+    As ocorrências são entregues em ordem de início, então as que já
+    estão resolvidas esperam pela posição inicial mais antiga ainda
+    ativa. Além das |Q| linhas ativas, o buscador guarda:
+    - Padrão: as faixas de posições iniciais desde a mais antiga ainda
+      ativa; no pior caso (grupos com posições intercaladas) uma faixa
+      por posição, ou seja, O(n) para um texto de n símbolos. Quando as
+      linhas se fundem em poucos grupos de posições consecutivas, como
+      em <S> ::= a<S> | b<S> | a, são O(|Q|) faixas
+    - sem_sobreposicao=True: as ocorrências candidatas que esperam por
+      uma linha ativa mais à esquerda. Uma linha que chega a um estado
+      final descarta as candidatas à sua direita, então no caso comum
+      são O(|Q|); no pior caso, O(n), quando a escolha depende de um
+      símbolo que ainda não chegou (ex: <S> ::= a | x | a<A>,
+      <A> ::= x<A> | c, no texto 'axxx...': cada 'x' é uma candidata
+      até que apareça o 'c')
+"""
+
+from bisect import bisect_left, insort
+
+from compilado import como_compilado
+
+
+# Com mais resultados pendentes do que isto, alimentar entrega as
+# ocorrências já definitivas sem esperar o fim do pedaço
+PENDENTES_MINIMO = 64
+
+
+class _Grupo:
+    """
+    Linhas de execução fundidas em um mesmo estado do AFD (modo padrão).
+    
+    Atributos:
+        fim: Última posição em que o grupo esteve em um estado final
+             (None se nunca esteve)
+        faixas: Lista de (a, b) com as posições iniciais a..b-1 cujo
+                resultado é 'fim' (nenhum, se o grupo morrer sem fim)
+        subgrupos: dict {fim: faixas} dos grupos fundidos que já tinham
+                   fim, ou None se não há nenhum; o resultado dessas
+                   faixas é o fim do subgrupo, a não ser que o grupo
+                   chegue a um estado final
+    """
+    __slots__ = ('fim', 'faixas', 'subgrupos')
+    
+    def __init__(self, fim, faixas, subgrupos=None):
+        self.fim = fim
+        self.faixas = faixas
+        self.subgrupos = subgrupos
+    
+    def registrar_fim(self, posicao):
+        """Registra um fim, que passa a valer para todas as posições do grupo."""
+        if self.subgrupos is not None:
+            for faixas in self.subgrupos.values():
+                self.faixas = _juntar_faixas(self.faixas, faixas)
+            self.subgrupos = None
+        self.fim = posicao
+
+
+def _juntar_faixas(faixas, outras):
+    """
+    Junta duas listas de faixas copiando a menor para o fim da maior e
+    unindo faixas consecutivas.
+    
+    Retorna: a lista resultante (uma das duas)
+    """
+    if len(faixas) < len(outras):
+        faixas, outras = outras, faixas
+    
+    for inicio, fim in outras:
+        if faixas and faixas[-1][1] == inicio:
+            faixas[-1] = (faixas[-1][0], fim)
+        else:
+            faixas.append((inicio, fim))
+    return faixas
+
+
+def _fundir(grupo, outro):
+    """
+    Funde dois grupos que chegaram ao mesmo estado do AFD.
+    
+    Retorna: grupo resultante, ainda sem fim (o próximo estado final
+    alcançado define o fim de todas as posições)
+    """
+    if grupo.fim is not None:
+        grupo, outro = outro, grupo
+    if grupo.fim is not None:
+        grupo = _Grupo(None, [], {grupo.fim: grupo.faixas})
+    
+    if outro.fim is not None:
+        subgrupos = {outro.fim: outro.faixas}
+    else:
+        grupo.faixas = _juntar_faixas(grupo.faixas, outro.faixas)
+        subgrupos = outro.subgrupos
+        if subgrupos is None:
+            return grupo
+    
+    if grupo.subgrupos is None or len(subgrupos) > len(grupo.subgrupos):
+        grupo.subgrupos, subgrupos = subgrupos, grupo.subgrupos
+    if subgrupos is not None:
+        for fim, faixas in subgrupos.items():
+            existentes = grupo.subgrupos.get(fim)
+            grupo.subgrupos[fim] = faixas if existentes is None else _juntar_faixas(existentes, faixas)
+    
+    return grupo
+
+
+class Buscador:
+    """
+    Busca incremental de ocorrências da linguagem em um texto.
+    
+    Uso:
+        buscador = Buscador(afd)
+        for pedaco in pedacos:
+            for inicio, fim in buscador.alimentar(pedaco):
+                ...
+        for inicio, fim in buscador.finalizar():
+            ...
+    
+    As ocorrências são entregues em ordem crescente de início, assim que
+    ficam definitivas. As posições contam símbolos desde o início do texto.
+    """
+    
+    def __init__(self, afd, sem_sobreposicao=False):
+        self.compilado = como_compilado(afd)
+        self.sem_sobreposicao = sem_sobreposicao
+        self.reiniciar()
+    
+    def reiniciar(self):
+        """Descarta o texto processado e volta à posição 0."""
+        self.posicao = 0
+        
+        # Modo padrão: {estado: _Grupo} e {início da faixa: (fim da
+        # faixa, fim da ocorrência)}, resolvidos ainda não entregues
+        # sem_sobreposicao: {estado: [inicio, fim]} e lista ordenada de
+        # candidatas (inicio, fim)
+        self._ativos = {}
+        self._resolvidos = {}
+        self._candidatas = []
+        
+        self._proximo_inicio = 0
+        self._limite = 0
+        
+        # Linha de execução que começa na posição 0
+        fim = 0 if self.compilado.eh_final(0) else None
+        if self.sem_sobreposicao:
+            self._ativos[0] = [0, fim]
+        else:
+            self._ativos[0] = _Grupo(fim, [(0, 1)])
+    
+    def _resolver(self, grupo):
+        """Resolve o maior fim das posições iniciais de um grupo que morreu."""
+        resolvidos = self._resolvidos
+        for inicio, fim_faixa in grupo.faixas:
+            resolvidos[inicio] = (fim_faixa, grupo.fim)
+        if grupo.subgrupos is not None:
+            for fim, faixas in grupo.subgrupos.items():
+                for inicio, fim_faixa in faixas:
+                    resolvidos[inicio] = (fim_faixa, fim)
+    
+    def _emitir(self):
+        """Entrega, em ordem de início, as ocorrências já definitivas."""
+        if self.sem_sobreposicao:
+            return self._emitir_sem_sobreposicao()
+        
+        resolvidos = self._resolvidos
+        ocorrencias = []
+        
+        while self._proximo_inicio in resolvidos:
+            inicio = self._proximo_inicio
+            fim_faixa, fim = resolvidos.pop(inicio)
+            self._proximo_inicio = fim_faixa
+            
+            if fim is not None:
+                ocorrencias.extend((posicao, fim) for posicao in range(inicio, fim_faixa))
+        
+        return ocorrencias
+    
+    def _emitir_sem_sobreposicao(self):
+        """
+        Entrega as candidatas à esquerda de todas as linhas ativas: cada
+        uma é a ocorrência mais à esquerda a partir do fim da anterior.
+        """
+        candidatas = self._candidatas
+        ocorrencias = []
+        primeira_ativa = min((linha[0] for linha in self._ativos.values()), default=None)
+        
+        entregues = 0
+        for inicio, fim in candidatas:
+            if primeira_ativa is not None and primeira_ativa < inicio:
+                break
+            entregues += 1
+            if inicio < self._limite:
+                continue
+            
+            ocorrencias.append((inicio, fim))
+            self._limite = fim
+            
+            # Linhas que começam dentro da ocorrência não são mais entregues
+            if primeira_ativa is not None and primeira_ativa < fim:
+                self._ativos = {
+                    estado: linha for estado, linha in self._ativos.items() if linha[0] >= fim
+                }
+                primeira_ativa = min((linha[0] for linha in self._ativos.values()), default=None)
+        
+        del candidatas[:entregues]
+        return ocorrencias
+    
+    def alimentar(self, pedaco):
+        """
+        Processa mais um trecho do texto.
+        
+        Retorna: lista de (inicio, fim) que ficaram definitivas
+        """
+        if self.sem_sobreposicao:
+            return self._alimentar_sem_sobreposicao(pedaco)
+        return self._alimentar_padrao(pedaco)
+    
+    def _alimentar_padrao(self, pedaco):
+        """alimentar no modo padrão: grupos de linhas com faixas."""
+        compilado = self.compilado
+        tabela = compilado.tabela
+        indice_simbolo = compilado.indice_simbolo
+        eh_final = compilado.eh_final
+        inicial_final = eh_final(0)
+        k = len(compilado.simbolos)
+        resolvidos = self._resolvidos
+        posicao = self.posicao
+        
+        ocorrencias = []
+        limite_pendentes = PENDENTES_MINIMO
+        
+        for simbolo in pedaco:
+            coluna = indice_simbolo.get(simbolo)
+            novos = {}
+            
+            for estado, grupo in self._ativos.items():
+                destino = tabela[estado * k + coluna] if coluna is not None else -1
+                if destino < 0:
+                    self._resolver(grupo)
+                    continue
+                
+                existente = novos.get(destino)
+                novos[destino] = grupo if existente is None else _fundir(existente, grupo)
+            
+            posicao += 1
+            for estado, grupo in novos.items():
+                if eh_final(estado):
+                    grupo.registrar_fim(posicao)
+            
+            # Linha que começa na nova posição
+            folha = _Grupo(posicao if inicial_final else None, [(posicao, posicao + 1)])
+            existente = novos.get(0)
+            novos[0] = folha if existente is None else _fundir(existente, folha)
+            self._ativos = novos
+            
+            # Em pedaços longos, entrega o que já está definitivo para
+            # não acumular resultados até o fim do pedaço
+            if len(resolvidos) > limite_pendentes:
+                ocorrencias.extend(self._emitir())
+                limite_pendentes = 2 * len(resolvidos) + PENDENTES_MINIMO
+        
+        self.posicao = posicao
+        ocorrencias.extend(self._emitir())
+        return ocorrencias
+    
+    def _alimentar_sem_sobreposicao(self, pedaco):
+        """alimentar com sem_sobreposicao=True: uma linha por estado."""
+        compilado = self.compilado
+        tabela = compilado.tabela
+        indice_simbolo = compilado.indice_simbolo
+        eh_final = compilado.eh_final
+        inicial_final = eh_final(0)
+        k = len(compilado.simbolos)
+        candidatas = self._candidatas
+        posicao = self.posicao
+        
+        ocorrencias = []
+        limite_pendentes = PENDENTES_MINIMO
+        
+        for simbolo in pedaco:
+            coluna = indice_simbolo.get(simbolo)
+            novos = {}
+            
+            for estado, linha in self._ativos.items():
+                destino = tabela[estado * k + coluna] if coluna is not None else -1
+                if destino < 0:
+                    if linha[1] is not None:
+                        insort(candidatas, tuple(linha))
+                    continue
+                
+                existente = novos.get(destino)
+                if existente is None:
+                    novos[destino] = linha
+                    continue
+                
+                # Mesmo futuro: a linha mais à esquerda prevalece, e a
+                # outra só pode ser entregue com o fim que já tinha
+                if linha[0] < existente[0]:
+                    novos[destino] = linha
+                    linha = existente
+                if linha[1] is not None:
+                    insort(candidatas, tuple(linha))
+            
+            posicao += 1
+            corte = None
+            for estado, linha in novos.items():
+                if eh_final(estado):
+                    linha[1] = posicao
+                    if corte is None or linha[0] < corte:
+                        corte = linha[0]
+            
+            # As posições à direita de 'corte' (todas anteriores à atual)
+            # ficam dentro de uma ocorrência que termina aqui ou depois
+            if corte is not None:
+                novos = {estado: linha for estado, linha in novos.items() if linha[0] <= corte}
+                del candidatas[bisect_left(candidatas, (corte + 1,)):]
+            
+            # Linha que começa na nova posição: se já houver uma linha
+            # mais à esquerda no estado inicial, a nova só fica com a
+            # ocorrência vazia (quando o estado inicial é final)
+            fim = posicao if inicial_final else None
+            if 0 not in novos:
+                novos[0] = [posicao, fim]
+            elif fim is not None:
+                candidatas.append((posicao, fim))
+            self._ativos = novos
+            
+            if len(candidatas) > limite_pendentes:
+                ocorrencias.extend(self._emitir())
+                limite_pendentes = 2 * len(candidatas) + PENDENTES_MINIMO
+        
+        self.posicao = posicao
+        ocorrencias.extend(self._emitir())
+        return ocorrencias
+    
+    def finalizar(self):
+        """
+        Encerra o texto, resolvendo todas as linhas ainda ativas,
+        e reinicia o buscador.
+        
+        Retorna: lista com as ocorrências restantes
+        """
+        for linha in self._ativos.values():
+            if not self.sem_sobreposicao:
+                self._resolver(linha)
+            elif linha[1] is not None:
+                insort(self._candidatas, tuple(linha))
+        self._ativos = {}
+        
+        ocorrencias = self._emitir()
+        self.reiniciar()
+        return ocorrencias
+
+
+def buscar_ocorrencias(afd, texto, sem_sobreposicao=False):
+    """
+    Encontra todas as ocorrências da linguagem do AFD em um texto.
+    
+    Aceita o AFD mínimo retornado por executar_pipeline (Automato) ou
+    um AFDCompilado. O texto pode ser uma str ou um iterável de pedaços
+    de texto (ex: as linhas de um arquivo aberto), processados em ordem.
+    
+    Retorna: gerador de tuplas (inicio, fim), com texto[inicio:fim]
+    pertencente à linguagem
+    """
+    buscador = Buscador(afd, sem_sobreposicao)
+    pedacos = (texto,) if isinstance(texto, str) else texto
+    
+    for pedaco in pedacos:
+        yield from buscador.alimentar(pedaco)
+    
+    yield from buscador.finalizar()
@@ -0,0 +1,189 @@
+"""
+Módulo de cache em disco de AFDs minimizados.
+
+Este módulo é responsável por:
+- Calcular uma chave (hash SHA-256) a partir da gramática normalizada
+  retornada por parsear_gramatica
+- Guardar e recuperar o AFD mínimo correspondente em um diretório local
+- Manter o diretório abaixo de um tamanho máximo, removendo as entradas
+  usadas há mais tempo
+
+As gravações são atômicas (arquivo temporário + os.replace), então várias
+execuções simultâneas podem compartilhar o mesmo diretório com segurança:
+um leitor sempre vê uma entrada completa ou nenhuma.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+from automato import Automato
+
+
+# Versão do formato das entradas; mudar invalida o cache existente
+VERSAO_CACHE = 1
+
+# Variável de ambiente que define o diretório do cache
+VARIAVEL_DIRETORIO = 'MIN_AFD_CACHE'
+
+# Tamanho máximo padrão do diretório de cache (256 MiB)
+TAMANHO_MAXIMO_PADRAO = 256 * 1024 * 1024
+
+EXTENSAO = '.json'
+
+
+def diretorio_padrao():
+    """
+    Retorna o diretório de cache padrão: o valor de MIN_AFD_CACHE, se
+    definido, ou ~/.cache/min_afd.
+    """
+    diretorio = os.environ.get(VARIAVEL_DIRETORIO)
+    if diretorio:
+        return diretorio
+    return os.path.join(os.path.expanduser('~'), '.cache', 'min_afd')
+
+
+def chave_gramatica(gramatica, nao_terminal_inicial, expandir_terminais=False):
+    """
+    Calcula a chave de cache de uma gramática.
+    
+    A gramática é normalizada antes do hash: não-terminais e produções
+    são ordenados e produções repetidas são descartadas, já que nenhum
+    deles altera o AFD mínimo gerado. A opção expandir_terminais (ver
+    converter_gramatica_para_afn) muda o AFD e entra na chave quando ativa.
+    
+    Retorna: hash SHA-256 em hexadecimal
+    """
+    normalizada = {
+        'versao': VERSAO_CACHE,
+        'inicial': nao_terminal_inicial,
+        'producoes': {nt: sorted(set(prods)) for nt, prods in gramatica.items()},
+    }
+    if expandir_terminais:
+        normalizada['expandir_terminais'] = True
+    texto = json.dumps(normalizada, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def afd_para_dict(afd):
+    """Converte um AFD em um dicionário serializável em JSON."""
+    return {
+        'estados': sorted(afd.estados),
+        'alfabeto': sorted(afd.alfabeto),
+        'estado_inicial': afd.estado_inicial,
+        'estados_finais': sorted(afd.estados_finais),
+        'transicoes': {
+            estado: dict(sorted(transicoes_estado.items()))
+            for estado, transicoes_estado in sorted(afd.transicoes.items())
+        },
+    }
+
+
+def dict_para_afd(dados):
+    """Reconstrói um AFD a partir do dicionário de afd_para_dict."""
+    afd = Automato()
+    afd.estados = set(dados['estados'])
+    afd.alfabeto = set(dados['alfabeto'])
+    afd.estado_inicial = dados['estado_inicial']
+    afd.estados_finais = set(dados['estados_finais'])
+    afd.transicoes = {
+        estado: dict(transicoes_estado)
+        for estado, transicoes_estado in dados['transicoes'].items()
+    }
+    return afd
+
+
+class CacheAFD:
+    """
+    Cache de AFDs minimizados em um diretório local.
+    
+    Cada entrada é um arquivo '<chave>.json'. Um acerto atualiza a data
+    de modificação do arquivo, usada como critério de uso recente na
+    remoção de entradas quando o diretório passa de 'tamanho_maximo'.
+    """
+    
+    def __init__(self, diretorio=None, tamanho_maximo=TAMANHO_MAXIMO_PADRAO):
+        self.diretorio = diretorio or diretorio_padrao()
+        self.tamanho_maximo = tamanho_maximo
+        os.makedirs(self.diretorio, exist_ok=True)
+    
+    def _caminho(self, chave):
+        """Retorna o caminho do arquivo de uma entrada."""
+        return os.path.join(self.diretorio, chave + EXTENSAO)
+    
+    def obter(self, chave):
+        """
+        Retorna o AFD guardado sob a chave, ou None se não existir.
+        Entradas corrompidas são removidas e tratadas como ausentes.
+        """
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, 'r', encoding='utf-8') as arquivo:
+                dados = json.load(arquivo)
+            afd = dict_para_afd(dados)
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            self._remover(caminho)
+            return None
+        
+        # Marca a entrada como usada recentemente
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+        
+        return afd
+    
+    def salvar(self, chave, afd):
+        """
+        Guarda o AFD sob a chave com gravação atômica e, em seguida,
+        remove entradas antigas se o diretório passou do tamanho máximo.
+        """
+        descritor, temporario = tempfile.mkstemp(
+            dir=self.diretorio, prefix='.tmp-', suffix=EXTENSAO
+        )
+        try:
+            with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+                json.dump(afd_para_dict(afd), arquivo, ensure_ascii=False)
+            os.replace(temporario, self._caminho(chave))
+        except BaseException:
+            self._remover(temporario)
+            raise
+        
+        self.remover_excedente()
+    
+    def remover_excedente(self):
+        """
+        Remove as entradas usadas há mais tempo até o diretório ficar
+        abaixo do tamanho máximo.
+        """
+        entradas = []
+        total = 0
+        
+        with os.scandir(self.diretorio) as itens:
+            for item in itens:
+                if not item.name.endswith(EXTENSAO) or item.name.startswith('.tmp-'):
+                    continue
+                try:
+                    info = item.stat()
+                except FileNotFoundError:
+                    continue
+                entradas.append((info.st_mtime, info.st_size, item.path))
+                total += info.st_size
+        
+        entradas.sort()
+        for _, tamanho, caminho in entradas:
+            if total <= self.tamanho_maximo:
+                break
+            self._remover(caminho)
+            total -= tamanho
+    
+    @staticmethod
+    def _remover(caminho):
+        """Remove um arquivo, ignorando se outro processo já o removeu."""
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,144 @@
+"""
+Módulo de compressão do alfabeto em classes de símbolos.
+
+Este módulo é responsável por:
+- Agrupar os símbolos que se comportam da mesma forma em todos os
+  estados de um autômato (mesmo destino em cada estado) em classes de
+  equivalência
+- Trocar o alfabeto de um autômato pelas classes (um representante por
+  classe) e desfazer a troca no final
+
+Dois símbolos da mesma classe nunca são distinguidos pela determinização
+nem pela minimização: se eles levam aos mesmos estados no AFN, levam aos
+mesmos subconjuntos no AFD e aos mesmos blocos no AFD mínimo. Por isso o
+pipeline pode trabalhar só com os representantes, e a tabela de
+transições e o trabalho por estado diminuem pelo fator de compressão.
+
+Algoritmo (refinamento de partição sobre as colunas de transição):
+    Todos os símbolos começam na mesma classe. Para cada estado, os
+    símbolos com transição são agrupados por (classe, destino); cada
+    grupo menor que a sua classe é separado em uma classe nova. O custo
+    é proporcional à quantidade de transições.
+"""
+
+from dataclasses import dataclass, field
+
+from automato import Automato
+
+
+@dataclass
+class ClassesSimbolos:
+    """
+    Partição do alfabeto em classes de símbolos equivalentes.
+    
+    Atributos:
+        classes: Lista de classes; cada classe é uma tupla de símbolos em
+                 ordem alfabética, e o primeiro é o representante. As
+                 classes seguem a ordem do representante
+        classe_de: Dicionário {simbolo: índice da classe}
+    """
+    classes: list = field(default_factory=list)
+    classe_de: dict = field(default_factory=dict)
+    
+    @property
+    def representantes(self):
+        """Lista com o representante de cada classe."""
+        return [classe[0] for classe in self.classes]
+    
+    def comprime(self):
+        """Retorna True se alguma classe tem mais de um símbolo."""
+        return len(self.classes) < len(self.classe_de)
+
+
+def calcular_classes(automato):
+    """
+    Agrupa os símbolos do alfabeto em classes de equivalência.
+    
+    Dois símbolos ficam na mesma classe se, em todos os estados, têm o
+    mesmo destino (ou nenhum). Funciona para AFN (destinos em conjunto)
+    e AFD.
+    
+    Retorna: ClassesSimbolos
+    """
+    simbolos = sorted(automato.alfabeto)
+    classe_de = dict.fromkeys(simbolos, 0)
+    tamanhos = [len(simbolos)] if simbolos else []
+    
+    for transicoes_estado in automato.transicoes.values():
+        grupos = {}
+        for simbolo, destino in transicoes_estado.items():
+            if isinstance(destino, set):
+                destino = frozenset(destino)
+            grupos.setdefault((classe_de[simbolo], destino), []).append(simbolo)
+        
+        # Separa cada grupo que não ocupa a classe inteira; o grupo que
+        # cobre o que restou da classe fica com o índice antigo
+        for (classe, _), membros in grupos.items():
+            if len(membros) == tamanhos[classe]:
+                continue
+            nova = len(tamanhos)
+            tamanhos.append(len(membros))
+            tamanhos[classe] -= len(membros)
+            for simbolo in membros:
+                classe_de[simbolo] = nova
+    
+    # Renumera as classes na ordem do representante (menor símbolo)
+    renumeracao = {}
+    classes = []
+    for simbolo in simbolos:
+        antiga = classe_de[simbolo]
+        nova = renumeracao.get(antiga)
+        if nova is None:
+            nova = renumeracao[antiga] = len(classes)
+            classes.append([])
+        classes[nova].append(simbolo)
+        classe_de[simbolo] = nova
+    
+    return ClassesSimbolos(classes=[tuple(c) for c in classes], classe_de=classe_de)
+
+
+def comprimir_alfabeto(automato, classes):
+    """
+    Cria uma cópia do autômato com o alfabeto reduzido aos
+    representantes das classes (as transições pelos demais símbolos são
+    descartadas, já que repetem as do representante).
+    
+    Retorna: novo Automato sobre os representantes
+    """
+    representantes = set(classes.representantes)
+    
+    comprimido = Automato()
+    comprimido.estados = automato.estados.copy()
+    comprimido.alfabeto = representantes
+    comprimido.estado_inicial = automato.estado_inicial
+    comprimido.estados_finais = automato.estados_finais.copy()
+    
+    for estado, transicoes_estado in automato.transicoes.items():
+        comprimido.transicoes[estado] = {
+            simbolo: destino.copy() if isinstance(destino, set) else destino
+            for simbolo, destino in transicoes_estado.items()
+            if simbolo in representantes
+        }
+    
+    return comprimido
+
+
+def expandir_alfabeto(automato, classes, no_lugar=False):
+    """
+    Desfaz comprimir_alfabeto: cada transição pelo representante de uma
+    classe é repetida para os demais símbolos da classe.
+    
+    Com no_lugar=True, altera o autômato recebido em vez de uma cópia.
+    
+    Retorna: Automato sobre o alfabeto original
+    """
+    if not no_lugar:
+        automato = automato.copiar()
+    
+    for transicoes_estado in automato.transicoes.values():
+        for representante, destino in list(transicoes_estado.items()):
+            for simbolo in classes.classes[classes.classe_de[representante]][1:]:
+                transicoes_estado[simbolo] = destino.copy() if isinstance(destino, set) else destino
+    
+    automato.alfabeto = set(classes.classe_de)
+    return automato
@@ -0,0 +1,218 @@
+"""
+Módulo de compilação do AFD para uma representação indexada por inteiros.
+
+Este módulo é responsável por:
+- Renumerar os estados do AFD para 0..n-1 (estado inicial = 0)
+- Mapear os símbolos do alfabeto para colunas densas 0..k-1, uma por
+  classe de símbolos equivalentes (ver classes_simbolos.py)
+- Armazenar as transições em uma tabela plana array('i') de n*k posições
+- Reconhecer palavras percorrendo a tabela, sem dicionários aninhados
+- Descartar estados mortos na compilação, para que os reconhecedores
+  rejeitem a palavra assim que ela entraria em um deles
+
+Layout da tabela:
+    tabela[estado * k + coluna] = estado destino, ou -1 se indefinido
+"""
+
+from array import array
+
+from minimizacao import remover_nao_coalcancaveis
+from classes_simbolos import calcular_classes
+
+
+# Valor usado na tabela para transições indefinidas (rejeição)
+SEM_TRANSICAO = -1
+
+
+class NomesEstados:
+    """
+    Sequência de nomes de estados decodificada sob demanda.
+    
+    Guarda os nomes codificados em UTF-8 e separados por '\\0' (por
+    exemplo, uma fatia de um arquivo mapeado em memória) e só cria as
+    strings no primeiro acesso a um nome.
+    """
+    __slots__ = ('_dados', '_quantidade', '_nomes')
+    
+    def __init__(self, dados, quantidade):
+        self._dados = dados
+        self._quantidade = quantidade
+        self._nomes = None
+    
+    def __len__(self):
+        return self._quantidade
+    
+    def __getitem__(self, indice):
+        if self._nomes is None:
+            texto = bytes(self._dados).decode('utf-8')
+            self._nomes = tuple(texto.split('\0')) if self._quantidade else ()
+        return self._nomes[indice]
+    
+    def __iter__(self):
+        for indice in range(self._quantidade):
+            yield self[indice]
+
+
+class AFDCompilado:
+    """
+    Representação imutável e compacta de um AFD.
+    
+    Atributos:
+        num_estados: Quantidade de estados (n)
+        simbolos: Tupla com o representante de cada coluna
+        classes: Tupla com os símbolos de cada coluna (classe de símbolos
+                 equivalentes; o primeiro é o representante)
+        indice_simbolo: Dicionário {simbolo: coluna}, para todos os
+                        símbolos de todas as classes
+        tabela: memoryview somente leitura (formato 'i') com n*k destinos
+                (-1 = sem transição), sobre o array('i') recebido ou sobre
+                um arquivo mapeado
+        finais: bytes com um bit por estado (1 = estado de aceitação)
+        nomes_estados: Tupla (ou NomesEstados) com o nome de cada estado
+    
+    O estado inicial é sempre o estado 0. Nenhum atributo pode ser trocado,
+    e a tabela e os finais também não podem ser alterados no lugar.
+    """
+    __slots__ = ('num_estados', 'simbolos', 'classes', 'indice_simbolo',
+                 'tabela', 'finais', 'nomes_estados')
+    
+    def __init__(self, simbolos, tabela, finais, nomes_estados, classes=None):
+        definir = object.__setattr__
+        if classes is None:
+            classes = [(simbolo,) for simbolo in simbolos]
+        definir(self, 'num_estados', len(nomes_estados))
+        definir(self, 'simbolos', tuple(simbolos))
+        definir(self, 'classes', tuple(tuple(classe) for classe in classes))
+        definir(self, 'indice_simbolo', {
+            s: c for c, classe in enumerate(self.classes) for s in classe
+        })
+        definir(self, 'tabela', memoryview(tabela).toreadonly())
+        definir(self, 'finais', bytes(finais))
+        if not isinstance(nomes_estados, NomesEstados):
+            nomes_estados = tuple(nomes_estados)
+        definir(self, 'nomes_estados', nomes_estados)
+    
+    def __setattr__(self, nome, valor):
+        raise AttributeError('AFDCompilado é imutável')
+    
+    def __delattr__(self, nome):
+        raise AttributeError('AFDCompilado é imutável')
+    
+    def __repr__(self):
+        return (f'AFDCompilado(estados={self.num_estados}, '
+                f'simbolos={len(self.simbolos)})')
+    
+    def eh_final(self, estado):
+        """Retorna True se o estado (índice) é de aceitação."""
+        return bool(self.finais[estado >> 3] >> (estado & 7) & 1)
+    
+    def proximo(self, estado, simbolo):
+        """
+        Retorna o índice do estado destino para (estado, símbolo).
+        Retorna -1 se o símbolo não pertence ao alfabeto ou se a
+        transição não existir.
+        """
+        coluna = self.indice_simbolo.get(simbolo)
+        if coluna is None:
+            return SEM_TRANSICAO
+        return self.tabela[estado * len(self.simbolos) + coluna]
+    
+    def reconhecer(self, palavra):
+        """
+        Verifica se o AFD compilado aceita a palavra.
+        
+        Cada símbolo custa uma consulta ao dicionário de colunas e um
+        acesso à tabela plana.
+        
+        Retorna True se a palavra é aceita, False caso contrário.
+        """
+        tabela = self.tabela
+        indice_simbolo = self.indice_simbolo
+        k = len(self.simbolos)
+        estado = 0
+        
+        for simbolo in palavra:
+            coluna = indice_simbolo.get(simbolo)
+            if coluna is None:
+                return False
+            estado = tabela[estado * k + coluna]
+            if estado < 0:
+                return False
+        
+        return bool(self.finais[estado >> 3] >> (estado & 7) & 1)
+
+
+def compilar(afd, aparar=True, agrupar_simbolos=True):
+    """
+    Compila um AFD (Automato) para um AFDCompilado.
+    
+    Com aparar=True (padrão), os estados mortos são removidos antes da
+    compilação (ver remover_nao_coalcancaveis): transições que levariam
+    a eles ficam como SEM_TRANSICAO, e todo reconhecedor que percorre a
+    tabela rejeita a palavra nesse ponto, sem ler o resto da entrada.
+    
+    Com agrupar_simbolos=True (padrão), os símbolos que têm o mesmo
+    destino em todos os estados dividem uma coluna (ver
+    calcular_classes), e a tabela tem uma coluna por classe.
+    
+    Numeração:
+        - Estado inicial → 0
+        - Demais estados → 1..n-1, em ordem alfabética do nome
+        - Classes de símbolos → colunas na ordem do representante (sem
+          agrupar, um símbolo por coluna, em ordem alfabética)
+    
+    Transições representadas como conjunto (AFN) só são aceitas quando
+    têm exatamente um destino.
+    
+    Retorna: AFDCompilado equivalente ao AFD
+    """
+    if aparar:
+        afd = remover_nao_coalcancaveis(afd)
+    
+    nomes_estados = [afd.estado_inicial]
+    nomes_estados.extend(sorted(afd.estados - {afd.estado_inicial}))
+    indice_estado = {estado: i for i, estado in enumerate(nomes_estados)}
+    
+    if agrupar_simbolos:
+        classes = calcular_classes(afd).classes
+    else:
+        classes = [(simbolo,) for simbolo in sorted(afd.alfabeto)]
+    simbolos = [classe[0] for classe in classes]
+    k = len(simbolos)
+    n = len(nomes_estados)
+    
+    tabela = array('i', [SEM_TRANSICAO]) * (n * k)
+    finais = bytearray((n + 7) // 8)
+    
+    for i, estado in enumerate(nomes_estados):
+        if estado in afd.estados_finais:
+            finais[i >> 3] |= 1 << (i & 7)
+        
+        transicoes_estado = afd.transicoes.get(estado)
+        if not transicoes_estado:
+            continue
+        
+        base = i * k
+        for coluna, simbolo in enumerate(simbolos):
+            destino = transicoes_estado.get(simbolo)
+            if destino is None:
+                continue
+            if isinstance(destino, set):
+                if len(destino) != 1:
+                    raise ValueError(
+                        f"Transição não-determinística em ({estado}, {simbolo})"
+                    )
+                destino = next(iter(destino))
+            tabela[base + coluna] = indice_estado[destino]
+    
+    return AFDCompilado(simbolos, tabela, finais, nomes_estados, classes)
+
+
+def como_compilado(afd):
+    """
+    Aceita tanto um Automato quanto um AFDCompilado.
+    Retorna: AFDCompilado (compila o Automato se necessário)
+    """
+    if isinstance(afd, AFDCompilado):
+        return afd
+    return compilar(afd)
@@ -0,0 +1,220 @@
+"""
+Módulo de compilação do AFD em modo byte.
+
+Este módulo é responsável por:
+- Traduzir o AFD mínimo para um autômato sobre bytes: cada símbolo vira
+  a sua codificação UTF-8, e símbolos de vários bytes passam por estados
+  intermediários
+- Guardar uma linha de 256 destinos por estado, em que todo byte sem
+  transição leva a um estado de rejeição (que só leva a ele mesmo)
+- Reconhecer bytes, bytearray, memoryview e mmap diretamente, sem
+  decodificar para str, inclusive arquivos lidos com readinto em um
+  buffer reutilizado
+
+Layout da tabela:
+    tabela[base + byte] = base do estado destino, onde base = estado * 256
+
+Guardar a base (e não o índice) do destino poupa uma multiplicação por
+byte, e o estado de rejeição dispensa testar transições indefinidas: o
+laço interno é só 'base = tabela[base + byte]'. A tabela é uma lista
+Python, e não um array('i') como em compilado.py: ler de uma lista
+devolve o int já existente, o que deixa esse laço cerca de duas vezes
+mais rápido. Em troca, cada estado ocupa 2 KiB.
+"""
+
+from compilado import como_compilado
+
+
+# Quantidade de destinos por linha da tabela (um por valor de byte)
+LARGURA_LINHA = 256
+
+# A rejeição é verificada a cada bloco de bytes, e não a cada byte
+TAMANHO_BLOCO = 4096
+
+# Tamanho padrão do buffer de leitura de arquivos (1 MiB)
+TAMANHO_BUFFER_PADRAO = 1 << 20
+
+
+class AFDBytes:
+    """
+    AFD sobre bytes, com uma linha de 256 destinos por estado.
+    
+    Atributos:
+        num_estados: Quantidade de estados, contando os intermediários
+                     dos símbolos de vários bytes e o de rejeição
+        tabela: Lista com num_estados * 256 bases de destino
+        finais: bytearray com um byte por estado (1 = aceitação)
+        rejeicao: Base do estado de rejeição
+    
+    Os estados são representados pela base da sua linha na tabela; o
+    estado inicial tem base 0.
+    """
+    __slots__ = ('num_estados', 'tabela', 'finais', 'rejeicao')
+    
+    def __init__(self, tabela, finais, rejeicao):
+        self.num_estados = len(finais)
+        self.tabela = tabela
+        self.finais = finais
+        self.rejeicao = rejeicao
+    
+    def __repr__(self):
+        return f'AFDBytes(estados={self.num_estados})'
+    
+    def avancar(self, base, dados):
+        """
+        Avança a partir do estado 'base' por todos os bytes de 'dados'
+        (qualquer objeto com protocolo de buffer), sem copiá-los. Para de
+        ler assim que a palavra é rejeitada.
+        
+        Retorna: base do estado alcançado
+        """
+        dados = memoryview(dados).cast('B')
+        tabela = self.tabela
+        rejeicao = self.rejeicao
+        
+        for inicio in range(0, len(dados), TAMANHO_BLOCO):
+            if base == rejeicao:
+                break
+            for byte in dados[inicio:inicio + TAMANHO_BLOCO]:
+                base = tabela[base + byte]
+        
+        return base
+    
+    def eh_final(self, base):
+        """Retorna True se o estado de base 'base' é de aceitação."""
+        return bool(self.finais[base >> 8])
+    
+    def reconhecer(self, dados):
+        """
+        Verifica se o AFD aceita a palavra codificada em 'dados' (bytes,
+        bytearray, memoryview ou mmap, em UTF-8).
+        
+        Retorna True se a palavra é aceita, False caso contrário.
+        """
+        return bool(self.finais[self.avancar(0, dados) >> 8])
+
+
+def _codificar_alfabeto(compilado):
+    """
+    Codifica cada símbolo do alfabeto em UTF-8.
+    
+    As codificações precisam formar um código de prefixo (nenhuma é
+    prefixo de outra), para que a leitura byte a byte seja
+    determinística. Isso vale sempre para símbolos de um caractere; com
+    terminais de vários caracteres que são prefixos uns dos outros,
+    converta a gramática com expandir_terminais=True.
+    
+    Retorna: lista de (codificação, coluna), em ordem de codificação
+    """
+    codificados = sorted(
+        (simbolo.encode('utf-8'), coluna)
+        for simbolo, coluna in compilado.indice_simbolo.items()
+    )
+    
+    anterior = None
+    for codigo, _ in codificados:
+        if not codigo:
+            raise ValueError("O modo byte não aceita o símbolo vazio")
+        if anterior is not None and codigo.startswith(anterior):
+            raise ValueError(
+                f"O símbolo {anterior.decode('utf-8')!r} é prefixo de "
+                f"{codigo.decode('utf-8')!r}; use expandir_terminais=True"
+            )
+        anterior = codigo
+    
+    return codificados
+
+
+def compilar_bytes(afd):
+    """
+    Compila um AFD (Automato ou AFDCompilado) para um AFDBytes.
+    
+    Numeração:
+        - Estados do AFDCompilado → 0..n-1 (estado inicial = 0)
+        - Estado de rejeição → n
+        - Estados intermediários dos símbolos de vários bytes → n+1...,
+          compartilhados pelos símbolos de um estado com o mesmo prefixo
+    
+    Estados mortos já são descartados por compilar(), então as
+    transições para eles também levam à rejeição.
+    
+    Retorna: AFDBytes equivalente ao AFD
+    """
+    compilado = como_compilado(afd)
+    codificados = _codificar_alfabeto(compilado)
+    tabela_compilada = compilado.tabela
+    k = len(compilado.simbolos)
+    n = compilado.num_estados
+    
+    rejeicao = n * LARGURA_LINHA
+    tabela = [rejeicao] * ((n + 1) * LARGURA_LINHA)
+    finais = bytearray(n + 1)
+    
+    for estado in range(n):
+        if compilado.eh_final(estado):
+            finais[estado] = 1
+        
+        base_estado = estado * LARGURA_LINHA
+        for codigo, coluna in codificados:
+            destino = tabela_compilada[estado * k + coluna]
+            if destino < 0:
+                continue
+            
+            # Percorre (ou cria) os intermediários dos bytes iniciais
+            base = base_estado
+            for byte in codigo[:-1]:
+                proxima = tabela[base + byte]
+                if proxima == rejeicao:
+                    proxima = len(tabela)
+                    tabela[base + byte] = proxima
+                    tabela.extend([rejeicao] * LARGURA_LINHA)
+                    finais.append(0)
+                base = proxima
+            
+            tabela[base + codigo[-1]] = destino * LARGURA_LINHA
+    
+    return AFDBytes(tabela, finais, rejeicao)
+
+
+def como_afd_bytes(afd):
+    """
+    Aceita um Automato, um AFDCompilado ou um AFDBytes.
+    Retorna: AFDBytes (compila se necessário)
+    """
+    if isinstance(afd, AFDBytes):
+        return afd
+    return compilar_bytes(afd)
+
+
+def reconhecer_bytes(afd, dados):
+    """
+    Atalho para como_afd_bytes(afd).reconhecer(dados).
+    Para reconhecer muitas palavras, compile o AFD uma vez.
+    """
+    return como_afd_bytes(afd).reconhecer(dados)
+
+
+def reconhecer_arquivo_bytes(afd, caminho, tamanho_buffer=TAMANHO_BUFFER_PADRAO):
+    """
+    Verifica se o conteúdo inteiro de um arquivo é uma palavra aceita.
+    
+    O arquivo é lido com readinto em um único buffer de 'tamanho_buffer'
+    bytes, reutilizado a cada bloco; a leitura para assim que a palavra
+    é rejeitada. Um caractere UTF-8 pode ficar dividido entre dois
+    blocos: o estado intermediário continua no bloco seguinte.
+    
+    Retorna True se o conteúdo é aceito, False caso contrário.
+    """
+    afd_bytes = como_afd_bytes(afd)
+    buffer = bytearray(tamanho_buffer)
+    visao = memoryview(buffer)
+    base = 0
+    
+    with open(caminho, 'rb') as arquivo:
+        while base != afd_bytes.rejeicao:
+            lidos = arquivo.readinto(buffer)
+            if not lidos:
+                break
+            base = afd_bytes.avancar(base, visao[:lidos])
+    
+    return afd_bytes.eh_final(base)
@@ -3,16 +3,22 @@ Módulo de conversão de gramática para autômato.
 
 Este módulo é responsável por:
 - Converter uma gramática regular em AFN (Autômato Finito Não-determinístico)
-- Determinizar o AFN para AFD (Autômato Finito Determinístico)
+- Determinizar o AFN para AFD (Autômato Finito Determinístico), com os
+  conjuntos de estados representados como máscaras de bits
 
 A conversão segue o mapeamento padrão:
 - Cada não-terminal vira um estado
 - Cada produção a<B> vira uma transição δ(A, a) = B
 - Produções apenas com terminal usam um estado FINAL auxiliar
 - Produções epsilon tornam o estado final
+- Com expandir_terminais=True, terminais de vários caracteres ('ab<B>')
+  viram cadeias de transições de um caractere, com estados intermediários
 """
 
-from automato import Automato, criar_nome_estado_conjunto
+from collections import deque
+from dataclasses import dataclass, field
+
+from automato import Automato
 from gramatica import extrair_terminal_e_nao_terminal
 
 
@@ -20,7 +26,7 @@ from gramatica import extrair_terminal_e_nao_terminal
 ESTADO_FINAL = 'FINAL'
 
 
-def converter_gramatica_para_afn(gramatica, nao_terminal_inicial):
+def converter_gramatica_para_afn(gramatica, nao_terminal_inicial, expandir_terminais=False):
     """
     Converte uma gramática regular para um AFN.
     
@@ -30,6 +36,13 @@ def converter_gramatica_para_afn(gramatica, nao_terminal_inicial):
         - Produção a (só terminal) → Transição δ(atual, a) = FINAL
         - Produção ε → Estado atual é final
     
+    Por padrão, um terminal de vários caracteres ('ab<B>') é um único
+    símbolo do alfabeto ('ab'), e o AFD reconhece sequências desses
+    símbolos (ex: listas de tokens, ou texto segmentado por tokenizacao.py).
+    Com expandir_terminais=True, ele vira uma cadeia de transições de um
+    caractere (ver _expandir_terminal), e o AFD reconhece o texto
+    diretamente, caractere a caractere.
+    
     Retorna: AFN equivalente à gramática
     """
     afn = Automato()
@@ -51,13 +64,19 @@ def converter_gramatica_para_afn(gramatica, nao_terminal_inicial):
             if eh_epsilon:
                 # Produção ε: estado é final (aceita palavra vazia)
                 afn.adicionar_estado_final(nao_terminal)
-            elif destino is not None:
+                continue
+            
+            origem = nao_terminal
+            if expandir_terminais and len(terminal) > 1:
+                origem, terminal = _expandir_terminal(afn, nao_terminal, terminal)
+            
+            if destino is not None:
                 # Produção a<B>: transição para outro não-terminal
-                afn.adicionar_transicao_afn(nao_terminal, terminal, destino)
+                afn.adicionar_transicao_afn(origem, terminal, destino)
             else:
                 # Produção só com terminal: vai para estado FINAL
                 usa_estado_final = True
-                afn.adicionar_transicao_afn(nao_terminal, terminal, ESTADO_FINAL)
+                afn.adicionar_transicao_afn(origem, terminal, ESTADO_FINAL)
     
     # Adiciona estado FINAL se necessário
     if usa_estado_final:
@@ -66,7 +85,161 @@ def converter_gramatica_para_afn(gramatica, nao_terminal_inicial):
     return afn
 
 
-def determinizar_afn(afn):
+def _expandir_terminal(afn, nao_terminal, terminal):
+    """
+    Cria a cadeia de estados intermediários de um terminal de vários
+    caracteres, a partir do não-terminal: o estado '<A>/ab' é alcançado
+    de A lendo 'ab'. Produções de A com o mesmo prefixo compartilham os
+    estados (a cadeia forma uma árvore de prefixos).
+    
+    Retorna: (estado intermediário de onde sai o último caractere,
+              último caractere)
+    """
+    origem = nao_terminal
+    for i in range(1, len(terminal)):
+        intermediario = f"<{nao_terminal}>/{terminal[:i]}"
+        afn.adicionar_transicao_afn(origem, terminal[i - 1], intermediario)
+        origem = intermediario
+    return origem, terminal[-1]
+
+
+@dataclass
+class AFNIndexado:
+    """
+    Representação do AFN com estados numerados e conjuntos como bits.
+    
+    Atributos:
+        nomes: Lista de nomes dos estados, em ordem alfabética em
+               indexar_afn (o estado de índice i corresponde ao bit 1 << i)
+        simbolos: Lista de símbolos do alfabeto, em ordem alfabética
+        inicial: Máscara do conjunto inicial
+        finais: Máscara dos estados finais
+        saidas: Para cada estado, lista de (coluna do símbolo, máscara destino)
+    """
+    nomes: list = field(default_factory=list)
+    simbolos: list = field(default_factory=list)
+    inicial: int = 0
+    finais: int = 0
+    saidas: list = field(default_factory=list)
+
+
+def indexar_afn(afn):
+    """
+    Numera os estados e símbolos do AFN e pré-calcula, para cada estado
+    e símbolo, a máscara de bits dos estados destino.
+    
+    Retorna: AFNIndexado
+    """
+    nomes = sorted(afn.estados)
+    simbolos = sorted(afn.alfabeto)
+    indice_estado = {estado: i for i, estado in enumerate(nomes)}
+    
+    saidas = []
+    for estado in nomes:
+        transicoes_estado = afn.transicoes.get(estado, {})
+        saidas_estado = []
+        for coluna, simbolo in enumerate(simbolos):
+            destino = transicoes_estado.get(simbolo)
+            if destino is None:
+                continue
+            if not isinstance(destino, set):
+                destino = (destino,)
+            mascara = 0
+            for d in destino:
+                mascara |= 1 << indice_estado[d]
+            if mascara:
+                saidas_estado.append((coluna, mascara))
+        saidas.append(saidas_estado)
+    
+    finais = 0
+    for estado in afn.estados_finais:
+        finais |= 1 << indice_estado[estado]
+    
+    return AFNIndexado(
+        nomes=nomes,
+        simbolos=simbolos,
+        inicial=1 << indice_estado[afn.estado_inicial],
+        finais=finais,
+        saidas=saidas,
+    )
+
+
+def sucessor_mascara(indexado, mascara):
+    """
+    Calcula, de uma vez para todos os símbolos, o conjunto destino
+    de um conjunto de estados (OR das máscaras de seus membros).
+    
+    Retorna: dicionário {coluna do símbolo: máscara destino}
+    """
+    saidas = indexado.saidas
+    acumulado = {}
+    
+    while mascara:
+        bit = mascara & -mascara
+        mascara ^= bit
+        for coluna, destino in saidas[bit.bit_length() - 1]:
+            acumulado[coluna] = acumulado.get(coluna, 0) | destino
+    
+    return acumulado
+
+
+def nome_mascara(indexado, mascara):
+    """
+    Cria o nome legível de um conjunto representado como máscara.
+    Equivalente a criar_nome_estado_conjunto: '{q0,q1,q2}'
+    """
+    nomes = indexado.nomes
+    membros = []
+    
+    while mascara:
+        bit = mascara & -mascara
+        mascara ^= bit
+        membros.append(nomes[bit.bit_length() - 1])
+    
+    # Índices seguem a ordem alfabética dos nomes, então já estão ordenados
+    return '{' + ','.join(membros) + '}'
+
+
+def construir_subconjuntos(indexado):
+    """
+    Construção de subconjuntos sobre máscaras de bits.
+    
+    Usa uma fila (deque) em largura e um dicionário máscara → índice.
+    Os estados do AFD são numerados na ordem de descoberta
+    (o conjunto inicial é o 0).
+    
+    Retorna:
+        - conjuntos: lista com a máscara de cada estado do AFD
+        - transicoes: lista com {coluna do símbolo: índice destino} por estado
+    """
+    conjuntos = [indexado.inicial]
+    indices = {indexado.inicial: 0}
+    transicoes = []
+    fila = deque([0])
+    
+    # Processa cada conjunto de estados (BFS)
+    while fila:
+        atual = fila.popleft()
+        linha = {}
+        
+        for coluna, destino in sucessor_mascara(indexado, conjuntos[atual]).items():
+            indice = indices.get(destino)
+            
+            # Novo estado encontrado
+            if indice is None:
+                indice = len(conjuntos)
+                indices[destino] = indice
+                conjuntos.append(destino)
+                fila.append(indice)
+            
+            linha[coluna] = indice
+        
+        transicoes.append(linha)
+    
+    return conjuntos, transicoes
+
+
+def determinizar_afn(afn, nomes_legiveis=True, contadores=None):
     """
     Converte um AFN para AFD usando construção de subconjuntos.
     
@@ -76,67 +249,47 @@ def determinizar_afn(afn):
     3. Novos conjuntos viram novos estados do AFD
     4. Um estado do AFD é final se contém algum estado final do AFN
     
+    Os conjuntos são máscaras de bits (ver construir_subconjuntos).
+    Com nomes_legiveis=True os estados do AFD recebem nomes como
+    '{A,FINAL}'; com False, recebem nomes curtos 'D0', 'D1', ...
+    na ordem de descoberta, sem o custo de montar os nomes.
+    
+    Se 'contadores' (dict) for informado, registra
+    'subconjuntos_explorados' e 'transicoes_calculadas'.
+    
     Retorna: AFD equivalente ao AFN
     """
-    afd = Automato()
-    
-    # Estado inicial é o conjunto contendo apenas o estado inicial do AFN
-    estado_inicial_conjunto = frozenset([afn.estado_inicial])
-    nome_estado_inicial = criar_nome_estado_conjunto(estado_inicial_conjunto)
+    indexado = indexar_afn(afn)
+    conjuntos, transicoes = construir_subconjuntos(indexado)
     
-    afd.definir_estado_inicial(nome_estado_inicial)
-    afd.alfabeto = afn.alfabeto.copy()
+    if contadores is not None:
+        contadores['subconjuntos_explorados'] = len(conjuntos)
+        contadores['transicoes_calculadas'] = sum(len(linha) for linha in transicoes)
     
-    # Se o estado inicial do AFN é final, o estado inicial do AFD também é
-    if estado_inicial_conjunto & afn.estados_finais:
-        afd.adicionar_estado_final(nome_estado_inicial)
+    if nomes_legiveis:
+        nomes_afd = [nome_mascara(indexado, conjunto) for conjunto in conjuntos]
+    else:
+        nomes_afd = ['D' + str(i) for i in range(len(conjuntos))]
     
-    # Mapeia conjuntos de estados para nomes de estados do AFD
-    mapeamento = {estado_inicial_conjunto: nome_estado_inicial}
-    fila = [estado_inicial_conjunto]
-    processados = set()
+    afd = Automato()
+    afd.alfabeto = afn.alfabeto.copy()
+    afd.definir_estado_inicial(nomes_afd[0])
     
-    # Processa cada conjunto de estados (BFS)
-    while fila:
-        conjunto_atual = fila.pop(0)
-        
-        if conjunto_atual in processados:
-            continue
-        
-        processados.add(conjunto_atual)
-        nome_atual = mapeamento[conjunto_atual]
+    for i, conjunto in enumerate(conjuntos):
+        afd.adicionar_estado(nomes_afd[i])
         
-        # Para cada símbolo do alfabeto
-        for simbolo in afn.alfabeto:
-            novo_conjunto = set()
-            
-            # Calcula a união dos destinos de todos os estados do conjunto
-            for estado in conjunto_atual:
-                transicao = afn.obter_transicao(estado, simbolo)
-                if transicao is not None:
-                    if isinstance(transicao, set):
-                        novo_conjunto.update(transicao)
-                    else:
-                        novo_conjunto.add(transicao)
-            
-            # Ignora conjunto vazio
-            if not novo_conjunto:
-                continue
-            
-            novo_conjunto_frozen = frozenset(novo_conjunto)
-            
-            # Novo estado encontrado
-            if novo_conjunto_frozen not in mapeamento:
-                nome_novo = criar_nome_estado_conjunto(novo_conjunto_frozen)
-                mapeamento[novo_conjunto_frozen] = nome_novo
-                fila.append(novo_conjunto_frozen)
-                
-                # Estado é final se contém algum estado final do AFN
-                if novo_conjunto_frozen & afn.estados_finais:
-                    afd.adicionar_estado_final(nome_novo)
-            
-            # Adiciona transição no AFD
-            nome_destino = mapeamento[novo_conjunto_frozen]
-            afd.adicionar_transicao_afd(nome_atual, simbolo, nome_destino)
+        # Estado é final se contém algum estado final do AFN
+        if conjunto & indexado.finais:
+            afd.adicionar_estado_final(nomes_afd[i])
+    
+    # Adiciona as transições do AFD, liberando cada linha do índice assim
+    # que ela é copiada (o índice e o AFD não ficam inteiros ao mesmo tempo)
+    simbolos = indexado.simbolos
+    for i in range(len(transicoes)):
+        linha = transicoes[i]
+        transicoes[i] = None
+        nome_atual = nomes_afd[i]
+        for coluna, destino in linha.items():
+            afd.adicionar_transicao_afd(nome_atual, simbolos[coluna], nomes_afd[destino])
     
     return afd
@@ -0,0 +1,207 @@
+"""
+Módulo de construção direta do AFD mínimo de um dicionário.
+
+Este módulo é responsável por:
+- Construir o AFD mínimo (acíclico) que reconhece exatamente uma lista
+  finita de palavras, sem passar por gramática, AFN, determinização e
+  minimização
+- Ler a lista de palavras de um arquivo (uma palavra por linha) ou de
+  qualquer iterável, em fluxo
+
+Algoritmo (Daciuk, Mihov, Watson e Watson, construção incremental para
+palavras ordenadas):
+    As palavras são inseridas em ordem crescente. Ao inserir uma palavra,
+    a parte do caminho da palavra anterior que fica depois do prefixo
+    comum nunca mais muda, então seus nós são minimizados de baixo para
+    cima: cada nó é trocado por um nó equivalente do registro, se existir
+    (mesma marca de final e mesmos filhos), ou entra no registro. Só o
+    caminho da última palavra fica fora do registro, e a memória fica
+    proporcional ao AFD mínimo, não ao tamanho do dicionário.
+
+O resultado é um Automato (AFD sem estado poço, estados 'q0', 'q1', ...),
+compatível com io_saida e reconhecer_palavra.
+"""
+
+from collections import deque
+
+from automato import Automato
+
+
+class _No:
+    """
+    Nó do autômato em construção.
+    
+    'filhos' mapeia símbolo → nó, na ordem de inserção (que é a ordem
+    alfabética, já que as palavras chegam ordenadas). 'numero' identifica
+    o nó no registro (None enquanto não registrado).
+    """
+    __slots__ = ('final', 'filhos', 'numero')
+    
+    def __init__(self):
+        self.final = False
+        self.filhos = {}
+        self.numero = None
+
+
+class ConstrutorDicionario:
+    """
+    Construção incremental do AFD mínimo de palavras ordenadas.
+    
+    Uso:
+        construtor = ConstrutorDicionario()
+        for palavra in palavras_ordenadas:
+            construtor.adicionar(palavra)
+        afd = construtor.concluir()
+    
+    As palavras devem chegar em ordem crescente (ordem de str do Python,
+    isto é, por código Unicode); palavras repetidas são ignoradas.
+    """
+    
+    def __init__(self):
+        self.raiz = _No()
+        self.registro = {}
+        self.alfabeto = set()
+        self.num_palavras = 0
+        self._anterior = None
+        
+        # Nós do caminho da última palavra: _caminho[i] é o nó alcançado
+        # pelos i primeiros símbolos
+        self._caminho = [self.raiz]
+    
+    def adicionar(self, palavra):
+        """
+        Insere uma palavra.
+        Lança ValueError se ela for menor que a palavra anterior.
+        """
+        anterior = self._anterior
+        if anterior is not None:
+            if palavra == anterior:
+                return
+            if palavra < anterior:
+                raise ValueError(
+                    f"Palavras fora de ordem: '{palavra}' depois de '{anterior}'"
+                )
+        else:
+            anterior = ''
+        
+        # Tamanho do prefixo comum com a palavra anterior
+        prefixo = 0
+        limite = min(len(palavra), len(anterior))
+        while prefixo < limite and palavra[prefixo] == anterior[prefixo]:
+            prefixo += 1
+        
+        # O restante do caminho anterior não muda mais: minimiza
+        self._minimizar_caminho(prefixo)
+        
+        # Acrescenta o sufixo novo
+        caminho = self._caminho
+        no = caminho[-1]
+        for simbolo in palavra[prefixo:]:
+            filho = _No()
+            no.filhos[simbolo] = filho
+            caminho.append(filho)
+            no = filho
+        no.final = True
+        
+        self.alfabeto.update(palavra[prefixo:])
+        self.num_palavras += 1
+        self._anterior = palavra
+    
+    def _minimizar_caminho(self, prefixo):
+        """
+        Minimiza os nós do caminho da última palavra abaixo da posição
+        'prefixo', do mais profundo para o mais raso, e os retira do caminho.
+        """
+        caminho = self._caminho
+        registro = self.registro
+        
+        while len(caminho) > prefixo + 1:
+            no = caminho.pop()
+            chave = (no.final, tuple((s, f.numero) for s, f in no.filhos.items()))
+            
+            equivalente = registro.get(chave)
+            if equivalente is None:
+                no.numero = len(registro)
+                registro[chave] = no
+            else:
+                # Troca o nó pelo equivalente já registrado; o pai aponta
+                # para o nó pelo último símbolo inserido
+                pai = caminho[-1]
+                simbolo = next(reversed(pai.filhos))
+                pai.filhos[simbolo] = equivalente
+    
+    def concluir(self):
+        """
+        Minimiza o caminho restante e converte o resultado em Automato.
+        Os estados são nomeados 'q0' (inicial), 'q1', ... em ordem de
+        busca em largura, com os símbolos em ordem alfabética.
+        
+        Retorna: AFD mínimo que reconhece exatamente as palavras inseridas
+        """
+        self._minimizar_caminho(0)
+        
+        afd = Automato()
+        afd.alfabeto = set(self.alfabeto)
+        
+        nomes = {id(self.raiz): 'q0'}
+        fila = deque([self.raiz])
+        afd.definir_estado_inicial('q0')
+        
+        while fila:
+            no = fila.popleft()
+            nome = nomes[id(no)]
+            if no.final:
+                afd.adicionar_estado_final(nome)
+            
+            for simbolo, filho in no.filhos.items():
+                nome_filho = nomes.get(id(filho))
+                if nome_filho is None:
+                    nome_filho = 'q' + str(len(nomes))
+                    nomes[id(filho)] = nome_filho
+                    fila.append(filho)
+                afd.adicionar_transicao_afd(nome, simbolo, nome_filho)
+        
+        return afd
+
+
+def construir_afd_dicionario(palavras):
+    """
+    Constrói o AFD mínimo que reconhece exatamente as palavras dadas.
+    
+    'palavras' pode ser qualquer iterável de str em ordem crescente
+    (ex: um gerador); ele é consumido uma única vez.
+    
+    Retorna: AFD mínimo (Automato)
+    """
+    construtor = ConstrutorDicionario()
+    for palavra in palavras:
+        construtor.adicionar(palavra)
+    return construtor.concluir()
+
+
+def ler_palavras(caminho):
+    """
+    Lê as palavras de um arquivo, uma por linha, sem carregar o arquivo
+    inteiro. O terminador '\\n' (ou '\\r\\n') não faz parte da palavra;
+    linhas vazias são ignoradas.
+    
+    Retorna: gerador de palavras
+    """
+    with open(caminho, 'r', encoding='utf-8', newline='\n') as arquivo:
+        for linha in arquivo:
+            if linha.endswith('\r\n'):
+                linha = linha[:-2]
+            elif linha.endswith('\n'):
+                linha = linha[:-1]
+            if linha:
+                yield linha
+
+
+def carregar_dicionario(caminho):
+    """
+    Constrói o AFD mínimo de um arquivo de palavras ordenadas
+    (ex: gerado por 'LC_ALL=C sort -u').
+    
+    Retorna: AFD mínimo (Automato)
+    """
+    return construir_afd_dicionario(ler_palavras(caminho))
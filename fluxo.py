@@ -0,0 +1,296 @@
+"""
+Módulo de reconhecimento em fluxo (streaming).
+
+Este módulo é responsável por:
+- Reconhecer uma palavra entregue em pedaços, mantendo apenas o estado
+  atual do AFD entre um pedaço e outro
+- Aceitar pedaços do tipo str, bytes, bytearray, memoryview e mmap,
+  percorrendo os dados binários sem copiá-los
+- Classificar todas as linhas de um arquivo em uma única passada,
+  com memória limitada ao tamanho do buffer de leitura
+
+Dados binários são interpretados como UTF-8. Se o alfabeto tiver apenas
+símbolos ASCII, cada byte é traduzido direto para uma coluna da tabela;
+caso contrário, os bytes passam por um decodificador incremental. Bytes
+que não são UTF-8 válido rejeitam a palavra (ou só a linha, em
+classificar_linhas), como um símbolo fora do alfabeto.
+"""
+
+import codecs
+
+from compilado import SEM_TRANSICAO, como_compilado
+
+
+# Tamanho padrão do buffer de leitura de arquivos (1 MiB)
+TAMANHO_BUFFER_PADRAO = 1 << 20
+
+NOVA_LINHA = ord('\n')
+RETORNO_CARRO = ord('\r')
+
+
+def _montar_colunas_byte(compilado):
+    """
+    Monta a tabela byte → coluna para alfabetos ASCII.
+    
+    Retorna: lista de 256 colunas (-1 = byte fora do alfabeto), ou None
+    se o alfabeto tiver símbolos que não cabem em um byte ASCII
+    """
+    colunas = [SEM_TRANSICAO] * 256
+    
+    for simbolo, coluna in compilado.indice_simbolo.items():
+        if len(simbolo) != 1:
+            continue
+        if ord(simbolo) >= 128:
+            return None
+        colunas[ord(simbolo)] = coluna
+    
+    return colunas
+
+
+class ReconhecedorFluxo:
+    """
+    Reconhecedor incremental: a palavra chega em pedaços.
+    
+    Uso:
+        fluxo = ReconhecedorFluxo(afd)
+        for pedaco in pedacos:
+            fluxo.alimentar(pedaco)
+        aceita = fluxo.finalizar()
+    
+    Entre pedaços só o índice do estado atual é mantido. Depois de
+    finalizar(), o reconhecedor volta ao estado inicial e pode ser
+    reutilizado para a próxima palavra.
+    """
+    
+    def __init__(self, afd):
+        self.compilado = como_compilado(afd)
+        self._colunas_byte = _montar_colunas_byte(self.compilado)
+        self.reiniciar()
+    
+    def reiniciar(self):
+        """Volta ao estado inicial, descartando a palavra em andamento."""
+        self.estado = 0
+        self._decodificador = None
+    
+    @property
+    def rejeitado(self):
+        """True se a palavra já foi rejeitada (nenhum sufixo a salva)."""
+        return self.estado < 0
+    
+    def alimentar(self, pedaco):
+        """
+        Processa mais um pedaço da palavra.
+        
+        Aceita str (um símbolo por caractere) ou qualquer objeto com
+        protocolo de buffer (bytes, bytearray, memoryview, mmap).
+        """
+        if self.estado < 0:
+            return
+        
+        if isinstance(pedaco, str):
+            self._alimentar_simbolos(pedaco)
+        elif self._colunas_byte is not None:
+            self._alimentar_bytes(memoryview(pedaco).cast('B'))
+        else:
+            if self._decodificador is None:
+                self._decodificador = codecs.getincrementaldecoder('utf-8')()
+            try:
+                simbolos = self._decodificador.decode(pedaco)
+            except UnicodeDecodeError:
+                # UTF-8 inválido não forma nenhum símbolo: rejeita a palavra
+                self.estado = SEM_TRANSICAO
+                return
+            self._alimentar_simbolos(simbolos)
+    
+    def _alimentar_simbolos(self, simbolos):
+        """Avança o estado por uma sequência de símbolos (caracteres)."""
+        compilado = self.compilado
+        tabela = compilado.tabela
+        indice_simbolo = compilado.indice_simbolo
+        k = len(compilado.simbolos)
+        estado = self.estado
+        
+        for simbolo in simbolos:
+            coluna = indice_simbolo.get(simbolo)
+            if coluna is None:
+                estado = SEM_TRANSICAO
+                break
+            estado = tabela[estado * k + coluna]
+            if estado < 0:
+                break
+        
+        self.estado = estado
+    
+    def _alimentar_bytes(self, dados):
+        """Avança o estado por uma memoryview de bytes, sem copiá-la."""
+        tabela = self.compilado.tabela
+        colunas_byte = self._colunas_byte
+        k = len(self.compilado.simbolos)
+        estado = self.estado
+        
+        for byte in dados:
+            coluna = colunas_byte[byte]
+            if coluna < 0:
+                estado = SEM_TRANSICAO
+                break
+            estado = tabela[estado * k + coluna]
+            if estado < 0:
+                break
+        
+        self.estado = estado
+    
+    def finalizar(self):
+        """
+        Encerra a palavra atual e reinicia o reconhecedor.
+        
+        Retorna True se a palavra é aceita, False caso contrário.
+        """
+        estado = self.estado
+        
+        # Bytes UTF-8 incompletos no fim da palavra invalidam a entrada
+        if self._decodificador is not None and self._decodificador.getstate()[0]:
+            estado = SEM_TRANSICAO
+        
+        self.reiniciar()
+        return estado >= 0 and self.compilado.eh_final(estado)
+
+
+def reconhecer_arquivo(afd, caminho, tamanho_buffer=TAMANHO_BUFFER_PADRAO):
+    """
+    Verifica se o conteúdo inteiro de um arquivo é uma palavra aceita.
+    O arquivo é lido em blocos de 'tamanho_buffer' bytes em um buffer
+    reutilizado.
+    
+    Retorna True se o conteúdo é aceito, False caso contrário.
+    """
+    fluxo = ReconhecedorFluxo(afd)
+    buffer = bytearray(tamanho_buffer)
+    visao = memoryview(buffer)
+    
+    with open(caminho, 'rb') as arquivo:
+        while not fluxo.rejeitado:
+            lidos = arquivo.readinto(buffer)
+            if not lidos:
+                break
+            fluxo.alimentar(visao[:lidos])
+    
+    return fluxo.finalizar()
+
+
+def classificar_linhas(afd, caminho, tamanho_buffer=TAMANHO_BUFFER_PADRAO):
+    """
+    Classifica cada linha de um arquivo (aceita ou não) em uma passada.
+    
+    O arquivo é lido em blocos para um buffer reutilizado; uma linha pode
+    começar em um bloco e terminar em outro. O terminador '\\n' (ou
+    '\\r\\n') não faz parte da palavra. Uma última linha sem terminador
+    também é classificada.
+    
+    Retorna: gerador de booleanos, um por linha, na ordem do arquivo
+    """
+    compilado = como_compilado(afd)
+    colunas_byte = _montar_colunas_byte(compilado)
+    
+    if colunas_byte is None:
+        # Alfabeto não-ASCII: decodifica o arquivo linha a linha
+        yield from _classificar_linhas_texto(compilado, caminho, tamanho_buffer)
+        return
+    
+    tabela = compilado.tabela
+    k = len(compilado.simbolos)
+    buffer = bytearray(tamanho_buffer)
+    visao = memoryview(buffer)
+    
+    estado = 0
+    cr_pendente = False
+    linha_vazia = True
+    
+    with open(caminho, 'rb') as arquivo:
+        while True:
+            lidos = arquivo.readinto(buffer)
+            if not lidos:
+                break
+            
+            for byte in visao[:lidos]:
+                if byte == NOVA_LINHA:
+                    yield estado >= 0 and compilado.eh_final(estado)
+                    estado = 0
+                    cr_pendente = False
+                    linha_vazia = True
+                    continue
+                
+                linha_vazia = False
+                if estado < 0:
+                    continue
+                
+                # '\r' só é símbolo se não vier imediatamente antes de '\n'
+                if cr_pendente:
+                    cr_pendente = False
+                    coluna = colunas_byte[RETORNO_CARRO]
+                    estado = tabela[estado * k + coluna] if coluna >= 0 else SEM_TRANSICAO
+                    if estado < 0:
+                        continue
+                
+                if byte == RETORNO_CARRO:
+                    cr_pendente = True
+                    continue
+                
+                coluna = colunas_byte[byte]
+                estado = tabela[estado * k + coluna] if coluna >= 0 else SEM_TRANSICAO
+    
+    if not linha_vazia:
+        if cr_pendente and estado >= 0:
+            coluna = colunas_byte[RETORNO_CARRO]
+            estado = tabela[estado * k + coluna] if coluna >= 0 else SEM_TRANSICAO
+        yield estado >= 0 and compilado.eh_final(estado)
+
+
+def _classificar_linhas_texto(compilado, caminho, tamanho_buffer):
+    """
+    Classifica as linhas de um arquivo com alfabeto não-ASCII.
+    
+    O arquivo é lido em blocos para um buffer reutilizado, como no caminho
+    ASCII, e cada trecho de linha passa por um ReconhecedorFluxo (que
+    decodifica o UTF-8 de forma incremental). Bytes inválidos rejeitam só
+    a linha em que aparecem; o resto dela é pulado até o próximo '\n'.
+    """
+    fluxo = ReconhecedorFluxo(compilado)
+    buffer = bytearray(tamanho_buffer)
+    visao = memoryview(buffer)
+    
+    cr_pendente = False
+    linha_vazia = True
+    
+    with open(caminho, 'rb') as arquivo:
+        while True:
+            lidos = arquivo.readinto(buffer)
+            if not lidos:
+                break
+            
+            inicio = 0
+            while inicio < lidos:
+                fim = buffer.find(NOVA_LINHA, inicio, lidos)
+                terminada = fim >= 0
+                if not terminada:
+                    fim = lidos
+                
+                if fim > inicio:
+                    linha_vazia = False
+                    
+                    # '\r' só é símbolo se não vier imediatamente antes de '\n'
+                    if cr_pendente:
+                        fluxo.alimentar(b'\r')
+                    cr_pendente = buffer[fim - 1] == RETORNO_CARRO
+                    fluxo.alimentar(visao[inicio:fim - 1 if cr_pendente else fim])
+                
+                if terminada:
+                    yield fluxo.finalizar()
+                    cr_pendente = False
+                    linha_vazia = True
+                    fim += 1
+                inicio = fim
+    
+    if not linha_vazia:
+        if cr_pendente:
+            fluxo.alimentar(b'\r')
+        yield fluxo.finalizar()
@@ -0,0 +1,506 @@
+"""
+Módulo de compilação incremental de gramáticas.
+
+Este módulo é responsável por:
+- Manter, entre uma alteração e outra da gramática, o AFN indexado, os
+  subconjuntos da determinização e a partição da minimização
+- Aplicar um delta de produções (adicionadas e removidas) recalculando
+  apenas o que ele afeta, sem executar o pipeline inteiro de novo
+
+Atualização (CompiladorIncremental.aplicar):
+    1. As produções dos não-terminais alterados são reconvertidas em
+       transições do AFN (as dos demais não mudam)
+    2. Só os subconjuntos que contêm um não-terminal alterado têm os
+       sucessores recalculados; subconjuntos novos são explorados como
+       na construção de subconjuntos, e os que deixaram de ser
+       alcançáveis são descartados
+    3. Os estados cujo futuro não muda (os que não alcançam nenhum
+       subconjunto recalculado) continuam nos mesmos blocos da partição
+       anterior, que seguem corretos. Cada um desses blocos vira um único
+       estado de um AFD quociente, junto com os subconjuntos afetados, e
+       só esse quociente é refinado (algoritmo de Hopcroft)
+
+O resultado de afd_minimo() é equivalente (isomorfo) ao AFD mínimo do
+pipeline completo para a mesma gramática; os estados são nomeados 'q0'
+(inicial), 'q1', ... em ordem de busca em largura, com os símbolos em
+ordem alfabética.
+
+Com expandir_terminais=True, os terminais de vários caracteres viram
+cadeias de estados intermediários, como em converter_gramatica_para_afn;
+os intermediários de um não-terminal são reconvertidos junto com ele.
+
+Uso:
+    compilador = CompiladorIncremental(gramatica, nao_terminal_inicial)
+    afd = compilador.aplicar(adicionar=[('S', 'b<A>')], remover=[('A', 'a')])
+"""
+
+from collections import deque
+
+from automato import Automato
+from conversao import ESTADO_FINAL, AFNIndexado, sucessor_mascara
+from gramatica import extrair_terminal_e_nao_terminal
+from minimizacao import refinar_particao
+
+
+# Bloco dos subconjuntos mortos (que não aceitam nenhuma palavra)
+BLOCO_MORTO = -1
+
+
+class CompiladorIncremental:
+    """
+    Compilador de uma gramática que recebe alterações incrementais.
+    
+    Atributos:
+        gramatica: dict {nao_terminal: [producoes]}, sempre atualizado
+        nao_terminal_inicial: Não-terminal inicial
+        expandir_terminais: Se os terminais de vários caracteres viram
+                            cadeias de um caractere (ver conversao.py)
+        afn: AFNIndexado com os estados e símbolos numerados na ordem em
+             que aparecem (não em ordem alfabética); a numeração nunca
+             muda, então as máscaras dos subconjuntos continuam válidas
+        conjuntos: Máscara de cada subconjunto (None nas posições livres);
+                   o subconjunto 0 é o inicial
+        linhas: Transições de cada subconjunto {coluna: subconjunto}
+        bloco_de: Bloco da partição de cada subconjunto (BLOCO_MORTO para
+                  os mortos)
+    """
+    
+    def __init__(self, gramatica, nao_terminal_inicial, expandir_terminais=False):
+        self.gramatica = {}
+        self.nao_terminal_inicial = nao_terminal_inicial
+        self.expandir_terminais = expandir_terminais
+        
+        # AFN indexado: nome/símbolo → número, e uso de cada símbolo
+        # (quantos estados têm transições por ele)
+        self.afn = AFNIndexado()
+        self._indice_estado = {}
+        self._coluna = {}
+        self._uso_simbolo = []
+        
+        # Estados intermediários de cada não-terminal (expandir_terminais)
+        self._intermediarios = {}
+        
+        # Subconjuntos: máscara → índice, com reaproveitamento de índices
+        self.conjuntos = []
+        self.linhas = []
+        self._indices = {}
+        self._livres = []
+        
+        # Partição: representante (subconjunto) de cada bloco
+        self.bloco_de = []
+        self._representantes = []
+        self._afd_minimo = None
+        
+        self.afn.inicial = 1 << self._estado(nao_terminal_inicial)
+        self._novo_conjunto(self.afn.inicial)
+        
+        self.aplicar(adicionar=[
+            (nao_terminal, producao)
+            for nao_terminal, producoes in gramatica.items()
+            for producao in producoes
+        ])
+    
+    def _estado(self, nome):
+        """Retorna o número do estado do AFN, criando-o se necessário."""
+        indice = self._indice_estado.get(nome)
+        if indice is None:
+            indice = len(self.afn.nomes)
+            self._indice_estado[nome] = indice
+            self.afn.nomes.append(nome)
+            self.afn.saidas.append([])
+            if nome == ESTADO_FINAL:
+                self.afn.finais |= 1 << indice
+        return indice
+    
+    def _coluna_simbolo(self, simbolo):
+        """Retorna a coluna do símbolo, criando-a se necessário."""
+        coluna = self._coluna.get(simbolo)
+        if coluna is None:
+            coluna = len(self.afn.simbolos)
+            self._coluna[simbolo] = coluna
+            self.afn.simbolos.append(simbolo)
+            self._uso_simbolo.append(0)
+        return coluna
+    
+    def _novo_conjunto(self, mascara):
+        """Registra um subconjunto novo (sem transições) e retorna seu índice."""
+        if self._livres:
+            indice = self._livres.pop()
+            self.conjuntos[indice] = mascara
+            self.linhas[indice] = {}
+        else:
+            indice = len(self.conjuntos)
+            self.conjuntos.append(mascara)
+            self.linhas.append({})
+            self.bloco_de.append(BLOCO_MORTO)
+        self._indices[mascara] = indice
+        return indice
+    
+    def _reconverter(self, nao_terminal):
+        """
+        Refaz as transições do AFN de um não-terminal (e dos seus estados
+        intermediários) a partir das suas produções, como
+        converter_gramatica_para_afn.
+        
+        Retorna: máscara dos estados do AFN alterados
+        """
+        afn = self.afn
+        indice = self._estado(nao_terminal)
+        
+        # Os intermediários anteriores perdem as transições; os que ainda
+        # forem usados as recebem de novo abaixo
+        anteriores = [indice, *self._intermediarios.pop(nao_terminal, ())]
+        for estado in anteriores:
+            for coluna, _ in afn.saidas[estado]:
+                self._uso_simbolo[coluna] -= 1
+            afn.saidas[estado] = []
+        
+        # Transições de cada estado: {estado: {coluna: máscara destino}}
+        destinos = {indice: {}}
+        final = False
+        for producao in self.gramatica.get(nao_terminal, ()):
+            terminal, destino, eh_epsilon = extrair_terminal_e_nao_terminal(producao)
+            if eh_epsilon:
+                final = True
+                continue
+            
+            origem = indice
+            if self.expandir_terminais and len(terminal) > 1:
+                # Mesmos nomes de conversao._expandir_terminal
+                for i in range(1, len(terminal)):
+                    intermediario = self._estado(f"<{nao_terminal}>/{terminal[:i]}")
+                    linha = destinos.setdefault(origem, {})
+                    coluna = self._coluna_simbolo(terminal[i - 1])
+                    linha[coluna] = linha.get(coluna, 0) | (1 << intermediario)
+                    origem = intermediario
+                terminal = terminal[-1]
+            
+            linha = destinos.setdefault(origem, {})
+            coluna = self._coluna_simbolo(terminal)
+            bit = 1 << self._estado(destino if destino is not None else ESTADO_FINAL)
+            linha[coluna] = linha.get(coluna, 0) | bit
+        
+        mascara = 0
+        for estado in anteriores:
+            mascara |= 1 << estado
+        for estado, linha in destinos.items():
+            afn.saidas[estado] = sorted(linha.items())
+            for coluna in linha:
+                self._uso_simbolo[coluna] += 1
+            mascara |= 1 << estado
+        
+        intermediarios = [estado for estado in destinos if estado != indice]
+        if intermediarios:
+            self._intermediarios[nao_terminal] = intermediarios
+        
+        bit = 1 << indice
+        if final:
+            afn.finais |= bit
+        else:
+            afn.finais &= ~bit
+        return mascara
+    
+    def aplicar(self, adicionar=(), remover=(), contadores=None):
+        """
+        Aplica um delta de produções e atualiza o AFD mínimo.
+        
+        'adicionar' e 'remover' são iteráveis de (nao_terminal, producao),
+        com a produção no formato da gramática (ex: 'a<B>', 'a', 'ε').
+        Remover uma produção inexistente lança ValueError, sem alterar
+        nada. Se a mesma produção estiver repetida, só uma cópia é removida.
+        
+        Se 'contadores' (dict) for informado, registra
+        'subconjuntos_recalculados', 'subconjuntos_novos',
+        'subconjuntos_descartados', 'estados_afetados', 'estados_quociente'
+        e 'rodadas_refinamento'.
+        
+        Retorna: AFD mínimo atualizado (ver afd_minimo)
+        """
+        # Aplica o delta sobre cópias das listas de produções, para não
+        # deixar a gramática pela metade se uma remoção falhar
+        alteradas = {}
+        for nao_terminal, producao in remover:
+            producoes = alteradas.get(nao_terminal)
+            if producoes is None:
+                producoes = alteradas[nao_terminal] = list(self.gramatica.get(nao_terminal, ()))
+            producao = producao.strip()
+            if producao not in producoes:
+                raise ValueError(f"Produção '{producao}' não encontrada em <{nao_terminal}>")
+            producoes.remove(producao)
+        
+        for nao_terminal, producao in adicionar:
+            producoes = alteradas.get(nao_terminal)
+            if producoes is None:
+                producoes = alteradas[nao_terminal] = list(self.gramatica.get(nao_terminal, ()))
+            producao = producao.strip()
+            if producao:
+                producoes.append(producao)
+        
+        mascara_alterada = 0
+        for nao_terminal, producoes in alteradas.items():
+            if producoes:
+                self.gramatica[nao_terminal] = producoes
+            else:
+                self.gramatica.pop(nao_terminal, None)
+            mascara_alterada |= self._reconverter(nao_terminal)
+        
+        recalculados = self._atualizar_subconjuntos(mascara_alterada, contadores)
+        self._atualizar_particao(recalculados, contadores)
+        
+        self._afd_minimo = None
+        return self.afd_minimo()
+    
+    def adicionar_producao(self, nao_terminal, producao):
+        """Adiciona uma produção. Retorna: AFD mínimo atualizado."""
+        return self.aplicar(adicionar=[(nao_terminal, producao)])
+    
+    def remover_producao(self, nao_terminal, producao):
+        """Remove uma produção. Retorna: AFD mínimo atualizado."""
+        return self.aplicar(remover=[(nao_terminal, producao)])
+    
+    def recarregar(self, gramatica):
+        """
+        Atualiza para uma nova versão da gramática (ex: o arquivo foi
+        editado), aplicando só a diferença entre as produções de cada
+        não-terminal. O não-terminal inicial é mantido.
+        
+        Retorna: AFD mínimo atualizado
+        """
+        adicionar = []
+        remover = []
+        
+        for nao_terminal in set(self.gramatica) | set(gramatica):
+            antigas = list(self.gramatica.get(nao_terminal, ()))
+            for producao in gramatica.get(nao_terminal, ()):
+                producao = producao.strip()
+                if producao in antigas:
+                    antigas.remove(producao)
+                elif producao:
+                    adicionar.append((nao_terminal, producao))
+            remover.extend((nao_terminal, producao) for producao in antigas)
+        
+        return self.aplicar(adicionar, remover)
+    
+    def _atualizar_subconjuntos(self, mascara_alterada, contadores):
+        """
+        Recalcula os sucessores dos subconjuntos que contêm estados
+        alterados do AFN, explora os subconjuntos novos e descarta os que
+        deixaram de ser alcançáveis.
+        
+        Retorna: conjunto dos subconjuntos recalculados ou novos
+        """
+        conjuntos = self.conjuntos
+        linhas = self.linhas
+        
+        fila = deque(
+            i for i, mascara in enumerate(conjuntos)
+            if mascara is not None and mascara & mascara_alterada
+        )
+        num_recalculados = len(fila)
+        recalculados = set(fila)
+        novos = 0
+        
+        # Construção de subconjuntos a partir dos subconjuntos afetados
+        while fila:
+            atual = fila.popleft()
+            linha = {}
+            
+            for coluna, destino in sucessor_mascara(self.afn, conjuntos[atual]).items():
+                indice = self._indices.get(destino)
+                if indice is None:
+                    indice = self._novo_conjunto(destino)
+                    recalculados.add(indice)
+                    fila.append(indice)
+                    novos += 1
+                linha[coluna] = indice
+            
+            linhas[atual] = linha
+        
+        # Descarta os subconjuntos que não são mais alcançáveis
+        alcancaveis = [False] * len(conjuntos)
+        alcancaveis[0] = True
+        fila = deque([0])
+        while fila:
+            for destino in linhas[fila.popleft()].values():
+                if not alcancaveis[destino]:
+                    alcancaveis[destino] = True
+                    fila.append(destino)
+        
+        descartados = 0
+        for i, mascara in enumerate(conjuntos):
+            if mascara is not None and not alcancaveis[i]:
+                del self._indices[mascara]
+                conjuntos[i] = None
+                linhas[i] = None
+                self.bloco_de[i] = BLOCO_MORTO
+                self._livres.append(i)
+                recalculados.discard(i)
+                descartados += 1
+        
+        if contadores is not None:
+            contadores['subconjuntos_recalculados'] = num_recalculados
+            contadores['subconjuntos_novos'] = novos
+            contadores['subconjuntos_descartados'] = descartados
+        
+        return recalculados
+    
+    def _atualizar_particao(self, recalculados, contadores):
+        """
+        Refaz a partição dos estados afetados pelo delta.
+        
+        Afetados são os subconjuntos que alcançam algum subconjunto
+        recalculado: só o futuro deles pode ter mudado. Os demais
+        continuam nos blocos anteriores, e cada um desses blocos entra
+        como um único estado no AFD quociente refinado aqui. Um estado
+        extra (o poço, índice 'poco') recebe as transições indefinidas e
+        os subconjuntos mortos não afetados; o bloco em que ele termina
+        é o dos mortos.
+        """
+        conjuntos = self.conjuntos
+        linhas = self.linhas
+        bloco_de = self.bloco_de
+        finais = self.afn.finais
+        
+        # Afetados: busca para trás a partir dos recalculados
+        origens = [[] for _ in conjuntos]
+        for i, linha in enumerate(linhas):
+            if linha is not None:
+                for destino in linha.values():
+                    origens[destino].append(i)
+        
+        afetado = [False] * len(conjuntos)
+        fila = deque(recalculados)
+        for i in recalculados:
+            afetado[i] = True
+        while fila:
+            for origem in origens[fila.popleft()]:
+                if not afetado[origem]:
+                    afetado[origem] = True
+                    fila.append(origem)
+        del origens
+        
+        # Estados do quociente: um por bloco anterior com membros não
+        # afetados (representado por um deles) e um por subconjunto afetado
+        representantes = []
+        estado_do_bloco = {}
+        estado_do_afetado = {}
+        num_afetados = 0
+        
+        for i, mascara in enumerate(conjuntos):
+            if mascara is None:
+                continue
+            if afetado[i]:
+                num_afetados += 1
+            elif bloco_de[i] != BLOCO_MORTO and bloco_de[i] not in estado_do_bloco:
+                estado_do_bloco[bloco_de[i]] = len(representantes)
+                representantes.append(i)
+        
+        for i, mascara in enumerate(conjuntos):
+            if mascara is not None and afetado[i]:
+                estado_do_afetado[i] = len(representantes)
+                representantes.append(i)
+        
+        poco = len(representantes)
+        n = poco + 1
+        
+        def estado_quociente(i):
+            if afetado[i]:
+                return estado_do_afetado[i]
+            return estado_do_bloco.get(bloco_de[i], poco)
+        
+        # Índice de transições inversas do quociente, só pelos símbolos em uso
+        colunas = [c for c, uso in enumerate(self._uso_simbolo) if uso]
+        inversas = [{} for _ in colunas]
+        
+        for estado, i in enumerate(representantes):
+            linha = linhas[i]
+            for k, coluna in enumerate(colunas):
+                destino = linha.get(coluna)
+                destino = poco if destino is None else estado_quociente(destino)
+                inversas[k].setdefault(destino, []).append(estado)
+        for inversa in inversas:
+            inversa.setdefault(poco, []).append(poco)
+        
+        finais_quociente = [e for e, i in enumerate(representantes) if conjuntos[i] & finais]
+        nao_finais = [e for e, i in enumerate(representantes) if not conjuntos[i] & finais]
+        nao_finais.append(poco)
+        blocos_iniciais = [b for b in (finais_quociente, nao_finais) if b]
+        
+        _, inicio, bloco_quociente, rodadas = refinar_particao(inversas, blocos_iniciais, n)
+        del inversas
+        
+        # Renumera os blocos (sem o dos mortos) e reatribui os subconjuntos
+        bloco_morto = bloco_quociente[poco]
+        novo_bloco = {}
+        self._representantes = []
+        
+        for estado, i in enumerate(representantes):
+            b = bloco_quociente[estado]
+            if b != bloco_morto and b not in novo_bloco:
+                novo_bloco[b] = len(self._representantes)
+                self._representantes.append(i)
+        
+        for i, mascara in enumerate(conjuntos):
+            if mascara is not None:
+                bloco_de[i] = novo_bloco.get(bloco_quociente[estado_quociente(i)], BLOCO_MORTO)
+        
+        if contadores is not None:
+            contadores['estados_afetados'] = num_afetados
+            contadores['estados_quociente'] = n
+            contadores['rodadas_refinamento'] = rodadas
+    
+    def afd_minimo(self):
+        """
+        Monta o AFD mínimo a partir da partição atual (sem estado poço).
+        Se a linguagem for vazia, o resultado tem um único estado, não
+        final, com laços em todos os símbolos, como no pipeline completo.
+        
+        Retorna: AFD mínimo (Automato)
+        """
+        if self._afd_minimo is not None:
+            return self._afd_minimo
+        
+        afn = self.afn
+        colunas = sorted(
+            (c for c, uso in enumerate(self._uso_simbolo) if uso),
+            key=lambda c: afn.simbolos[c]
+        )
+        
+        afd = Automato()
+        afd.alfabeto = {afn.simbolos[c] for c in colunas}
+        afd.definir_estado_inicial('q0')
+        
+        bloco_inicial = self.bloco_de[0]
+        if bloco_inicial == BLOCO_MORTO:
+            for coluna in colunas:
+                afd.adicionar_transicao_afd('q0', afn.simbolos[coluna], 'q0')
+            self._afd_minimo = afd
+            return afd
+        
+        nomes = {bloco_inicial: 'q0'}
+        fila = deque([bloco_inicial])
+        
+        while fila:
+            bloco = fila.popleft()
+            nome = nomes[bloco]
+            representante = self._representantes[bloco]
+            if self.conjuntos[representante] & afn.finais:
+                afd.adicionar_estado_final(nome)
+            if colunas:
+                afd.transicoes[nome] = {}
+            
+            linha = self.linhas[representante]
+            for coluna in colunas:
+                destino = linha.get(coluna)
+                if destino is None or self.bloco_de[destino] == BLOCO_MORTO:
+                    continue
+                bloco_destino = self.bloco_de[destino]
+                nome_destino = nomes.get(bloco_destino)
+                if nome_destino is None:
+                    nome_destino = 'q' + str(len(nomes))
+                    nomes[bloco_destino] = nome_destino
+                    fila.append(bloco_destino)
+                afd.adicionar_transicao_afd(nome, afn.simbolos[coluna], nome_destino)
+        
+        self._afd_minimo = afd
+        return afd
@@ -4,10 +4,46 @@ Módulo de entrada/saída para AFD.
 Este módulo é responsável por:
 - Salvar o AFD em formato CSV (transições)
 - Salvar o AFD em formato de tabela
+- Gerar um módulo Python importável com o reconhecedor especializado
+- Salvar e carregar o AFD em formato binário compacto (mapeável com mmap)
+- Carregar de volta os arquivos CSV gerados por salvar_afd_csv e
+  salvar_afd_tabela
 - Imprimir o AFD no terminal para debug
 """
 
 import csv
+import mmap
+import struct
+import sys
+from array import array
+
+from automato import Automato
+from compilado import AFDCompilado, NomesEstados, SEM_TRANSICAO, como_compilado, compilar
+
+
+# Cabeçalhos dos formatos CSV
+CABECALHO_CSV = ['estado', 'simbolo', 'destino', 'eh_inicial', 'eh_final']
+CABECALHO_TABELA = ['estado', 'inicial', 'final']
+
+
+# Extensões de arquivo reconhecidas por salvar_afd
+EXTENSAO_PYTHON = '.py'
+EXTENSAO_BINARIA = '.afdb'
+
+# Formato binário: cabeçalho fixo de 32 bytes (little-endian)
+#   assinatura (4s), versão (H), reservado (H), estados (I), símbolos (I),
+#   bytes da tabela de símbolos (I), bytes dos nomes de estados (Q), 4 bytes livres
+# seguido das seções:
+#   transições: int32[estados * símbolos] (-1 = sem transição)
+#   finais: bitmap de ceil(estados / 8) bytes
+#   símbolos: UTF-8 separados por '\0'; a partir da versão 2, as classes
+#             de símbolos (colunas) são separadas por SEPARADOR_CLASSES
+#   nomes de estados: UTF-8 separados por '\0'
+ASSINATURA_BINARIA = b'MAFD'
+VERSAO_BINARIA = 2
+VERSOES_BINARIAS_SUPORTADAS = (1, 2)
+SEPARADOR_CLASSES = '\x1e'
+CABECALHO_BINARIO = struct.Struct('<4sHHIIIQ4x')
 
 
 def salvar_afd_csv(afd, caminho_saida):
@@ -23,7 +59,7 @@ def salvar_afd_csv(afd, caminho_saida):
         escritor = csv.writer(arquivo)
         
         # Cabeçalho
-        escritor.writerow(['estado', 'simbolo', 'destino', 'eh_inicial', 'eh_final'])
+        escritor.writerow(CABECALHO_CSV)
         
         estados_com_transicao = set()
         
@@ -73,7 +109,7 @@ def salvar_afd_tabela(afd, caminho_saida):
         
         # Cabeçalho com símbolos do alfabeto
         simbolos = sorted(afd.alfabeto)
-        cabecalho = ['estado', 'inicial', 'final'] + simbolos
+        cabecalho = CABECALHO_TABELA + simbolos
         escritor.writerow(cabecalho)
         
         # Uma linha por estado
@@ -96,6 +132,385 @@ def salvar_afd_tabela(afd, caminho_saida):
             escritor.writerow(linha)
 
 
+# Função de reconhecimento escrita no módulo gerado por salvar_afd_python
+_CODIGO_RECONHECER = '''def reconhecer(palavra, _classes=CLASSES, _transicoes=TRANSICOES, _finais=FINAIS):
+    """Retorna True se a palavra é aceita pelo AFD, False caso contrário."""
+    estado = 0
+    for simbolo in palavra:
+        classe = _classes.get(simbolo)
+        if classe is None:
+            return False
+        estado = _transicoes[estado].get(classe)
+        if estado is None:
+            return False
+    return estado in _finais
+'''
+
+
+def salvar_afd_python(afd, caminho_saida):
+    """
+    Gera um módulo Python com o AFD embutido e uma função reconhecer().
+    
+    O módulo gerado não depende deste projeto: contém apenas constantes
+    literais e a função de reconhecimento. Símbolos equivalentes dividem
+    uma classe (CLASSES), estados são números inteiros (o inicial é 0) e
+    cada estado tem um dicionário {classe: destino}:
+    
+        CLASSES = {'a': 0, 'b': 1, 'c': 1}
+        TRANSICOES = ({0: 1}, {0: 1, 1: 2}, {})
+        FINAIS = frozenset({2})
+    
+    Assim, um serviço só precisa importar o módulo, sem refazer parsing,
+    determinização e minimização da gramática.
+    """
+    compilado = compilar(afd)
+    k = len(compilado.simbolos)
+    
+    linhas_transicoes = []
+    for estado in range(compilado.num_estados):
+        pares = []
+        for coluna in range(k):
+            destino = compilado.tabela[estado * k + coluna]
+            if destino >= 0:
+                pares.append(f'{coluna}: {destino}')
+        linhas_transicoes.append('    {' + ', '.join(pares) + '},')
+    
+    finais = [e for e in range(compilado.num_estados) if compilado.eh_final(e)]
+    alfabeto = tuple(sorted(compilado.indice_simbolo))
+    classes = {simbolo: compilado.indice_simbolo[simbolo] for simbolo in alfabeto}
+    
+    with open(caminho_saida, 'w', encoding='utf-8') as arquivo:
+        arquivo.write('"""\n')
+        arquivo.write('AFD mínimo gerado automaticamente. Não edite este arquivo.\n')
+        arquivo.write('\n')
+        arquivo.write(f'Estados: {compilado.num_estados}\n')
+        arquivo.write(f'Alfabeto: {list(alfabeto)!r}\n')
+        arquivo.write('"""\n\n')
+        arquivo.write(f'ALFABETO = {alfabeto!r}\n\n')
+        arquivo.write('# CLASSES[simbolo] = classe (símbolos equivalentes dividem a classe)\n')
+        arquivo.write(f'CLASSES = {classes!r}\n\n')
+        arquivo.write(f'NOMES_ESTADOS = {compilado.nomes_estados!r}\n\n')
+        arquivo.write('ESTADO_INICIAL = 0\n\n')
+        arquivo.write('FINAIS = frozenset({' + ', '.join(map(str, finais)) + '})\n\n')
+        arquivo.write('# TRANSICOES[estado] = {classe: destino}\n')
+        arquivo.write('TRANSICOES = (\n')
+        arquivo.write('\n'.join(linhas_transicoes))
+        arquivo.write('\n)\n\n\n')
+        arquivo.write(_CODIGO_RECONHECER)
+
+
+def salvar_afd_binario(afd, caminho_saida):
+    """
+    Salva o AFD (Automato ou AFDCompilado) no formato binário versionado.
+    
+    A tabela de transições e o bitmap de estados finais são gravados de
+    uma vez a partir dos buffers do AFDCompilado, sem conversão por
+    transição. O formato está descrito em CABECALHO_BINARIO.
+    """
+    compilado = como_compilado(afd)
+    n = compilado.num_estados
+    k = len(compilado.simbolos)
+    
+    simbolos = SEPARADOR_CLASSES.join(
+        '\0'.join(classe) for classe in compilado.classes
+    ).encode('utf-8')
+    nomes = '\0'.join(compilado.nomes_estados).encode('utf-8')
+    
+    tabela = compilado.tabela
+    if sys.byteorder != 'little':
+        tabela = array('i', tabela)
+        tabela.byteswap()
+    
+    with open(caminho_saida, 'wb') as arquivo:
+        arquivo.write(CABECALHO_BINARIO.pack(
+            ASSINATURA_BINARIA, VERSAO_BINARIA, 0, n, k, len(simbolos), len(nomes)
+        ))
+        arquivo.write(tabela)
+        arquivo.write(compilado.finais[:(n + 7) // 8])
+        arquivo.write(simbolos)
+        arquivo.write(nomes)
+
+
+def carregar_afd_binario(caminho):
+    """
+    Carrega um AFD salvo por salvar_afd_binario.
+    
+    O arquivo é mapeado em memória (mmap, somente leitura) e a tabela de
+    transições vira uma memoryview sobre o mapeamento: nada é copiado nem
+    interpretado por transição, então o tempo de carga praticamente não
+    depende do tamanho do AFD. Processos que carregam o mesmo arquivo
+    compartilham as mesmas páginas de memória do sistema operacional.
+    
+    Retorna: AFDCompilado
+    """
+    with open(caminho, 'rb') as arquivo:
+        mapeamento = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    visao = memoryview(mapeamento)
+    if len(visao) < CABECALHO_BINARIO.size:
+        raise ValueError(f"Arquivo binário de AFD inválido: {caminho}")
+    
+    assinatura, versao, _, n, k, tam_simbolos, tam_nomes = \
+        CABECALHO_BINARIO.unpack_from(visao)
+    
+    if assinatura != ASSINATURA_BINARIA:
+        raise ValueError(f"Arquivo binário de AFD inválido: {caminho}")
+    if versao not in VERSOES_BINARIAS_SUPORTADAS:
+        raise ValueError(f"Versão de formato binário não suportada: {versao}")
+    
+    # Limites de cada seção
+    inicio_tabela = CABECALHO_BINARIO.size
+    inicio_finais = inicio_tabela + 4 * n * k
+    inicio_simbolos = inicio_finais + (n + 7) // 8
+    inicio_nomes = inicio_simbolos + tam_simbolos
+    fim = inicio_nomes + tam_nomes
+    
+    if len(visao) != fim:
+        raise ValueError(f"Arquivo binário de AFD truncado ou corrompido: {caminho}")
+    
+    if sys.byteorder == 'little':
+        tabela = visao[inicio_tabela:inicio_finais].cast('i')
+    else:
+        tabela = array('i', bytes(visao[inicio_tabela:inicio_finais]))
+        tabela.byteswap()
+    
+    # Versão 1: um símbolo por coluna; versão 2: uma classe por coluna
+    simbolos = bytes(visao[inicio_simbolos:inicio_nomes]).decode('utf-8')
+    if not k:
+        classes = []
+    elif versao == 1:
+        classes = [(simbolo,) for simbolo in simbolos.split('\0')]
+    else:
+        classes = [tuple(classe.split('\0')) for classe in simbolos.split(SEPARADOR_CLASSES)]
+    
+    return AFDCompilado(
+        [classe[0] for classe in classes],
+        tabela,
+        visao[inicio_finais:inicio_simbolos],
+        NomesEstados(visao[inicio_nomes:fim], n),
+        classes,
+    )
+
+
+class _ConstrutorAFD:
+    """
+    Monta um AFD em uma passada a partir das linhas de um arquivo.
+    
+    Nomes de estados e símbolos passam por dicionários de internação,
+    então cada nome repetido no arquivo vira a mesma string em memória.
+    No modo compilado os dicionários guardam o índice de cada nome e as
+    transições são acumuladas em arrays de inteiros, convertidos em um
+    AFDCompilado no final; caso contrário, os dicionários do Automato
+    são preenchidos diretamente.
+    """
+    
+    def __init__(self, compilado):
+        self.compilado = compilado
+        self.estados = {}
+        self.simbolos = {}
+        self.estado_inicial = None
+        self.estados_finais = set()
+        
+        # Modo Automato: {estado: {simbolo: destino}}
+        self.transicoes = {}
+        
+        # Modo compilado: transições (origem, coluna, destino) por índice
+        self.origens = array('i')
+        self.colunas = array('i')
+        self.destinos = array('i')
+    
+    def estado(self, nome):
+        """Retorna o nome internado (ou o índice, no modo compilado)."""
+        valor = self.estados.get(nome)
+        if valor is None:
+            valor = len(self.estados) if self.compilado else nome
+            self.estados[nome] = valor
+        return valor
+    
+    def simbolo(self, nome):
+        """Retorna o símbolo internado (ou sua coluna, no modo compilado)."""
+        valor = self.simbolos.get(nome)
+        if valor is None:
+            valor = len(self.simbolos) if self.compilado else nome
+            self.simbolos[nome] = valor
+        return valor
+    
+    def definir_estado(self, nome, eh_inicial, eh_final):
+        """
+        Registra um estado de origem.
+        Retorna: o estado internado e o dicionário que recebe suas transições
+        (None no modo compilado)
+        """
+        estado = self.estado(nome)
+        if eh_inicial:
+            self.estado_inicial = estado
+        if eh_final:
+            self.estados_finais.add(estado)
+        if self.compilado:
+            return estado, None
+        return estado, self.transicoes.setdefault(estado, {})
+    
+    def adicionar_linha(self, nome, eh_inicial, eh_final, simbolos, destinos):
+        """
+        Registra um estado e todas as suas transições de uma vez
+        (símbolos já internados; destino '-' = sem transição).
+        """
+        origem, linha = self.definir_estado(nome, eh_inicial, eh_final)
+        estado = self.estado
+        
+        for simbolo, destino in zip(simbolos, destinos):
+            if destino == '-':
+                continue
+            if linha is not None:
+                linha[simbolo] = estado(destino)
+            else:
+                self.origens.append(origem)
+                self.colunas.append(simbolo)
+                self.destinos.append(estado(destino))
+    
+    def concluir(self):
+        """Retorna o Automato ou o AFDCompilado montado."""
+        if self.estado_inicial is None:
+            raise ValueError("Arquivo de AFD sem estado inicial")
+        
+        if not self.compilado:
+            afd = Automato()
+            afd.estados = set(self.estados.values())
+            afd.alfabeto = set(self.simbolos.values())
+            afd.estado_inicial = self.estado_inicial
+            afd.estados_finais = self.estados_finais
+            afd.transicoes = {e: t for e, t in self.transicoes.items() if t}
+            return afd
+        
+        # O estado inicial troca de índice com o estado 0
+        inicial = self.estado_inicial
+        permutacao = list(range(len(self.estados)))
+        permutacao[0], permutacao[inicial] = inicial, 0
+        
+        # Colunas em ordem alfabética, como em compilar()
+        ordem = sorted(self.simbolos)
+        nova_coluna = [0] * len(ordem)
+        for coluna, simbolo in enumerate(ordem):
+            nova_coluna[self.simbolos[simbolo]] = coluna
+        
+        n = len(self.estados)
+        k = len(ordem)
+        tabela = array('i', [SEM_TRANSICAO]) * (n * k)
+        for origem, coluna, destino in zip(self.origens, self.colunas, self.destinos):
+            tabela[permutacao[origem] * k + nova_coluna[coluna]] = permutacao[destino]
+        
+        finais = bytearray((n + 7) // 8)
+        for estado in self.estados_finais:
+            estado = permutacao[estado]
+            finais[estado >> 3] |= 1 << (estado & 7)
+        
+        nomes = [None] * n
+        for nome, estado in self.estados.items():
+            nomes[permutacao[estado]] = nome
+        
+        return AFDCompilado(ordem, tabela, finais, nomes)
+
+
+def carregar_afd_csv(caminho, compilado=False):
+    """
+    Carrega um AFD salvo por salvar_afd_csv (uma linha por transição).
+    
+    O arquivo é lido em fluxo com csv.reader e o AFD é montado em uma
+    única passada. As marcas eh_inicial/eh_final só são avaliadas quando
+    o estado da linha muda; o laço por linha faz apenas a internação dos
+    nomes e o registro da transição.
+    
+    Retorna: Automato, ou AFDCompilado se compilado=True
+    """
+    construtor = _ConstrutorAFD(compilado)
+    estados = construtor.estados
+    simbolos = construtor.simbolos
+    
+    with open(caminho, 'r', newline='', encoding='utf-8') as arquivo:
+        leitor = csv.reader(arquivo)
+        if next(leitor, None) != CABECALHO_CSV:
+            raise ValueError(f"Cabeçalho CSV de AFD inválido: {caminho}")
+        
+        estado_anterior = None
+        
+        if not compilado:
+            # Nomes internados com setdefault: uma chamada por nome
+            internar_estado = estados.setdefault
+            internar_simbolo = simbolos.setdefault
+            
+            for estado, simbolo, destino, eh_inicial, eh_final in leitor:
+                if estado != estado_anterior:
+                    _, linha = construtor.definir_estado(
+                        estado, eh_inicial == 'true', eh_final == 'true'
+                    )
+                    estado_anterior = estado
+                if simbolo:
+                    linha[internar_simbolo(simbolo, simbolo)] = internar_estado(destino, destino)
+        else:
+            adicionar_origem = construtor.origens.append
+            adicionar_coluna = construtor.colunas.append
+            adicionar_destino = construtor.destinos.append
+            
+            for estado, simbolo, destino, eh_inicial, eh_final in leitor:
+                if estado != estado_anterior:
+                    origem, _ = construtor.definir_estado(
+                        estado, eh_inicial == 'true', eh_final == 'true'
+                    )
+                    estado_anterior = estado
+                if simbolo:
+                    coluna = simbolos.get(simbolo)
+                    if coluna is None:
+                        coluna = simbolos[simbolo] = len(simbolos)
+                    indice = estados.get(destino)
+                    if indice is None:
+                        indice = estados[destino] = len(estados)
+                    adicionar_origem(origem)
+                    adicionar_coluna(coluna)
+                    adicionar_destino(indice)
+    
+    return construtor.concluir()
+
+
+def carregar_afd_tabela(caminho, compilado=False):
+    """
+    Carrega um AFD salvo por salvar_afd_tabela (uma linha por estado,
+    uma coluna por símbolo, '-' para transição indefinida).
+    
+    Retorna: Automato, ou AFDCompilado se compilado=True
+    """
+    construtor = _ConstrutorAFD(compilado)
+    
+    with open(caminho, 'r', newline='', encoding='utf-8') as arquivo:
+        leitor = csv.reader(arquivo)
+        cabecalho = next(leitor, None)
+        if cabecalho is None or cabecalho[:3] != CABECALHO_TABELA:
+            raise ValueError(f"Cabeçalho de tabela de AFD inválido: {caminho}")
+        
+        simbolos = [construtor.simbolo(s) for s in cabecalho[3:]]
+        
+        for linha in leitor:
+            construtor.adicionar_linha(
+                linha[0], linha[1] == 'true', linha[2] == 'true', simbolos, linha[3:]
+            )
+    
+    return construtor.concluir()
+
+
+def salvar_afd(afd, caminho_saida):
+    """
+    Salva o AFD no formato indicado pela extensão do arquivo de saída:
+        .py   → módulo Python (salvar_afd_python)
+        .afdb → formato binário (salvar_afd_binario)
+        outras → CSV com uma linha por transição (salvar_afd_csv)
+    """
+    if caminho_saida.endswith(EXTENSAO_PYTHON):
+        salvar_afd_python(afd, caminho_saida)
+    elif caminho_saida.endswith(EXTENSAO_BINARIA):
+        salvar_afd_binario(afd, caminho_saida)
+    else:
+        salvar_afd_csv(afd, caminho_saida)
+
+
 def imprimir_afd(afd):
     """
     Imprime o AFD no terminal de forma formatada.
@@ -0,0 +1,229 @@
+"""
+Módulo de reconhecimento em lote (vetorizado com NumPy).
+
+Este módulo é responsável por:
+- Montar uma matriz de transições NumPy a partir do AFD mínimo
+- Codificar listas de palavras em uma matriz de inteiros com preenchimento
+- Avançar todas as palavras ao mesmo tempo, uma coluna por vez,
+  devolvendo um vetor booleano com o resultado de cada palavra
+
+Codificação das palavras (matriz m × L, uma palavra por linha):
+    0..k-1  → coluna do símbolo no AFDCompilado
+    k       → símbolo fora do alfabeto (leva à rejeição)
+    -1      → preenchimento após o fim da palavra (mantém o estado)
+
+O NumPy é uma dependência opcional, exigida apenas por este módulo.
+"""
+
+from compilado import como_compilado
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Código usado para preencher palavras mais curtas que a maior do lote
+PREENCHIMENTO = -1
+
+# Quantidade padrão de palavras processadas por vez
+TAMANHO_LOTE_PADRAO = 65536
+
+
+def _exigir_numpy():
+    """Lança ImportError com uma mensagem clara se o NumPy não existir."""
+    if np is None:
+        raise ImportError(
+            "O reconhecimento em lote requer o pacote numpy (pip install numpy)"
+        )
+
+
+def montar_matriz_transicoes(compilado):
+    """
+    Monta a matriz de transições NumPy usada pelo reconhecimento em lote.
+    
+    Formato: matriz (n+1) × (k+2) de int32
+        - Linhas 0..n-1: estados do AFD; linha n: estado de rejeição
+        - Colunas 0..k-1: símbolos; coluna k: símbolo desconhecido
+        - Coluna k+1 (= -1): preenchimento, que mantém o estado atual
+    
+    Retorna: (matriz de transições, vetor booleano de estados finais)
+    """
+    _exigir_numpy()
+    
+    n = compilado.num_estados
+    k = len(compilado.simbolos)
+    rejeicao = n
+    
+    transicoes = np.full((n + 1, k + 2), rejeicao, dtype=np.int32)
+    
+    tabela = np.frombuffer(compilado.tabela, dtype=np.int32).reshape(n, k)
+    transicoes[:n, :k] = np.where(tabela < 0, rejeicao, tabela)
+    transicoes[:, k + 1] = np.arange(n + 1, dtype=np.int32)
+    
+    bits = np.unpackbits(
+        np.frombuffer(bytes(compilado.finais), dtype=np.uint8),
+        bitorder='little'
+    )
+    finais = np.zeros(n + 1, dtype=bool)
+    finais[:n] = bits[:n].astype(bool)
+    
+    return transicoes, finais
+
+
+def codificar_palavras(compilado, palavras):
+    """
+    Codifica uma sequência de palavras em uma matriz com preenchimento.
+    
+    Palavras do tipo str são convertidas de uma só vez via UTF-32,
+    sem laço Python por caractere. Outras sequências (ex: listas de
+    símbolos) são codificadas símbolo a símbolo.
+    
+    Retorna: matriz int32 m × L (L = tamanho da maior palavra)
+    """
+    _exigir_numpy()
+    
+    palavras = list(palavras)
+    k = len(compilado.simbolos)
+    comprimentos = np.fromiter(
+        (len(p) for p in palavras), dtype=np.int64, count=len(palavras)
+    )
+    maior = int(comprimentos.max()) if len(palavras) else 0
+    
+    matriz = np.full((len(palavras), maior), PREENCHIMENTO, dtype=np.int32)
+    if maior == 0:
+        return matriz
+    
+    if all(isinstance(p, str) for p in palavras):
+        codigos = _codificar_texto(compilado, ''.join(palavras))
+        
+        # Posição (linha, coluna) de cada caractere na matriz
+        linhas = np.repeat(np.arange(len(palavras)), comprimentos)
+        inicios = np.cumsum(comprimentos) - comprimentos
+        colunas = np.arange(len(codigos)) - np.repeat(inicios, comprimentos)
+        matriz[linhas, colunas] = codigos
+    else:
+        indice_simbolo = compilado.indice_simbolo
+        for i, palavra in enumerate(palavras):
+            matriz[i, :len(palavra)] = [indice_simbolo.get(s, k) for s in palavra]
+    
+    return matriz
+
+
+def _codificar_texto(compilado, texto):
+    """
+    Converte cada caractere do texto em sua coluna no AFD compilado,
+    usando uma tabela indexada pelo código Unicode do caractere.
+    """
+    k = len(compilado.simbolos)
+    pontos = np.frombuffer(texto.encode('utf-32-le'), dtype=np.uint32)
+    
+    # Apenas símbolos de um caractere podem casar com um caractere da palavra
+    simples = [(ord(s), c) for s, c in compilado.indice_simbolo.items() if len(s) == 1]
+    limite = max((p for p, _ in simples), default=0)
+    
+    mapa = np.full(limite + 2, k, dtype=np.int32)
+    for ponto, coluna in simples:
+        mapa[ponto] = coluna
+    
+    # Caracteres acima do limite caem na última posição (desconhecido)
+    return mapa[np.minimum(pontos, limite + 1)]
+
+
+def reconhecer_matriz(afd, matriz):
+    """
+    Reconhece todas as palavras de uma matriz já codificada.
+    
+    A matriz deve seguir a codificação descrita no módulo
+    (ver codificar_palavras). Todas as linhas avançam juntas,
+    uma coluna por vez, pela matriz de transições.
+    
+    Retorna: vetor booleano com uma posição por linha da matriz
+    """
+    _exigir_numpy()
+    
+    compilado = como_compilado(afd)
+    transicoes, finais = montar_matriz_transicoes(compilado)
+    return _avancar(compilado, transicoes, finais, np.asarray(matriz))
+
+
+def _avancar(compilado, transicoes, finais, matriz):
+    """Executa o AFD sobre as linhas da matriz e aplica os estados finais."""
+    if matriz.ndim != 2:
+        raise ValueError("A matriz de palavras deve ter duas dimensões")
+    
+    k = len(compilado.simbolos)
+    if matriz.size and (matriz.min() < PREENCHIMENTO or matriz.max() > k):
+        raise ValueError(f"Códigos de símbolo devem estar entre -1 e {k}")
+    
+    # Tabela plana com destinos já multiplicados pela largura da linha:
+    # cada passo vira uma soma e um único acesso indexado
+    largura = transicoes.shape[1]
+    deslocamentos = (transicoes * largura).ravel()
+    rejeicao = compilado.num_estados * largura
+    estados = np.zeros(matriz.shape[0], dtype=np.int32)
+    indices = np.empty_like(estados)
+    
+    # Colunas contíguas em memória; o preenchimento (-1) vira a coluna k+1
+    colunas = np.where(matriz.T < 0, k + 1, matriz.T).astype(np.int32, order='C')
+    
+    for j in range(colunas.shape[0]):
+        np.add(estados, colunas[j], out=indices)
+        np.take(deslocamentos, indices, out=estados)
+        
+        # Encerra cedo se todas as palavras já foram rejeitadas
+        if j % 64 == 63 and (estados == rejeicao).all():
+            break
+    
+    return finais[estados // largura]
+
+
+class ReconhecedorLote:
+    """
+    Reconhecimento em lote com a matriz de transições já montada.
+    
+    Útil quando o mesmo AFD recebe vários lotes (ex: um serviço que
+    agrupa os pedidos que chegam): a matriz é montada uma única vez.
+    
+    Atributos:
+        compilado: AFDCompilado do AFD
+        transicoes, finais: resultado de montar_matriz_transicoes
+    """
+    
+    def __init__(self, afd):
+        _exigir_numpy()
+        self.compilado = como_compilado(afd)
+        self.transicoes, self.finais = montar_matriz_transicoes(self.compilado)
+    
+    def reconhecer(self, palavras, tamanho_lote=TAMANHO_LOTE_PADRAO):
+        """
+        Verifica quais palavras de uma sequência são aceitas pelo AFD,
+        em blocos de 'tamanho_lote' palavras.
+        
+        Retorna: vetor booleano (numpy) com o resultado de cada palavra
+        """
+        palavras = list(palavras)
+        resultado = np.zeros(len(palavras), dtype=bool)
+        
+        for inicio in range(0, len(palavras), tamanho_lote):
+            bloco = palavras[inicio:inicio + tamanho_lote]
+            matriz = codificar_palavras(self.compilado, bloco)
+            resultado[inicio:inicio + len(bloco)] = _avancar(
+                self.compilado, self.transicoes, self.finais, matriz
+            )
+        
+        return resultado
+
+
+def reconhecer_lote(afd, palavras, tamanho_lote=TAMANHO_LOTE_PADRAO):
+    """
+    Verifica quais palavras de uma sequência são aceitas pelo AFD.
+    
+    As palavras são processadas em blocos de 'tamanho_lote' para limitar
+    a memória da matriz codificada. Palavras com símbolos fora do
+    alfabeto são rejeitadas; palavras de tamanhos diferentes são
+    tratadas pelo preenchimento.
+    
+    Retorna: vetor booleano (numpy) com o resultado de cada palavra
+    """
+    return ReconhecedorLote(afd).reconhecer(palavras, tamanho_lote)
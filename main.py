@@ -4,35 +4,88 @@ Módulo principal do sistema de minimização de AFD.
 FLUXO GERAL DO SISTEMA:
 1. Leitura do arquivo de entrada contendo a gramática regular (BNF)
 2. Parsing da gramática para estrutura de dados interna
-3. Conversão da gramática para AFN (Autômato Finito Não-determinístico)
+3. Conversão da gramática para AFN (Autômato Finito Não-determinístico),
+   com os símbolos equivalentes agrupados em classes (as etapas 4 a 8
+   trabalham só com um representante por classe)
 4. Determinização do AFN para AFD (Autômato Finito Determinístico)
 5. Remoção de estados inalcançáveis
-6. Completação do AFD com estado poço (se necessário)
-7. Minimização do AFD usando algoritmo de particionamento
-8. Remoção do estado poço para representação mais limpa
-9. Salvamento do resultado em arquivo CSV
+6-8. Minimização do AFD usando algoritmo de particionamento, com o
+   estado poço implícito: o resultado é o de completar o AFD com estado
+   poço, minimizar e remover o poço, sem materializar o poço
+9. Salvamento do resultado em arquivo CSV (ou módulo Python/binário,
+   conforme a extensão da saída)
+
+No modo lote (--lote), o pipeline é executado para cada gramática de um
+diretório, padrão glob ou manifesto, distribuído em um pool de processos.
+
+No modo dicionário (--dicionario), a entrada é uma lista ordenada de
+palavras (uma por linha) e o AFD mínimo é construído diretamente, sem
+gramática nem AFN (ver dicionario.py).
+
+No modo servidor (--servidor), os autômatos são carregados uma vez e
+atendem pedidos de reconhecimento por socket, com recarga automática
+quando os arquivos mudam (ver servico.py).
 """
 
+import csv
+import glob
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 
 from gramatica import ler_arquivo_texto, parsear_gramatica
 from conversao import converter_gramatica_para_afn, determinizar_afn
-from minimizacao import remover_inalcancaveis, completar_com_estado_poco, minimizar_afd, remover_estado_poco
-from io_saida import salvar_afd_csv, imprimir_afd
+from minimizacao import remover_inalcancaveis, minimizar_afd
+from classes_simbolos import calcular_classes, comprimir_alfabeto, expandir_alfabeto
+from io_saida import salvar_afd, imprimir_afd
+from compilado import compilar
+from simulacao import AFDPreguicoso, SimuladorAFN
+from cache import CacheAFD, chave_gramatica
+from perfil import Perfilador, medir_etapa
+from dicionario import carregar_dicionario
+from servico import (executar_servico, HOST_PADRAO, PORTA_PADRAO,
+                     INTERVALO_RECARGA_PADRAO, ESPERA_LOTE_PADRAO)
+
+
+# Modos de reconhecimento aceitos por criar_reconhecedor
+MODO_AFD = 'afd'
+MODO_AFN = 'afn'
+MODO_PREGUICOSO = 'preguicoso'
+
+# Modo lote: extensão das gramáticas em um diretório e nome do resumo
+EXTENSAO_GRAMATICA = '.txt'
+ARQUIVO_RESUMO = 'resumo.csv'
+CABECALHO_RESUMO = ['entrada', 'saida', 'status', 'estados', 'segundos', 'erro']
+
+# Quantos blocos de tarefas, em média, cada processo recebe no modo lote
+BLOCOS_POR_TRABALHADOR = 8
 
 
 def obter_argumentos():
     """
     Obtém os caminhos de entrada e saída dos argumentos da linha de comando.
     
-    Uso: python main.py [entrada.txt] [saida.csv] [--verbose|-v]
+    Uso: python main.py [entrada.txt] [saida.csv] [--verbose|-v] [--cache]
+                        [--profile[=perfil.json]] [--expandir-terminais]
+         python main.py --lote <diretorio|glob|manifesto> [diretorio_saida]
+                        [--trabalhadores=N] [--formato=csv|py|afdb] [--cache]
+         python main.py --dicionario <palavras.txt> [saida.csv]
+         python main.py --servidor <arquivo> [arquivo...] [--socket=caminho]
+                        [--host=127.0.0.1] [--porta=8765]
+                        [--intervalo-recarga=1] [--espera-lote=0.001]
+                        [--expandir-terminais]
     - Se nenhum argumento for passado, usa 'entrada.txt' e 'saida.csv' como padrão.
+    - Opções (iniciadas por '-') podem aparecer em qualquer posição.
     """
-    if len(sys.argv) >= 3:
-        caminho_entrada = sys.argv[1]
-        caminho_saida = sys.argv[2]
-    elif len(sys.argv) == 2:
-        caminho_entrada = sys.argv[1]
+    posicionais = [arg for arg in sys.argv[1:] if not arg.startswith('-')]
+    
+    if len(posicionais) >= 2:
+        caminho_entrada = posicionais[0]
+        caminho_saida = posicionais[1]
+    elif len(posicionais) == 1:
+        caminho_entrada = posicionais[0]
         caminho_saida = 'saida.csv'
     else:
         caminho_entrada = 'entrada.txt'
@@ -41,54 +94,75 @@ def obter_argumentos():
     return caminho_entrada, caminho_saida
 
 
-def executar_pipeline(caminho_entrada, caminho_saida, verbose=False):
+def obter_opcao(nome, padrao=None):
     """
-    Executa todo o pipeline de conversão e minimização.
+    Obtém o valor de uma opção no formato --nome=valor.
+    Retorna 'padrao' se a opção não foi passada.
+    """
+    prefixo = nome + '='
+    for arg in sys.argv[1:]:
+        if arg.startswith(prefixo):
+            return arg[len(prefixo):]
+    return padrao
+
+
+def construir_afd_minimo(gramatica, nao_terminal_inicial, verbose=False, perfil=None,
+                         expandir_terminais=False):
+    """
+    Executa as etapas 3 a 8 do pipeline sobre uma gramática já parseada.
     
     Etapas:
-    1. Lê o arquivo de gramática
-    2. Parseia a gramática (BNF)
-    3. Converte gramática → AFN
+    3. Converte gramática → AFN e agrupa os símbolos equivalentes em
+       classes (ver classes_simbolos.py)
     4. Determiniza AFN → AFD
     5. Remove estados inalcançáveis
-    6. Completa com estado poço
-    7. Minimiza o AFD
-    8. Remove estado poço
-    9. Salva resultado em CSV
-    """
-    # Etapa 1: Leitura do arquivo de entrada
-    if verbose:
-        print(f"Lendo arquivo: {caminho_entrada}")
-    
-    texto = ler_arquivo_texto(caminho_entrada)
-    
-    # Etapa 2: Parsing da gramática
-    if verbose:
-        print("Parseando gramática...")
+    6-8. Minimiza o AFD com poço implícito (equivale a completar com
+         estado poço, minimizar e remover o poço)
     
-    gramatica, nao_terminal_inicial = parsear_gramatica(texto)
-    
-    if verbose:
-        print(f"Não-terminal inicial: {nao_terminal_inicial}")
-        print(f"Produções encontradas:")
-        for nt, prods in gramatica.items():
-            print(f"  <{nt}> ::= {' | '.join(prods)}")
+    Se 'perfil' (Perfilador) for informado, cada etapa é medida; como as
+    etapas 6 a 8 são uma só, a etapa 'minimizacao' registra também as
+    transições que iriam para o poço ('transicoes_poco').
+    Com expandir_terminais=True, terminais de vários caracteres viram
+    cadeias de caracteres (ver converter_gramatica_para_afn).
     
+    Retorna: AFD mínimo
+    """
     # Etapa 3: Conversão da gramática para AFN
     if verbose:
         print("\nConvertendo gramática para AFN...")
     
-    afn = converter_gramatica_para_afn(gramatica, nao_terminal_inicial)
+    with medir_etapa(perfil, 'conversao_afn') as etapa:
+        afn = converter_gramatica_para_afn(gramatica, nao_terminal_inicial, expandir_terminais)
+        etapa.registrar(afn)
     
     if verbose:
         print("AFN gerado:")
         imprimir_afd(afn)
     
+    # Compressão do alfabeto: símbolos com o mesmo comportamento em todos
+    # os estados do AFN não são distinguidos pelas próximas etapas
+    with medir_etapa(perfil, 'compressao_alfabeto') as etapa:
+        classes = calcular_classes(afn)
+        if classes.comprime():
+            afn = comprimir_alfabeto(afn, classes)
+        if etapa.contadores is not None:
+            etapa.contadores['simbolos'] = len(classes.classe_de)
+            etapa.contadores['classes'] = len(classes.classes)
+    
+    if verbose and classes.comprime():
+        print(f"\nAlfabeto comprimido: {len(classes.classe_de)} símbolos "
+              f"em {len(classes.classes)} classes")
+    
     # Etapa 4: Determinização do AFN para AFD
     if verbose:
         print("\nDeterminizando AFN...")
     
-    afd = determinizar_afn(afn)
+    with medir_etapa(perfil, 'determinizacao') as etapa:
+        afd = determinizar_afn(afn, contadores=etapa.contadores)
+        etapa.registrar(afd)
+    
+    # O AFN não é mais usado: libera a memória antes das próximas etapas
+    del afn
     
     if verbose:
         print("AFD após determinização:")
@@ -98,47 +172,111 @@ def executar_pipeline(caminho_entrada, caminho_saida, verbose=False):
     if verbose:
         print("\nRemovendo estados inalcançáveis...")
     
-    afd = remover_inalcancaveis(afd)
+    with medir_etapa(perfil, 'remocao_inalcancaveis') as etapa:
+        # O AFD foi criado por este pipeline: pode ser alterado sem cópia
+        afd = remover_inalcancaveis(afd, contadores=etapa.contadores, no_lugar=True)
+        etapa.registrar(afd)
     
     if verbose:
         print("AFD após remoção de inalcançáveis:")
         imprimir_afd(afd)
     
-    # Etapa 6: Completação com estado poço
+    # Etapas 6 a 8: Minimização com poço implícito (as transições
+    # indefinidas vão para um poço que só existe dentro da partição)
     if verbose:
-        print("\nCompletando AFD com estado poço...")
+        print("\nMinimizando AFD (poço implícito)...")
     
-    afd = completar_com_estado_poco(afd)
+    with medir_etapa(perfil, 'minimizacao') as etapa:
+        afd_minimo = minimizar_afd(afd, contadores=etapa.contadores, poco_implicito=True)
+        etapa.registrar(afd_minimo)
     
-    if verbose:
-        print("AFD após completar com poço:")
-        imprimir_afd(afd)
+    # Volta ao alfabeto original (cada classe repete as transições do
+    # seu representante)
+    if classes.comprime():
+        afd_minimo = expandir_alfabeto(afd_minimo, classes, no_lugar=True)
     
-    # Etapa 7: Minimização do AFD
     if verbose:
-        print("\nMinimizando AFD...")
+        print("AFD minimizado (sem estado poço):")
+        imprimir_afd(afd_minimo)
     
-    afd_minimo = minimizar_afd(afd)
+    return afd_minimo
+
+
+def executar_pipeline(caminho_entrada, caminho_saida, verbose=False, cache=None, perfil=None,
+                      expandir_terminais=False):
+    """
+    Executa todo o pipeline de conversão e minimização.
+    
+    Se 'cache' (CacheAFD) for informado, o AFD mínimo é procurado pela
+    chave da gramática parseada; em caso de acerto, as etapas 3 a 8 são
+    puladas e o resultado vai direto para a saída.
+    
+    Se 'perfil' (Perfilador) for informado, cada etapa é medida (tempo,
+    memória, tamanho do autômato e contadores dos algoritmos); ver perfil.py.
     
+    Etapas:
+    1. Lê o arquivo de gramática
+    2. Parseia a gramática (BNF)
+    3. Converte gramática → AFN e agrupa os símbolos equivalentes em classes
+    4. Determiniza AFN → AFD
+    5. Remove estados inalcançáveis
+    6-8. Minimiza o AFD com poço implícito (equivale a completar com
+         estado poço, minimizar e remover o poço)
+    9. Salva resultado em CSV (ou .py / .afdb, conforme a extensão da saída)
+    """
+    # Etapa 1: Leitura do arquivo de entrada
     if verbose:
-        print("AFD minimizado:")
-        imprimir_afd(afd_minimo)
+        print(f"Lendo arquivo: {caminho_entrada}")
+    
+    with medir_etapa(perfil, 'leitura') as etapa:
+        texto = ler_arquivo_texto(caminho_entrada)
+        if etapa.contadores is not None:
+            etapa.contadores['caracteres'] = len(texto)
     
-    # Etapa 8: Remoção do estado poço
+    # Etapa 2: Parsing da gramática
     if verbose:
-        print("\nRemovendo estado poço...")
+        print("Parseando gramática...")
     
-    afd_minimo = remover_estado_poco(afd_minimo)
+    with medir_etapa(perfil, 'parsing') as etapa:
+        gramatica, nao_terminal_inicial = parsear_gramatica(texto)
+        if etapa.contadores is not None:
+            etapa.contadores['nao_terminais'] = len(gramatica)
+            etapa.contadores['producoes'] = sum(len(p) for p in gramatica.values())
     
     if verbose:
-        print("AFD após remoção do poço:")
-        imprimir_afd(afd_minimo)
+        print(f"Não-terminal inicial: {nao_terminal_inicial}")
+        print(f"Produções encontradas:")
+        for nt, prods in gramatica.items():
+            print(f"  <{nt}> ::= {' | '.join(prods)}")
+    
+    # Etapas 3 a 8: consulta o cache ou constrói o AFD mínimo
+    afd_minimo = None
+    chave = None
+    
+    if cache is not None:
+        with medir_etapa(perfil, 'consulta_cache') as etapa:
+            chave = chave_gramatica(gramatica, nao_terminal_inicial, expandir_terminais)
+            afd_minimo = cache.obter(chave)
+            if etapa.contadores is not None:
+                etapa.contadores['acerto'] = afd_minimo is not None
+        if verbose and afd_minimo is not None:
+            print(f"\nAFD mínimo encontrado no cache ({chave[:12]})")
+    
+    if afd_minimo is None:
+        afd_minimo = construir_afd_minimo(
+            gramatica, nao_terminal_inicial, verbose, perfil, expandir_terminais
+        )
+        if cache is not None:
+            cache.salvar(chave, afd_minimo)
     
     # Etapa 9: Salvamento do resultado
     if verbose:
         print(f"\nSalvando resultado em: {caminho_saida}")
     
-    salvar_afd_csv(afd_minimo, caminho_saida)
+    # A extensão da saída escolhe o formato (.csv, .py ou .afdb)
+    with medir_etapa(perfil, 'salvamento') as etapa:
+        salvar_afd(afd_minimo, caminho_saida)
+        etapa.registrar(afd_minimo)
     
     if verbose:
         print("Processo concluído com sucesso!")
@@ -146,19 +284,331 @@ def executar_pipeline(caminho_entrada, caminho_saida, verbose=False):
     return afd_minimo
 
 
+def criar_reconhecedor(caminho_entrada, modo=MODO_AFD):
+    """
+    Prepara uma função que reconhece palavras da gramática do arquivo.
+    
+    Modos:
+    - 'afd': executa determinização e minimização e compila o AFD mínimo
+    - 'afn': simula o AFN diretamente (bit-paralelo), sem determinizar
+    - 'preguicoso': determiniza sob demanda, com cache limitado de estados
+    
+    Os modos 'afn' e 'preguicoso' evitam o custo de construir o AFD
+    completo, útil quando a gramática é usada só para reconhecer palavras.
+    
+    Retorna: função palavra → bool
+    """
+    texto = ler_arquivo_texto(caminho_entrada)
+    gramatica, nao_terminal_inicial = parsear_gramatica(texto)
+    afn = converter_gramatica_para_afn(gramatica, nao_terminal_inicial)
+    
+    if modo == MODO_AFN:
+        return SimuladorAFN(afn).reconhecer
+    if modo == MODO_PREGUICOSO:
+        return AFDPreguicoso(afn).reconhecer
+    if modo != MODO_AFD:
+        raise ValueError(f"Modo de reconhecimento desconhecido: {modo}")
+    
+    return compilar(construir_afd_minimo(gramatica, nao_terminal_inicial)).reconhecer
+
+
+@dataclass
+class ResultadoGramatica:
+    """
+    Resultado da compilação de uma gramática no modo lote.
+    
+    Atributos:
+        entrada: Caminho da gramática
+        saida: Caminho do arquivo gerado
+        sucesso: False se alguma etapa lançou exceção
+        num_estados: Estados do AFD mínimo (0 em caso de erro)
+        segundos: Tempo de execução do pipeline
+        erro: Mensagem da exceção ('' em caso de sucesso)
+    """
+    entrada: str
+    saida: str
+    sucesso: bool
+    num_estados: int = 0
+    segundos: float = 0.0
+    erro: str = ''
+
+
+def listar_gramaticas(origem):
+    """
+    Lista os arquivos de gramática de uma origem do modo lote.
+    
+    A origem pode ser:
+    - Um diretório: todos os arquivos '*.txt' dele (sem subdiretórios)
+    - Um padrão glob (contém '*', '?' ou '['; '**' é recursivo)
+    - Um manifesto: arquivo com um caminho por linha; linhas vazias e
+      iniciadas por '#' são ignoradas, e caminhos relativos partem do
+      diretório do manifesto
+    
+    Retorna: lista de caminhos, em ordem
+    """
+    if os.path.isdir(origem):
+        padrao = os.path.join(origem, '*' + EXTENSAO_GRAMATICA)
+        return sorted(c for c in glob.glob(padrao) if os.path.isfile(c))
+    
+    if any(c in origem for c in '*?['):
+        return sorted(c for c in glob.glob(origem, recursive=True) if os.path.isfile(c))
+    
+    base = os.path.dirname(origem)
+    caminhos = []
+    for linha in ler_arquivo_texto(origem).splitlines():
+        linha = linha.strip()
+        if linha and not linha.startswith('#'):
+            caminhos.append(os.path.join(base, linha))
+    return caminhos
+
+
+def _caminhos_saida(entradas, diretorio_saida, extensao):
+    """
+    Escolhe o arquivo de saída de cada gramática: o nome da gramática com
+    a extensão do formato. Nomes repetidos (gramáticas de mesmo nome em
+    diretórios diferentes) recebem um sufixo numérico, assim como uma
+    gramática que coincidiria com o arquivo de resumo (ARQUIVO_RESUMO).
+    """
+    nome_resumo, extensao_resumo = os.path.splitext(ARQUIVO_RESUMO)
+    usados = {nome_resumo} if extensao == extensao_resumo else set()
+    saidas = []
+    
+    for entrada in entradas:
+        base = os.path.splitext(os.path.basename(entrada))[0]
+        nome = base
+        contador = 1
+        while nome in usados:
+            contador += 1
+            nome = f"{base}_{contador}"
+        usados.add(nome)
+        saidas.append(os.path.join(diretorio_saida, nome + extensao))
+    
+    return saidas
+
+
+def _compilar_gramatica(tarefa):
+    """
+    Executa o pipeline para uma gramática do lote (roda no processo filho).
+    Exceções são capturadas e devolvidas no resultado, para que uma
+    gramática com erro não interrompa as demais.
+    """
+    caminho_entrada, caminho_saida, cache, expandir_terminais = tarefa
+    inicio = time.perf_counter()
+    
+    try:
+        afd_minimo = executar_pipeline(
+            caminho_entrada, caminho_saida, cache=cache, expandir_terminais=expandir_terminais
+        )
+    except Exception as e:
+        return ResultadoGramatica(
+            caminho_entrada, caminho_saida, False,
+            segundos=time.perf_counter() - inicio,
+            erro=f"{type(e).__name__}: {e}"
+        )
+    
+    return ResultadoGramatica(
+        caminho_entrada, caminho_saida, True,
+        num_estados=len(afd_minimo.estados),
+        segundos=time.perf_counter() - inicio
+    )
+
+
+def salvar_resumo(resultados, caminho_resumo):
+    """Salva o resumo do modo lote em CSV, uma linha por gramática."""
+    with open(caminho_resumo, 'w', newline='', encoding='utf-8') as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(CABECALHO_RESUMO)
+        
+        for resultado in resultados:
+            escritor.writerow([
+                resultado.entrada,
+                resultado.saida,
+                'ok' if resultado.sucesso else 'erro',
+                resultado.num_estados,
+                f"{resultado.segundos:.6f}",
+                resultado.erro
+            ])
+
+
+def executar_lote(origem, diretorio_saida, trabalhadores=None, extensao='.csv', cache=None,
+                  expandir_terminais=False):
+    """
+    Executa o pipeline para todas as gramáticas de uma origem em paralelo.
+    
+    Cada gramática é processada em um ProcessPoolExecutor com
+    'trabalhadores' processos (padrão: número de CPUs). As tarefas são
+    enviadas em blocos: poucos o bastante para reduzir a comunicação entre
+    processos, e muitos o bastante para que nenhum processo fique ocioso
+    enquanto outro termina um bloco longo. Com trabalhadores=1 o lote roda
+    no próprio processo.
+    
+    Os arquivos gerados ficam em 'diretorio_saida', junto com o resumo
+    (resumo.csv). Uma gramática com erro é registrada no resumo e não
+    interrompe as demais.
+    
+    Retorna: lista de ResultadoGramatica, na ordem das entradas
+    """
+    entradas = listar_gramaticas(origem)
+    os.makedirs(diretorio_saida, exist_ok=True)
+    
+    saidas = _caminhos_saida(entradas, diretorio_saida, extensao)
+    tarefas = [
+        (entrada, saida, cache, expandir_terminais)
+        for entrada, saida in zip(entradas, saidas)
+    ]
+    
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+    
+    if trabalhadores == 1 or len(tarefas) <= 1:
+        resultados = [_compilar_gramatica(tarefa) for tarefa in tarefas]
+    else:
+        tamanho_bloco = max(1, len(tarefas) // (trabalhadores * BLOCOS_POR_TRABALHADOR))
+        with ProcessPoolExecutor(max_workers=trabalhadores) as executor:
+            resultados = list(executor.map(_compilar_gramatica, tarefas, chunksize=tamanho_bloco))
+    
+    salvar_resumo(resultados, os.path.join(diretorio_saida, ARQUIVO_RESUMO))
+    return resultados
+
+
+def main_lote(cache, expandir_terminais=False):
+    """
+    Executa o modo lote a partir dos argumentos da linha de comando.
+    Sai com código 1 se alguma gramática falhou.
+    """
+    posicionais = [arg for arg in sys.argv[1:] if not arg.startswith('-')]
+    if not posicionais:
+        print("Erro: informe o diretório, padrão glob ou manifesto das gramáticas.")
+        sys.exit(1)
+    
+    origem = posicionais[0]
+    diretorio_saida = posicionais[1] if len(posicionais) >= 2 else 'saida'
+    extensao = '.' + obter_opcao('--formato', 'csv').lstrip('.')
+    
+    try:
+        trabalhadores = int(obter_opcao('--trabalhadores', 0)) or None
+        resultados = executar_lote(
+            origem, diretorio_saida, trabalhadores, extensao, cache, expandir_terminais
+        )
+    except FileNotFoundError:
+        print(f"Erro: Origem '{origem}' não encontrada.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Erro durante o processamento: {e}")
+        sys.exit(1)
+    
+    falhas = [r for r in resultados if not r.sucesso]
+    for resultado in falhas:
+        print(f"Erro em '{resultado.entrada}': {resultado.erro}")
+    
+    print(f"{len(resultados) - len(falhas)} de {len(resultados)} gramáticas "
+          f"minimizadas em: {diretorio_saida}")
+    
+    if falhas:
+        sys.exit(1)
+
+
+def main_dicionario():
+    """
+    Constrói o AFD mínimo de uma lista ordenada de palavras (uma por
+    linha) e o salva no formato indicado pela extensão da saída.
+    """
+    posicionais = [arg for arg in sys.argv[1:] if not arg.startswith('-')]
+    if not posicionais:
+        print("Erro: informe o arquivo de palavras.")
+        sys.exit(1)
+    
+    caminho_entrada = posicionais[0]
+    caminho_saida = posicionais[1] if len(posicionais) >= 2 else 'saida.csv'
+    
+    try:
+        afd = carregar_dicionario(caminho_entrada)
+        salvar_afd(afd, caminho_saida)
+    except FileNotFoundError:
+        print(f"Erro: Arquivo '{caminho_entrada}' não encontrado.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Erro durante o processamento: {e}")
+        sys.exit(1)
+    
+    print(f"AFD mínimo ({len(afd.estados)} estados) salvo em: {caminho_saida}")
+
+
+def main_servidor(expandir_terminais=False):
+    """
+    Inicia o serviço de reconhecimento com os arquivos (gramáticas ou
+    AFDs salvos) passados como argumentos.
+    """
+    caminhos = [arg for arg in sys.argv[1:] if not arg.startswith('-')]
+    if not caminhos:
+        print("Erro: informe as gramáticas ou AFDs a carregar.")
+        sys.exit(1)
+    
+    caminho_socket = obter_opcao('--socket')
+    host = obter_opcao('--host', HOST_PADRAO)
+    
+    try:
+        porta = int(obter_opcao('--porta', PORTA_PADRAO))
+        intervalo_recarga = float(obter_opcao('--intervalo-recarga', INTERVALO_RECARGA_PADRAO))
+        espera_lote = float(obter_opcao('--espera-lote', ESPERA_LOTE_PADRAO))
+    except ValueError as e:
+        print(f"Erro: opção inválida: {e}")
+        sys.exit(1)
+    
+    try:
+        executar_servico(caminhos, caminho_socket, host, porta,
+                         intervalo_recarga=intervalo_recarga, espera_lote=espera_lote,
+                         expandir_terminais=expandir_terminais)
+    except FileNotFoundError as e:
+        print(f"Erro: Arquivo '{e.filename}' não encontrado.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Erro durante o processamento: {e}")
+        sys.exit(1)
+
+
 def main():
     """
     Função principal que coordena a execução do programa.
     Trata erros de arquivo não encontrado e outros erros de processamento.
     """
+    # Cache em disco de AFDs mínimos (diretório em MIN_AFD_CACHE ou ~/.cache/min_afd)
+    cache = CacheAFD() if '--cache' in sys.argv else None
+    
+    # Terminais de vários caracteres como cadeias de caracteres
+    expandir_terminais = '--expandir-terminais' in sys.argv
+    
+    if '--lote' in sys.argv:
+        main_lote(cache, expandir_terminais)
+        return
+    
+    if '--dicionario' in sys.argv:
+        main_dicionario()
+        return
+    
+    if '--servidor' in sys.argv:
+        main_servidor(expandir_terminais)
+        return
+    
     caminho_entrada, caminho_saida = obter_argumentos()
     
     # Verifica se modo verboso está ativado
     verbose = '--verbose' in sys.argv or '-v' in sys.argv
     
+    # Medição por etapa: JSON no terminal ou no arquivo de --profile=arquivo
+    caminho_perfil = obter_opcao('--profile')
+    perfil = Perfilador() if caminho_perfil or '--profile' in sys.argv else None
+    
     try:
-        executar_pipeline(caminho_entrada, caminho_saida, verbose)
+        executar_pipeline(caminho_entrada, caminho_saida, verbose, cache, perfil, expandir_terminais)
         print(f"AFD minimizado salvo em: {caminho_saida}")
+        
+        if perfil is not None:
+            perfil.finalizar()
+            if caminho_perfil:
+                perfil.salvar_json(caminho_perfil)
+                print(f"Perfil salvo em: {caminho_perfil}")
+            else:
+                print(perfil.para_json())
     except FileNotFoundError:
         print(f"Erro: Arquivo '{caminho_entrada}' não encontrado.")
         sys.exit(1)
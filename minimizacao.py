@@ -4,14 +4,21 @@ Módulo de minimização de AFD.
 Este módulo implementa o algoritmo de minimização de autômatos finitos
 determinísticos, incluindo:
 - Remoção de estados inalcançáveis
+- Remoção de estados mortos (não co-alcançáveis)
 - Completação com estado poço
-- Minimização por particionamento (algoritmo de Hopcroft simplificado)
+- Minimização por particionamento (algoritmo de Hopcroft)
 - Remoção do estado poço após minimização
 
+As etapas de limpeza (inalcançáveis e poço) retornam um novo AFD por
+padrão; com no_lugar=True alteram o AFD recebido, para que autômatos
+grandes não fiquem com várias cópias vivas ao mesmo tempo.
+
 O algoritmo de minimização agrupa estados equivalentes (que não podem
 ser distinguidos por nenhuma palavra) em um único estado.
 """
 
+from collections import deque
+
 from automato import Automato
 
 
@@ -19,21 +26,25 @@ from automato import Automato
 ESTADO_POCO = 'POCO'
 
 
-def remover_inalcancaveis(afd):
+def remover_inalcancaveis(afd, contadores=None, no_lugar=False):
     """
     Remove estados que não são alcançáveis a partir do estado inicial.
     
     Usa BFS para encontrar todos os estados alcançáveis,
     depois cria um novo AFD apenas com esses estados.
     
+    Com no_lugar=True o próprio AFD é alterado e retornado, sem cópia.
+    
+    Se 'contadores' (dict) for informado, registra 'estados_removidos'.
+    
     Retorna: AFD sem estados inalcançáveis
     """
     # BFS para encontrar estados alcançáveis
     alcancaveis = set()
-    fila = [afd.estado_inicial]
+    fila = deque([afd.estado_inicial])
     
     while fila:
-        estado = fila.pop(0)
+        estado = fila.popleft()
         
         if estado in alcancaveis:
             continue
@@ -52,6 +63,18 @@ def remover_inalcancaveis(afd):
                     if destino not in alcancaveis:
                         fila.append(destino)
     
+    if contadores is not None:
+        contadores['estados_removidos'] = len(afd.estados) - len(alcancaveis)
+    
+    if no_lugar:
+        # Os destinos de um estado alcançável também são alcançáveis,
+        # então basta apagar os estados inalcançáveis e suas linhas
+        for estado in afd.estados - alcancaveis:
+            afd.transicoes.pop(estado, None)
+        afd.estados.intersection_update(alcancaveis)
+        afd.estados_finais.intersection_update(alcancaveis)
+        return afd
+    
     # Cria novo AFD apenas com estados alcançáveis
     novo_afd = Automato()
     novo_afd.alfabeto = afd.alfabeto.copy()
@@ -76,7 +99,85 @@ def remover_inalcancaveis(afd):
     return novo_afd
 
 
-def completar_com_estado_poco(afd):
+def remover_nao_coalcancaveis(afd, contadores=None, no_lugar=False):
+    """
+    Remove os estados mortos: estados a partir dos quais nenhum estado
+    final é alcançável.
+    
+    Faz uma BFS reversa a partir dos estados finais sobre um índice de
+    transições inversas. Diferente de remover_estado_poco, remove regiões
+    mortas com qualquer quantidade de estados, e não só um poço com laços
+    em todos os símbolos. As transições para estados mortos passam a ser
+    indefinidas, então um reconhecedor rejeita assim que chegaria a eles.
+    
+    O estado inicial é sempre mantido; se ele próprio estiver morto
+    (linguagem vazia), fica sem transições.
+    
+    Com no_lugar=True o próprio AFD é alterado e retornado, sem cópia.
+    
+    Se 'contadores' (dict) for informado, registra 'estados_removidos'.
+    
+    Retorna: AFD sem estados mortos
+    """
+    # Índice de transições inversas: destino → [origens]
+    inversas = {}
+    for origem, transicoes_estado in afd.transicoes.items():
+        for destino in transicoes_estado.values():
+            if isinstance(destino, set):
+                for d in destino:
+                    inversas.setdefault(d, []).append(origem)
+            else:
+                inversas.setdefault(destino, []).append(origem)
+    
+    # BFS reversa a partir dos estados finais
+    coalcancaveis = set(afd.estados_finais)
+    fila = deque(coalcancaveis)
+    
+    while fila:
+        estado = fila.popleft()
+        for origem in inversas.get(estado, ()):
+            if origem not in coalcancaveis:
+                coalcancaveis.add(origem)
+                fila.append(origem)
+    
+    del inversas
+    mortos = afd.estados - coalcancaveis
+    
+    if contadores is not None:
+        contadores['estados_removidos'] = len(mortos - {afd.estado_inicial})
+    
+    if not mortos:
+        return afd
+    
+    novo_afd = afd
+    if not no_lugar:
+        novo_afd = Automato()
+        novo_afd.alfabeto = afd.alfabeto.copy()
+        novo_afd.estado_inicial = afd.estado_inicial
+        novo_afd.estados = afd.estados.copy()
+        novo_afd.estados_finais = afd.estados_finais.copy()
+    
+    # Mantém só as transições entre estados vivos
+    transicoes = {}
+    for estado, transicoes_estado in afd.transicoes.items():
+        if estado in mortos:
+            continue
+        linha = {}
+        for simbolo, destino in transicoes_estado.items():
+            if isinstance(destino, set):
+                destino = destino - mortos
+                if destino:
+                    linha[simbolo] = destino
+            elif destino not in mortos:
+                linha[simbolo] = destino
+        transicoes[estado] = linha
+    
+    novo_afd.transicoes = transicoes
+    novo_afd.estados.difference_update(mortos - {afd.estado_inicial})
+    return novo_afd
+
+
+def completar_com_estado_poco(afd, contadores=None, no_lugar=False):
     """
     Torna o AFD completo adicionando um estado poço.
     
@@ -85,6 +186,12 @@ def completar_com_estado_poco(afd):
     
     Necessário para o algoritmo de minimização funcionar corretamente.
     
+    Com no_lugar=True as transições do poço são adicionadas no próprio
+    AFD, sem a cópia feita por Automato.copiar.
+    
+    Se 'contadores' (dict) for informado, registra 'transicoes_poco'
+    (transições adicionadas para o poço, incluindo as do próprio poço).
+    
     Retorna: AFD completo (todas as transições definidas)
     """
     # Verifica se precisa de estado poço
@@ -101,142 +208,341 @@ def completar_com_estado_poco(afd):
     
     # Retorna original se já está completo
     if not precisa_poco:
+        if contadores is not None:
+            contadores['transicoes_poco'] = 0
         return afd
     
-    # Cria cópia com estado poço
-    novo_afd = afd.copiar()
+    # Cria cópia com estado poço (ou usa o próprio AFD)
+    novo_afd = afd if no_lugar else afd.copiar()
     novo_afd.adicionar_estado(ESTADO_POCO)
     
     # Adiciona transições faltantes para o estado poço
+    adicionadas = 0
     for estado in list(novo_afd.estados):
         for simbolo in novo_afd.alfabeto:
             transicao = novo_afd.obter_transicao(estado, simbolo)
             if transicao is None:
                 novo_afd.adicionar_transicao_afd(estado, simbolo, ESTADO_POCO)
+                adicionadas += 1
+    
+    if contadores is not None:
+        contadores['transicoes_poco'] = adicionadas
     
     return novo_afd
 
 
-def minimizar_afd(afd):
+def minimizar_afd(afd, contadores=None, poco_implicito=False, rotulos=None):
     """
-    Minimiza o AFD usando algoritmo de particionamento.
+    Minimiza o AFD usando o algoritmo de Hopcroft.
     
     Algoritmo:
     1. Partição inicial: {estados finais} e {estados não-finais}
-    2. Refina partições: estados com mesma "assinatura" ficam juntos
-       (assinatura = para cada símbolo, índice do bloco destino)
-    3. Repete até não haver mais refinamentos
+    2. Mantém uma fila de blocos "divisores"; para cada divisor e símbolo,
+       marca os estados que chegam ao divisor (índice de transições inversas)
+    3. Cada bloco com estados marcados e não-marcados é dividido em dois;
+       apenas a menor metade entra na fila (daí o custo O(n·k·log n))
     4. Cada bloco da partição final vira um estado do AFD mínimo
     
+    Transições indefinidas são tratadas como um destino especial, distinto
+    de todos os estados, assim como na versão anterior por assinaturas.
+    
+    Com poco_implicito=True, o AFD pode ser incompleto e o resultado é o
+    mesmo (inclusive nos nomes) de completar_com_estado_poco →
+    minimizar_afd → remover_estado_poco, sem as duas cópias do AFD nem as
+    |Q|·|Σ| transições do poço: o poço existe só como um índice na
+    partição, com as transições indefinidas apontando para ele no índice
+    inverso. Estados mortos caem no bloco do poço, que é descartado.
+    
+    Com 'rotulos' (dict {estado final: rótulo}), a partição inicial
+    separa os estados finais por rótulo, e estados finais com rótulos
+    diferentes nunca são juntados (ver uniao.py).
+    
+    Se 'contadores' (dict) for informado, registra 'rodadas_refinamento'
+    (divisores retirados da fila), 'divisoes_blocos' e 'blocos_finais';
+    com poco_implicito=True, registra também 'transicoes_poco', com o
+    mesmo valor que completar_com_estado_poco registraria.
+    
     Retorna: AFD mínimo equivalente
     """
-    # Partição inicial: finais vs não-finais
-    estados_nao_finais = afd.estados - afd.estados_finais
-    
-    if not estados_nao_finais:
-        particao = [afd.estados_finais.copy()]
-    elif not afd.estados_finais:
-        particao = [estados_nao_finais.copy()]
-    else:
-        particao = [afd.estados_finais.copy(), estados_nao_finais.copy()]
-    
-    particao = [p for p in particao if p]
-    
-    def obter_bloco(estado, particao_atual):
-        """Retorna o índice do bloco que contém o estado."""
-        for i, bloco in enumerate(particao_atual):
-            if estado in bloco:
-                return i
-        return -1
-    
-    def obter_destino_bloco(estado, simbolo, particao_atual):
-        """Retorna o índice do bloco destino para uma transição."""
-        transicao = afd.obter_transicao(estado, simbolo)
-        if transicao is None:
-            return -1
-        if isinstance(transicao, set):
-            transicao = next(iter(transicao))
-        return obter_bloco(transicao, particao_atual)
-    
-    # Refina partições até estabilizar
-    mudou = True
-    while mudou:
-        mudou = False
-        nova_particao = []
+    # Numera estados e símbolos (ordem estável para nomes determinísticos)
+    estados = sorted(afd.estados)
+    simbolos = sorted(afd.alfabeto)
+    
+    # Poço implícito: ocupa a posição que ESTADO_POCO teria na ordenação,
+    # como se completar_com_estado_poco tivesse sido executado
+    poco = -1
+    if poco_implicito and any(
+        len(afd.transicoes.get(estado, ())) < len(simbolos) for estado in estados
+    ):
+        estados = sorted(afd.estados | {ESTADO_POCO})
+        poco = estados.index(ESTADO_POCO)
+    
+    indice_estado = {estado: i for i, estado in enumerate(estados)}
+    n = len(estados)
+    
+    # Índice de transições inversas: inversas[c][destino] = [origens]
+    inversas = [{} for _ in simbolos]
+    indefinidas = [[] for _ in simbolos]
+    incompleto = False
+    transicoes_poco = 0
+    
+    for i, estado in enumerate(estados):
+        if i == poco:
+            for c in range(len(simbolos)):
+                inversas[c].setdefault(i, []).append(i)
+            transicoes_poco += len(simbolos)
+            continue
         
-        for bloco in particao:
-            # Blocos com um único estado não precisam ser divididos
-            if len(bloco) <= 1:
-                nova_particao.append(bloco)
+        transicoes_estado = afd.transicoes.get(estado, {})
+        for c, simbolo in enumerate(simbolos):
+            destino = transicoes_estado.get(simbolo)
+            if destino is None and poco >= 0:
+                inversas[c].setdefault(poco, []).append(i)
+                transicoes_poco += 1
                 continue
-            
-            # Agrupa estados pela assinatura (blocos destino para cada símbolo)
-            sub_blocos = {}
-            
-            for estado in bloco:
-                # Assinatura: tupla de índices de blocos destino
-                assinatura = tuple(
-                    obter_destino_bloco(estado, simbolo, particao)
-                    for simbolo in sorted(afd.alfabeto)
-                )
-                
-                if assinatura not in sub_blocos:
-                    sub_blocos[assinatura] = set()
-                sub_blocos[assinatura].add(estado)
-            
-            # Se dividiu em mais de um sub-bloco, houve refinamento
-            if len(sub_blocos) > 1:
-                mudou = True
-            
-            for sub_bloco in sub_blocos.values():
-                nova_particao.append(sub_bloco)
-        
-        particao = nova_particao
+            if destino is None:
+                indefinidas[c].append(i)
+                incompleto = True
+                continue
+            if isinstance(destino, set):
+                destino = next(iter(destino))
+            j = indice_estado[destino]
+            inversas[c].setdefault(j, []).append(i)
+    
+    # Transições indefinidas levam a um poço virtual (índice n), que fica
+    # sozinho em seu bloco e nunca se junta a outro estado
+    poco_virtual = n if incompleto else -1
+    if incompleto:
+        for c in range(len(simbolos)):
+            inversas[c][n] = indefinidas[c] + [n]
+        n += 1
+    
+    # Partição inicial: finais vs não-finais (e o poço virtual à parte)
+    finais = [indice_estado[e] for e in estados if e in afd.estados_finais]
+    nao_finais = [indice_estado[e] for e in estados if e not in afd.estados_finais]
+    if rotulos is None:
+        blocos_iniciais = [b for b in (finais, nao_finais) if b]
+    else:
+        # Finais com rótulos diferentes nunca são equivalentes
+        grupos = {}
+        for i in finais:
+            grupos.setdefault(rotulos.get(estados[i]), []).append(i)
+        blocos_iniciais = [b for b in (*grupos.values(), nao_finais) if b]
+    if incompleto:
+        blocos_iniciais.append([poco_virtual])
+    
+    elementos, inicio, bloco_de, rodadas = refinar_particao(inversas, blocos_iniciais, n)
+    
+    # O índice inverso não é mais usado: libera-o antes de montar o AFD mínimo
+    del inversas, indefinidas
+    
+    if contadores is not None:
+        contadores['rodadas_refinamento'] = rodadas
+        contadores['divisoes_blocos'] = len(inicio) - len(blocos_iniciais)
+        contadores['blocos_finais'] = len(inicio)
+        if poco_implicito:
+            contadores['transicoes_poco'] = transicoes_poco
     
     # Constrói o AFD mínimo a partir da partição final
-    mapeamento_estado_para_bloco = {}
+    bloco_poco = bloco_de[poco_virtual] if incompleto else -1
     nomes_blocos = {}
     
-    for i, bloco in enumerate(particao):
-        nome_bloco = 'q' + str(i)
-        nomes_blocos[i] = nome_bloco
-        for estado in bloco:
-            mapeamento_estado_para_bloco[estado] = i
+    for b in range(len(inicio)):
+        if b == bloco_poco:
+            continue
+        nomes_blocos[b] = 'q' + str(len(nomes_blocos))
+    
+    bloco_inicial = bloco_de[indice_estado[afd.estado_inicial]]
+    
+    # Poço implícito: descarta o bloco poço depois de nomeado, como
+    # remover_estado_poco faria (ver _bloco_poco_implicito)
+    if poco_implicito:
+        bloco_descartado = _bloco_poco_implicito(
+            afd, estados, simbolos, indice_estado, poco,
+            elementos, inicio, bloco_de, bloco_inicial
+        )
+        nomes_blocos.pop(bloco_descartado, None)
     
     afd_minimo = Automato()
     afd_minimo.alfabeto = afd.alfabeto.copy()
     
     # Define estado inicial
-    bloco_inicial = mapeamento_estado_para_bloco[afd.estado_inicial]
     afd_minimo.estado_inicial = nomes_blocos[bloco_inicial]
     
     # Adiciona estados e marca finais
-    for i, bloco in enumerate(particao):
-        nome_bloco = nomes_blocos[i]
+    for b, nome_bloco in nomes_blocos.items():
         afd_minimo.adicionar_estado(nome_bloco)
         
         # Bloco é final se contém algum estado final original
-        if bloco & afd.estados_finais:
+        if estados[elementos[inicio[b]]] in afd.estados_finais:
             afd_minimo.adicionar_estado_final(nome_bloco)
     
     # Adiciona transições (usa qualquer estado do bloco como representante)
-    for i, bloco in enumerate(particao):
-        nome_bloco = nomes_blocos[i]
-        estado_representante = next(iter(bloco))
+    for b, nome_bloco in nomes_blocos.items():
+        estado_representante = estados[elementos[inicio[b]]]
         
-        for simbolo in afd.alfabeto:
+        # Como em remover_estado_poco, todo estado do AFD (completo) tem
+        # uma entrada em 'transicoes', mesmo que só fosse para o poço
+        if poco_implicito and simbolos:
+            afd_minimo.transicoes[nome_bloco] = {}
+        
+        for simbolo in simbolos:
             transicao = afd.obter_transicao(estado_representante, simbolo)
+            if transicao is None and poco >= 0:
+                transicao = ESTADO_POCO
             if transicao is not None:
                 if isinstance(transicao, set):
                     transicao = next(iter(transicao))
-                bloco_destino = mapeamento_estado_para_bloco[transicao]
-                nome_destino = nomes_blocos[bloco_destino]
+                bloco_destino = bloco_de[indice_estado[transicao]]
+                nome_destino = nomes_blocos.get(bloco_destino)
+                if nome_destino is None:
+                    continue
                 afd_minimo.adicionar_transicao_afd(nome_bloco, simbolo, nome_destino)
     
     return afd_minimo
 
 
-def remover_estado_poco(afd):
+def refinar_particao(inversas, blocos_iniciais, n):
+    """
+    Refina uma partição inicial até a partição de estados equivalentes
+    (laço principal do algoritmo de Hopcroft, usado por minimizar_afd).
+    
+    Parâmetros:
+        inversas: Para cada símbolo, dicionário {destino: [origens]} com
+                  as transições inversas dos estados numerados 0..n-1
+        blocos_iniciais: Lista de blocos (listas de estados) da partição
+                         inicial, sem blocos vazios
+        n: Quantidade de estados
+    
+    Retorna: (elementos, inicio, bloco_de, rodadas), onde os estados do
+    bloco b são elementos[inicio[b]:...] (contíguos), bloco_de[estado] é
+    o bloco final de cada estado e rodadas é a quantidade de divisores
+    retirados da fila
+    """
+    # Partição refinável: os estados de cada bloco ficam contíguos em
+    # 'elementos'; os marcados ocupam o intervalo [inicio, meio)
+    elementos = []
+    posicao = [0] * n
+    bloco_de = [0] * n
+    inicio = []
+    fim = []
+    meio = []
+    
+    for b, bloco in enumerate(blocos_iniciais):
+        inicio.append(len(elementos))
+        for estado in bloco:
+            posicao[estado] = len(elementos)
+            bloco_de[estado] = b
+            elementos.append(estado)
+        fim.append(len(elementos))
+        meio.append(inicio[b])
+    
+    # Fila de divisores: todos os blocos iniciais exceto o maior
+    maior = max(range(len(blocos_iniciais)), key=lambda b: fim[b] - inicio[b])
+    fila = deque(b for b in range(len(blocos_iniciais)) if b != maior)
+    na_fila = [b != maior for b in range(len(blocos_iniciais))]
+    rodadas = 0
+    
+    while fila:
+        divisor = fila.popleft()
+        na_fila[divisor] = False
+        rodadas += 1
+        membros = elementos[inicio[divisor]:fim[divisor]]
+        
+        for inversa in inversas:
+            tocados = []
+            
+            # Marca os estados que chegam ao divisor pelo símbolo
+            for destino in membros:
+                for origem in inversa.get(destino, ()):
+                    b = bloco_de[origem]
+                    m = meio[b]
+                    p = posicao[origem]
+                    if p < m:
+                        continue
+                    if m == inicio[b]:
+                        tocados.append(b)
+                    outro = elementos[m]
+                    elementos[p] = outro
+                    posicao[outro] = p
+                    elementos[m] = origem
+                    posicao[origem] = m
+                    meio[b] = m + 1
+            
+            # Divide os blocos parcialmente marcados
+            for b in tocados:
+                if meio[b] == fim[b]:
+                    meio[b] = inicio[b]
+                    continue
+                
+                novo = len(inicio)
+                inicio.append(inicio[b])
+                fim.append(meio[b])
+                meio.append(inicio[b])
+                inicio[b] = meio[b]
+                meio[b] = inicio[b]
+                
+                for p in range(inicio[novo], fim[novo]):
+                    bloco_de[elementos[p]] = novo
+                
+                if na_fila[b]:
+                    fila.append(novo)
+                    na_fila.append(True)
+                elif fim[novo] - inicio[novo] <= fim[b] - inicio[b]:
+                    fila.append(novo)
+                    na_fila.append(True)
+                else:
+                    fila.append(b)
+                    na_fila[b] = True
+                    na_fila.append(False)
+    
+    return elementos, inicio, bloco_de, rodadas
+
+
+def _bloco_poco_implicito(afd, estados, simbolos, indice_estado, poco,
+                          elementos, inicio, bloco_de, bloco_inicial):
+    """
+    Escolhe o bloco descartado no modo poco_implicito de minimizar_afd,
+    com o mesmo critério de remover_estado_poco: não-final, diferente do
+    inicial e com todas as transições para si mesmo. Se o AFD era
+    incompleto, só o bloco do poço pode atender ao critério.
+    
+    Retorna: índice do bloco, ou -1 se nenhum bloco é poço
+    """
+    if poco >= 0:
+        candidatos = [bloco_de[poco]]
+    else:
+        candidatos = range(len(inicio))
+    
+    for b in candidatos:
+        if b == bloco_inicial:
+            continue
+        
+        representante = estados[elementos[inicio[b]]]
+        if representante in afd.estados_finais:
+            continue
+        if representante == ESTADO_POCO and poco >= 0:
+            return b
+        
+        transicoes_estado = afd.transicoes.get(representante, {})
+        eh_poco = True
+        for simbolo in simbolos:
+            destino = transicoes_estado.get(simbolo)
+            if destino is None:
+                destino = ESTADO_POCO
+            elif isinstance(destino, set):
+                destino = next(iter(destino))
+            if bloco_de[indice_estado[destino]] != b:
+                eh_poco = False
+                break
+        
+        if eh_poco:
+            return b
+    
+    return -1
+
+
+def remover_estado_poco(afd, no_lugar=False):
     """
     Remove o estado poço do AFD, se existir.
     
@@ -248,6 +554,9 @@ def remover_estado_poco(afd):
     - Não é estado inicial  
     - Todas as suas transições vão para ele mesmo
     
+    Com no_lugar=True o poço e as transições para ele são apagados do
+    próprio AFD, sem cópia.
+    
     Retorna: AFD sem o estado poço
     """
     # Encontra estado poço pelo comportamento
@@ -276,6 +585,15 @@ def remover_estado_poco(afd):
     if estado_poco is None:
         return afd
     
+    if no_lugar:
+        afd.estados.discard(estado_poco)
+        afd.transicoes.pop(estado_poco, None)
+        for transicoes_estado in afd.transicoes.values():
+            para_poco = [s for s, d in transicoes_estado.items() if d == estado_poco]
+            for simbolo in para_poco:
+                del transicoes_estado[simbolo]
+        return afd
+    
     # Cria novo AFD sem o estado poço
     novo_afd = Automato()
     novo_afd.alfabeto = afd.alfabeto.copy()
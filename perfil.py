@@ -0,0 +1,203 @@
+"""
+Módulo de instrumentação (profiling) do pipeline.
+
+Este módulo é responsável por:
+- Medir cada etapa do pipeline: tempo de relógio, tempo de CPU e pico
+  de memória alocada (tracemalloc)
+- Registrar o tamanho do autômato produzido por cada etapa (estados e
+  transições) e os contadores dos algoritmos (subconjuntos explorados,
+  rodadas de refinamento, transições para o poço, ...)
+- Notificar funções registradas (ganchos) ao fim de cada etapa
+- Exportar as medidas em JSON
+
+Uso:
+    perfil = Perfilador()
+    perfil.adicionar_gancho(lambda medida: print(medida.nome, medida.segundos))
+    executar_pipeline('entrada.txt', 'saida.csv', perfil=perfil)
+    perfil.salvar_json('perfil.json')
+
+Sem perfilador (perfil=None), medir_etapa devolve uma etapa desativada
+que não mede nada, então o pipeline não paga o custo da instrumentação.
+"""
+
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass, field, asdict
+
+
+@dataclass
+class MedidaEtapa:
+    """
+    Medidas de uma etapa do pipeline.
+    
+    Atributos:
+        nome: Nome da etapa (ex: 'determinizacao')
+        segundos: Tempo de relógio
+        segundos_cpu: Tempo de CPU do processo
+        pico_memoria: Pico de memória alocada durante a etapa, em bytes,
+                      acima do que já estava alocado no início (None se a
+                      memória não foi medida)
+        estados: Estados do autômato produzido (None se a etapa não
+                 produz autômato)
+        transicoes: Transições do autômato produzido
+        contadores: Contadores específicos do algoritmo da etapa
+    """
+    nome: str
+    segundos: float = 0.0
+    segundos_cpu: float = 0.0
+    pico_memoria: int = None
+    estados: int = None
+    transicoes: int = None
+    contadores: dict = field(default_factory=dict)
+    
+    def registrar(self, automato):
+        """Registra a quantidade de estados e transições do autômato."""
+        self.estados = len(automato.estados)
+        self.transicoes = contar_transicoes(automato)
+
+
+class _EtapaDesativada:
+    """Etapa usada sem perfilador: não mede nada e não guarda contadores."""
+    contadores = None
+    
+    def registrar(self, automato):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *excecao):
+        return False
+
+
+ETAPA_DESATIVADA = _EtapaDesativada()
+
+
+def contar_transicoes(automato):
+    """
+    Conta as transições de um autômato.
+    Em um AFN, cada destino de um conjunto conta como uma transição.
+    """
+    total = 0
+    for transicoes_estado in automato.transicoes.values():
+        for destino in transicoes_estado.values():
+            total += len(destino) if isinstance(destino, set) else 1
+    return total
+
+
+def medir_etapa(perfil, nome):
+    """
+    Retorna o gerenciador de contexto que mede uma etapa.
+    
+    Uso:
+        with medir_etapa(perfil, 'minimizacao') as etapa:
+            afd = minimizar_afd(afd, contadores=etapa.contadores)
+            etapa.registrar(afd)
+    
+    Com perfil=None, retorna a etapa desativada (contadores = None).
+    """
+    if perfil is None:
+        return ETAPA_DESATIVADA
+    return perfil.etapa(nome)
+
+
+class _Etapa:
+    """Gerenciador de contexto de uma etapa medida por um Perfilador."""
+    
+    def __init__(self, perfil, nome):
+        self.perfil = perfil
+        self.medida = MedidaEtapa(nome)
+    
+    def __enter__(self):
+        if self.perfil.medir_memoria:
+            self.perfil._iniciar_rastreamento()
+            tracemalloc.reset_peak()
+            self._memoria_inicial = tracemalloc.get_traced_memory()[0]
+        
+        self._inicio_cpu = time.process_time()
+        self._inicio = time.perf_counter()
+        return self.medida
+    
+    def __exit__(self, *excecao):
+        medida = self.medida
+        medida.segundos = time.perf_counter() - self._inicio
+        medida.segundos_cpu = time.process_time() - self._inicio_cpu
+        
+        if self.perfil.medir_memoria:
+            medida.pico_memoria = tracemalloc.get_traced_memory()[1] - self._memoria_inicial
+        
+        self.perfil._concluir(medida)
+        return False
+
+
+class Perfilador:
+    """
+    Coleta as medidas das etapas do pipeline.
+    
+    Com medir_memoria=True o tracemalloc é ativado na primeira etapa (se
+    ainda não estiver ativo) e desativado em finalizar(). Ele torna as
+    alocações bem mais lentas, então os tempos medidos junto com a
+    memória servem para comparar etapas entre si, e não como tempo
+    absoluto; use medir_memoria=False para medir só tempo.
+    """
+    
+    def __init__(self, medir_memoria=True):
+        self.medir_memoria = medir_memoria
+        self.etapas = []
+        self.ganchos = []
+        self._iniciou_rastreamento = False
+    
+    def adicionar_gancho(self, funcao):
+        """Registra uma função chamada com a MedidaEtapa ao fim de cada etapa."""
+        self.ganchos.append(funcao)
+    
+    def etapa(self, nome):
+        """Retorna o gerenciador de contexto que mede uma etapa."""
+        return _Etapa(self, nome)
+    
+    def _iniciar_rastreamento(self):
+        """Ativa o tracemalloc, se ainda não estiver ativo."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou_rastreamento = True
+    
+    def _concluir(self, medida):
+        """Guarda a medida e notifica os ganchos."""
+        self.etapas.append(medida)
+        for gancho in self.ganchos:
+            gancho(medida)
+    
+    def finalizar(self):
+        """Desativa o tracemalloc, se foi ativado por este perfilador."""
+        if self._iniciou_rastreamento:
+            tracemalloc.stop()
+            self._iniciou_rastreamento = False
+    
+    def para_dict(self):
+        """
+        Converte as medidas em um dicionário serializável em JSON.
+        
+        Retorna: {'etapas': [...], 'total': {...}}, onde 'total' traz a
+        soma dos tempos e a etapa mais lenta ('gargalo')
+        """
+        gargalo = max(self.etapas, key=lambda m: m.segundos, default=None)
+        
+        return {
+            'etapas': [asdict(medida) for medida in self.etapas],
+            'total': {
+                'segundos': sum(m.segundos for m in self.etapas),
+                'segundos_cpu': sum(m.segundos_cpu for m in self.etapas),
+                'gargalo': gargalo.nome if gargalo is not None else None,
+            },
+        }
+    
+    def para_json(self):
+        """Retorna as medidas em JSON (ver para_dict)."""
+        return json.dumps(self.para_dict(), ensure_ascii=False, indent=2)
+    
+    def salvar_json(self, caminho):
+        """Salva as medidas em um arquivo JSON."""
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(self.para_json())
+            arquivo.write('\n')
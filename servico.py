@@ -0,0 +1,530 @@
+"""
+Módulo do serviço de reconhecimento (asyncio).
+
+Este módulo é responsável por:
+- Carregar uma única vez os autômatos (gramáticas ou AFDs já salvos) e
+  atender pedidos de reconhecimento por um socket Unix ou TCP local
+- Agrupar os pedidos que chegam juntos (de todas as conexões) em um
+  único lote por autômato, reconhecido de uma vez (ver lote.py)
+- Recarregar um autômato quando o seu arquivo muda, sem interromper o
+  serviço
+
+Arquivos aceitos (pela extensão):
+    .afdb → AFD binário (carregar_afd_binario)
+    .csv  → AFD em CSV (carregar_afd_csv)
+    outras → gramática regular; a recarga aplica só a diferença entre as
+             versões (ver CompiladorIncremental.recarregar). Arquivos
+             vazios ou com produções malformadas são recusados
+
+Protocolo: uma mensagem JSON (UTF-8) por linha, nos dois sentidos. As
+respostas de uma conexão saem na ordem dos pedidos, e o cliente pode
+enviar vários pedidos sem esperar as respostas.
+    {"id": 1, "automato": "inteiro", "palavra": "0a1"}
+        → {"id": 1, "aceita": false}
+    {"id": 2, "automato": "inteiro", "palavras": ["1", "x"]}
+        → {"id": 2, "aceitas": [true, false]}
+    {"id": 3, "comando": "listar"}
+        → {"id": 3, "automatos": {"inteiro": {"estados": 2, "versao": 1}}}
+    Em caso de erro: {"id": ..., "erro": "mensagem"}
+
+O campo "automato" pode ser omitido se o serviço tem um único autômato.
+Uma palavra é uma string (um símbolo por caractere) ou uma lista de
+símbolos (para terminais de vários caracteres).
+
+Agrupamento:
+    Os pedidos entram em uma fila única. Ao receber o primeiro, o
+    agrupador espera até 'espera_lote' segundos por outros (ou até somar
+    'limite_lote' palavras), separa as palavras por autômato e reconhece
+    cada grupo de uma vez em outra thread, para que o laço de eventos
+    continue aceitando pedidos. Com o NumPy instalado, as palavras são
+    ordenadas por tamanho e reconhecidas em matrizes de no máximo
+    CELULAS_MATRIZ posições; palavras longas e grupos pequenos vão para
+    o AFD compilado (ver reconhecer_palavras).
+"""
+
+import asyncio
+import json
+import os
+import sys
+from dataclasses import dataclass
+
+from gramatica import ler_arquivo_texto, parsear_gramatica, extrair_terminal_e_nao_terminal
+from incremental import CompiladorIncremental
+from io_saida import EXTENSAO_BINARIA, carregar_afd_binario, carregar_afd_csv
+from compilado import compilar
+from lote import ReconhecedorLote
+
+
+# Endereço padrão do serviço TCP (apenas conexões locais)
+HOST_PADRAO = '127.0.0.1'
+PORTA_PADRAO = 8765
+
+# Intervalo (segundos) entre as verificações de alteração dos arquivos
+INTERVALO_RECARGA_PADRAO = 1.0
+
+# Quanto o agrupador espera (segundos) por mais pedidos antes de reconhecer
+ESPERA_LOTE_PADRAO = 0.001
+
+# Máximo de palavras reconhecidas em um único lote
+LIMITE_LOTE_PADRAO = 65536
+
+# Abaixo deste número de palavras, o laço do AFD compilado é mais rápido
+# que montar a matriz do NumPy
+MINIMO_VETORIZADO = 64
+
+# Palavras maiores que isto não entram na matriz do NumPy: uma palavra
+# longa faria todas as outras do grupo serem preenchidas até o seu tamanho
+COMPRIMENTO_MAXIMO_VETORIZADO = 4096
+
+# Máximo de posições (palavras × tamanho da maior) de cada matriz do
+# NumPy (4 Mi posições int32 = 16 MiB)
+CELULAS_MATRIZ = 1 << 22
+
+# Tamanho máximo de uma linha do protocolo (16 MiB)
+TAMANHO_MAXIMO_LINHA = 1 << 24
+
+EXTENSAO_CSV = '.csv'
+
+
+def _assinatura(caminho):
+    """Retorna (data de modificação em ns, tamanho) do arquivo."""
+    estado = os.stat(caminho)
+    return estado.st_mtime_ns, estado.st_size
+
+
+@dataclass
+class AutomatoServico:
+    """
+    Autômato atendido pelo serviço.
+    
+    Atributos:
+        nome: Nome usado no campo "automato" dos pedidos
+        caminho: Arquivo de onde o autômato é carregado
+        compilado: AFDCompilado em uso
+        reconhecedor_lote: ReconhecedorLote do AFD (None sem o NumPy)
+        versao: Quantas vezes o autômato foi carregado
+        assinatura: (data de modificação, tamanho) da última carga
+        compilador: CompiladorIncremental, para arquivos de gramática
+        expandir_terminais: Se os terminais de vários caracteres das
+                            gramáticas viram cadeias de um caractere
+    """
+    nome: str
+    caminho: str
+    compilado: object = None
+    reconhecedor_lote: object = None
+    versao: int = 0
+    assinatura: tuple = None
+    compilador: object = None
+    expandir_terminais: bool = False
+    
+    def construir(self):
+        """
+        Lê o arquivo e monta o AFD compilado. Não altera o autômato em
+        uso, só o compilador incremental (pode rodar em outra thread); a
+        troca é feita por atualizar.
+        
+        Retorna: (compilado, reconhecedor_lote, assinatura)
+        """
+        assinatura = _assinatura(self.caminho)
+        
+        if self.caminho.endswith(EXTENSAO_BINARIA):
+            compilado = carregar_afd_binario(self.caminho)
+        elif self.caminho.endswith(EXTENSAO_CSV):
+            compilado = carregar_afd_csv(self.caminho, compilado=True)
+        else:
+            gramatica, nao_terminal_inicial = parsear_gramatica(ler_arquivo_texto(self.caminho))
+            _validar_gramatica(gramatica, nao_terminal_inicial)
+            compilador = self.compilador
+            
+            try:
+                if compilador is None or compilador.nao_terminal_inicial != nao_terminal_inicial:
+                    compilador = CompiladorIncremental(
+                        gramatica, nao_terminal_inicial, self.expandir_terminais
+                    )
+                    afd = compilador.afd_minimo()
+                else:
+                    afd = compilador.recarregar(gramatica)
+            except Exception:
+                # O estado incremental pode ter ficado pela metade
+                self.compilador = None
+                raise
+            
+            self.compilador = compilador
+            compilado = compilar(afd)
+        
+        try:
+            reconhecedor_lote = ReconhecedorLote(compilado)
+        except ImportError:
+            reconhecedor_lote = None
+        
+        return compilado, reconhecedor_lote, assinatura
+    
+    def atualizar(self, compilado, reconhecedor_lote, assinatura):
+        """Passa a usar o autômato montado por construir."""
+        self.compilado = compilado
+        self.reconhecedor_lote = reconhecedor_lote
+        self.assinatura = assinatura
+        self.versao += 1
+    
+    def reconhecer_todas(self, palavras):
+        """
+        Reconhece uma lista de palavras com o autômato em uso.
+        Retorna: lista de booleanos, um por palavra
+        """
+        return reconhecer_palavras(self.compilado, self.reconhecedor_lote, palavras)
+
+
+class ServicoReconhecimento:
+    """
+    Serviço asyncio de reconhecimento com agrupamento de pedidos e
+    recarga automática.
+    
+    Uso:
+        servico = ServicoReconhecimento({'inteiro': 'inteiro.txt'})
+        asyncio.run(servico.servir(caminho_socket='/tmp/afd.sock'))
+    
+    Os autômatos são carregados no construtor; um erro em algum arquivo
+    impede o serviço de começar. Erros de recarga são informados em
+    sys.stderr, e o autômato anterior continua em uso.
+    
+    Com expandir_terminais=True, as gramáticas (na carga e nas recargas)
+    são convertidas com os terminais de vários caracteres expandidos; os
+    AFDs já salvos (.csv, .afdb) são usados como estão.
+    """
+    
+    def __init__(self, caminhos, espera_lote=ESPERA_LOTE_PADRAO,
+                 limite_lote=LIMITE_LOTE_PADRAO,
+                 intervalo_recarga=INTERVALO_RECARGA_PADRAO,
+                 expandir_terminais=False):
+        self.espera_lote = espera_lote
+        self.limite_lote = limite_lote
+        self.intervalo_recarga = intervalo_recarga
+        self.automatos = {}
+        self._fila = None
+        
+        for nome, caminho in caminhos.items():
+            automato = AutomatoServico(nome, caminho, expandir_terminais=expandir_terminais)
+            automato.atualizar(*automato.construir())
+            self.automatos[nome] = automato
+    
+    async def servir(self, caminho_socket=None, host=HOST_PADRAO, porta=PORTA_PADRAO,
+                     pronto=None):
+        """
+        Atende conexões até ser cancelado: pelo socket Unix em
+        'caminho_socket', se informado, ou por TCP em host:porta.
+        
+        Se 'pronto' (asyncio.Event) for informado, é sinalizado quando o
+        serviço começa a aceitar conexões.
+        """
+        self._fila = asyncio.Queue()
+        
+        if caminho_socket is not None:
+            servidor = await asyncio.start_unix_server(
+                self._tratar_conexao, caminho_socket, limit=TAMANHO_MAXIMO_LINHA
+            )
+        else:
+            servidor = await asyncio.start_server(
+                self._tratar_conexao, host, porta, limit=TAMANHO_MAXIMO_LINHA
+            )
+        
+        tarefas = [asyncio.create_task(self._agrupar_pedidos())]
+        if self.intervalo_recarga:
+            tarefas.append(asyncio.create_task(self._vigiar_arquivos()))
+        
+        try:
+            async with servidor:
+                if pronto is not None:
+                    pronto.set()
+                await servidor.serve_forever()
+        finally:
+            for tarefa in tarefas:
+                tarefa.cancel()
+            if caminho_socket is not None and os.path.exists(caminho_socket):
+                os.remove(caminho_socket)
+    
+    async def _tratar_conexao(self, leitor, escritor):
+        """
+        Lê os pedidos de uma conexão. Cada pedido vira uma tarefa, e as
+        respostas são escritas na ordem dos pedidos.
+        """
+        respostas = asyncio.Queue()
+        escrita = asyncio.create_task(self._escrever_respostas(respostas, escritor))
+        
+        try:
+            try:
+                while True:
+                    linha = await leitor.readline()
+                    if not linha:
+                        break
+                    if linha.strip():
+                        respostas.put_nowait(asyncio.create_task(self._responder(linha)))
+            except (ConnectionError, ValueError):
+                # Conexão perdida ou linha maior que TAMANHO_MAXIMO_LINHA
+                pass
+            
+            respostas.put_nowait(None)
+            await escrita
+        except asyncio.CancelledError:
+            # Serviço encerrado com a conexão ainda aberta
+            escrita.cancel()
+    
+    async def _escrever_respostas(self, respostas, escritor):
+        """Escreve as respostas em ordem, uma linha JSON para cada."""
+        try:
+            while True:
+                tarefa = await respostas.get()
+                if tarefa is None:
+                    break
+                resposta = await tarefa
+                escritor.write(json.dumps(resposta, ensure_ascii=False).encode('utf-8') + b'\n')
+                
+                # Junta as respostas já prontas em uma única escrita
+                if respostas.empty():
+                    await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+    
+    async def _responder(self, linha):
+        """
+        Interpreta um pedido e espera o seu resultado.
+        Retorna: dict da resposta
+        """
+        identificador = None
+        try:
+            pedido = json.loads(linha)
+            if not isinstance(pedido, dict):
+                raise ValueError("O pedido deve ser um objeto JSON")
+            identificador = pedido.get('id')
+            
+            if pedido.get('comando') == 'listar':
+                return {'id': identificador, 'automatos': {
+                    nome: {'estados': automato.compilado.num_estados, 'versao': automato.versao}
+                    for nome, automato in self.automatos.items()
+                }}
+            if 'comando' in pedido:
+                raise ValueError(f"Comando desconhecido: {pedido['comando']}")
+            
+            automato = self._obter_automato(pedido.get('automato'))
+            if 'palavra' in pedido:
+                aceitas = await self._enfileirar(automato, [_validar_palavra(pedido['palavra'])])
+                return {'id': identificador, 'aceita': aceitas[0]}
+            if isinstance(pedido.get('palavras'), list):
+                palavras = [_validar_palavra(palavra) for palavra in pedido['palavras']]
+                return {'id': identificador, 'aceitas': await self._enfileirar(automato, palavras)}
+            raise ValueError("O pedido deve ter 'palavra' ou 'palavras' (lista)")
+        except Exception as erro:
+            return {'id': identificador, 'erro': str(erro)}
+    
+    def _obter_automato(self, nome):
+        """Retorna o autômato pelo nome (opcional se houver só um)."""
+        if nome is None and len(self.automatos) == 1:
+            return next(iter(self.automatos.values()))
+        automato = self.automatos.get(nome)
+        if automato is None:
+            raise ValueError(f"Autômato desconhecido: {nome}")
+        return automato
+    
+    def _enfileirar(self, automato, palavras):
+        """
+        Coloca as palavras na fila do agrupador.
+        Retorna: future com a lista de resultados
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        self._fila.put_nowait((automato, palavras, futuro))
+        return futuro
+    
+    async def _agrupar_pedidos(self):
+        """
+        Junta os pedidos da fila em lotes e reconhece cada lote.
+        """
+        loop = asyncio.get_running_loop()
+        fila = self._fila
+        
+        while True:
+            lote = [await fila.get()]
+            quantidade = len(lote[0][1])
+            prazo = loop.time() + self.espera_lote
+            
+            while quantidade < self.limite_lote:
+                if fila.empty():
+                    restante = prazo - loop.time()
+                    if restante <= 0:
+                        break
+                    await asyncio.sleep(restante)
+                    if fila.empty():
+                        break
+                pedido = fila.get_nowait()
+                lote.append(pedido)
+                quantidade += len(pedido[1])
+            
+            await self._processar_lote(lote)
+    
+    async def _processar_lote(self, lote):
+        """
+        Reconhece as palavras do lote, um grupo por autômato, em outra
+        thread. O autômato de cada grupo é lido aqui, no laço de eventos:
+        uma recarga durante o reconhecimento vale só para o próximo lote.
+        """
+        grupos = {}
+        for automato, palavras, futuro in lote:
+            grupos.setdefault(automato.nome, (automato, []))[1].append((palavras, futuro))
+        
+        for automato, pedidos in grupos.values():
+            todas = [palavra for palavras, _ in pedidos for palavra in palavras]
+            try:
+                resultados = await asyncio.to_thread(
+                    reconhecer_palavras, automato.compilado, automato.reconhecedor_lote, todas
+                )
+            except Exception as erro:
+                for _, futuro in pedidos:
+                    if not futuro.done():
+                        futuro.set_exception(erro)
+                continue
+            
+            inicio = 0
+            for palavras, futuro in pedidos:
+                if not futuro.done():
+                    futuro.set_result(resultados[inicio:inicio + len(palavras)])
+                inicio += len(palavras)
+    
+    async def _vigiar_arquivos(self):
+        """
+        Verifica periodicamente se os arquivos mudaram e recarrega os
+        autômatos alterados. A construção roda em outra thread; a troca
+        acontece no laço de eventos (ver _processar_lote).
+        """
+        while True:
+            await asyncio.sleep(self.intervalo_recarga)
+            
+            for automato in self.automatos.values():
+                try:
+                    assinatura = _assinatura(automato.caminho)
+                except OSError:
+                    # Arquivo sendo substituído; tenta na próxima verificação
+                    continue
+                if assinatura == automato.assinatura:
+                    continue
+                
+                try:
+                    novo = await asyncio.to_thread(automato.construir)
+                except Exception as erro:
+                    # Só tenta de novo quando o arquivo mudar outra vez
+                    print(f"Erro ao recarregar '{automato.caminho}': {erro}", file=sys.stderr)
+                    automato.assinatura = assinatura
+                    continue
+                
+                automato.atualizar(*novo)
+                print(f"Autômato '{automato.nome}' recarregado (versão {automato.versao}, "
+                      f"{automato.compilado.num_estados} estados)", file=sys.stderr)
+
+
+def reconhecer_palavras(compilado, reconhecedor_lote, palavras):
+    """
+    Reconhece uma lista de palavras com o AFD compilado e, se informado
+    (NumPy instalado), com o ReconhecedorLote do mesmo AFD.
+    
+    As palavras são ordenadas por tamanho e separadas em grupos cuja
+    matriz (palavras × tamanho da maior) tem no máximo CELULAS_MATRIZ
+    posições, o que limita a memória e o preenchimento de cada matriz.
+    Palavras com mais de COMPRIMENTO_MAXIMO_VETORIZADO símbolos, e grupos
+    com menos de MINIMO_VETORIZADO palavras, são reconhecidos pelo AFD
+    compilado, uma palavra por vez.
+    
+    Retorna: lista de booleanos, um por palavra (na ordem de 'palavras')
+    """
+    reconhecer = compilado.reconhecer
+    if reconhecedor_lote is None or len(palavras) < MINIMO_VETORIZADO:
+        return [reconhecer(palavra) for palavra in palavras]
+    
+    resultados = [False] * len(palavras)
+    
+    def reconhecer_grupo(grupo):
+        if len(grupo) < MINIMO_VETORIZADO:
+            for i in grupo:
+                resultados[i] = reconhecer(palavras[i])
+            return
+        aceitas = reconhecedor_lote.reconhecer([palavras[i] for i in grupo], len(grupo))
+        for i, aceita in zip(grupo, aceitas.tolist()):
+            resultados[i] = aceita
+    
+    grupo = []
+    for i in sorted(range(len(palavras)), key=lambda i: len(palavras[i])):
+        comprimento = len(palavras[i])
+        if comprimento > COMPRIMENTO_MAXIMO_VETORIZADO:
+            resultados[i] = reconhecer(palavras[i])
+            continue
+        
+        # Em ordem de tamanho, a palavra atual é a maior do grupo
+        if (len(grupo) + 1) * comprimento > CELULAS_MATRIZ:
+            reconhecer_grupo(grupo)
+            grupo = []
+        grupo.append(i)
+    
+    if grupo:
+        reconhecer_grupo(grupo)
+    
+    return resultados
+
+
+def _validar_gramatica(gramatica, nao_terminal_inicial):
+    """
+    Recusa arquivos de gramática vazios ou com produções malformadas.
+    
+    parsear_gramatica aceita esses arquivos (um arquivo vazio vira uma
+    gramática sem produções, que rejeita tudo), mas no serviço eles quase
+    sempre são um arquivo salvo pela metade. Lançar ValueError faz a
+    recarga manter o autômato anterior.
+    """
+    if nao_terminal_inicial is None or not gramatica:
+        raise ValueError("Gramática vazia (nenhuma linha com '::=')")
+    
+    for nao_terminal, producoes in gramatica.items():
+        if not producoes:
+            raise ValueError(f"<{nao_terminal}> sem produções")
+        for producao in producoes:
+            terminal, destino, _ = extrair_terminal_e_nao_terminal(producao)
+            if destino is None and terminal and ('<' in terminal or '>' in terminal):
+                raise ValueError(f"Produção malformada em <{nao_terminal}>: {producao}")
+
+
+def _validar_palavra(palavra):
+    """Aceita uma string ou uma lista de símbolos (strings)."""
+    if isinstance(palavra, str):
+        return palavra
+    if isinstance(palavra, list) and all(isinstance(simbolo, str) for simbolo in palavra):
+        return palavra
+    raise ValueError("Cada palavra deve ser uma string ou uma lista de strings")
+
+
+def nomes_automatos(caminhos):
+    """
+    Dá a cada arquivo um nome: o nome do arquivo sem a extensão.
+    Lança ValueError se dois arquivos resultarem no mesmo nome.
+    
+    Retorna: dict {nome: caminho}
+    """
+    nomes = {}
+    for caminho in caminhos:
+        nome = os.path.splitext(os.path.basename(caminho))[0]
+        if nome in nomes:
+            raise ValueError(f"Dois arquivos com o nome '{nome}': {nomes[nome]} e {caminho}")
+        nomes[nome] = caminho
+    return nomes
+
+
+def executar_servico(caminhos, caminho_socket=None, host=HOST_PADRAO, porta=PORTA_PADRAO,
+                     **opcoes):
+    """
+    Carrega os autômatos dos arquivos e atende pedidos até ser
+    interrompido (Ctrl+C). 'opcoes' são repassadas a ServicoReconhecimento.
+    """
+    servico = ServicoReconhecimento(nomes_automatos(caminhos), **opcoes)
+    endereco = caminho_socket or f"{host}:{porta}"
+    print(f"Servindo {len(servico.automatos)} autômato(s) em {endereco}")
+    
+    try:
+        asyncio.run(servico.servir(caminho_socket, host, porta))
+    except KeyboardInterrupt:
+        pass
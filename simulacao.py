@@ -0,0 +1,343 @@
+"""
+Módulo de simulação do AFN sem determinização prévia.
+
+Este módulo é responsável por:
+- Reconhecer palavras diretamente a partir do AFN gerado por
+  converter_gramatica_para_afn, sem executar determinizar_afn
+- Construir estados do AFD sob demanda (determinização preguiçosa),
+  apenas para os conjuntos que a entrada realmente alcança
+- Limitar a memória com um cache de estados de tamanho máximo
+- Simular o AFN de forma bit-paralela, com os estados ativos em um único
+  inteiro, sem construir nenhum estado do AFD
+
+Útil para gramáticas em que a construção de subconjuntos completa explode
+exponencialmente (ex: "o n-ésimo símbolo a partir do fim é a").
+"""
+
+from conversao import indexar_afn
+
+
+# Quantidade máxima padrão de estados do AFD mantidos em cache
+LIMITE_ESTADOS_PADRAO = 10000
+
+# Se o cache encher de novo antes de processar FATOR_PROGRESSO * limite
+# símbolos desde a limpeza anterior, considera-se que ele está "se
+# debatendo" e o restante da palavra é simulado diretamente sobre
+# conjuntos de estados do AFN
+FATOR_PROGRESSO = 10
+
+# Memória máxima (aproximada) das tabelas por byte do SimuladorAFN (16 MiB)
+LIMITE_MEMORIA_TABELAS = 16 << 20
+
+
+def montar_sucessores_por_simbolo(indexado):
+    """
+    Reorganiza as saídas do AFN indexado por símbolo.
+    
+    Retorna: lista sucessores[coluna][estado] = máscara destino
+    """
+    n = len(indexado.nomes)
+    sucessores = [[0] * n for _ in indexado.simbolos]
+    
+    for estado, saidas_estado in enumerate(indexado.saidas):
+        for coluna, destino in saidas_estado:
+            sucessores[coluna][estado] = destino
+    
+    return sucessores
+
+
+def passo_mascara(sucessores_simbolo, mascara):
+    """
+    Avança um conjunto de estados (máscara) por um símbolo:
+    OR das máscaras destino de todos os estados ativos.
+    """
+    destino = 0
+    
+    while mascara:
+        bit = mascara & -mascara
+        mascara ^= bit
+        destino |= sucessores_simbolo[bit.bit_length() - 1]
+    
+    return destino
+
+
+class _EstadoPreguicoso:
+    """Estado do AFD construído sob demanda (um conjunto de estados do AFN)."""
+    __slots__ = ('mascara', 'final', 'proximos')
+    
+    def __init__(self, mascara, final, num_simbolos):
+        self.mascara = mascara
+        self.final = final
+        # proximos[coluna] = _EstadoPreguicoso, ou None se ainda não calculado
+        self.proximos = [None] * num_simbolos
+
+
+class AFDPreguicoso:
+    """
+    Reconhecedor que determiniza o AFN sob demanda.
+    
+    Cada estado do AFD (conjunto de estados do AFN) só é criado quando a
+    entrada o alcança, e cada transição só é calculada na primeira vez
+    que é usada. Os estados ficam em um cache limitado a 'limite_estados';
+    quando o cache enche, ele é esvaziado por completo.
+    
+    Atributos de acompanhamento:
+        limpezas: Quantas vezes o cache foi esvaziado
+        palavras_em_modo_afn: Palavras que terminaram em simulação direta
+    """
+    
+    def __init__(self, afn, limite_estados=LIMITE_ESTADOS_PADRAO):
+        self.indexado = indexar_afn(afn)
+        self.indice_simbolo = {s: c for c, s in enumerate(self.indexado.simbolos)}
+        self.sucessores = montar_sucessores_por_simbolo(self.indexado)
+        self.limite_estados = max(2, limite_estados)
+        
+        self.limpezas = 0
+        self.palavras_em_modo_afn = 0
+        # Símbolos processados desde a última limpeza do cache. Começa no
+        # limite para que o primeiro enchimento nunca conte como "se
+        # debatendo": só um segundo enchimento rápido ativa o modo AFN
+        self._progresso = FATOR_PROGRESSO * self.limite_estados
+        self._limpar_cache()
+    
+    @property
+    def estados_em_cache(self):
+        """Quantidade de estados do AFD atualmente em cache."""
+        return len(self._estados)
+    
+    def _limpar_cache(self):
+        """Esvazia o cache e recria os estados inicial e de rejeição."""
+        self._estados = {}
+        self._inicial = self._obter_estado(self.indexado.inicial)
+        self._rejeicao = self._obter_estado(0)
+    
+    def _obter_estado(self, mascara):
+        """Retorna o estado do cache para a máscara, criando-o se preciso."""
+        estado = self._estados.get(mascara)
+        if estado is None:
+            estado = _EstadoPreguicoso(
+                mascara,
+                bool(mascara & self.indexado.finais),
+                len(self.indexado.simbolos)
+            )
+            self._estados[mascara] = estado
+        return estado
+    
+    def _calcular_transicao(self, estado, coluna):
+        """
+        Calcula e memoriza a transição (estado, coluna).
+        
+        Retorna: (estado destino, True se o cache foi esvaziado)
+        """
+        destino = passo_mascara(self.sucessores[coluna], estado.mascara)
+        esvaziou = False
+        
+        if destino not in self._estados and len(self._estados) >= self.limite_estados:
+            self.limpezas += 1
+            self._limpar_cache()
+            esvaziou = True
+            
+            # O estado atual precisa voltar ao cache para manter o encadeamento
+            estado = self._obter_estado(estado.mascara)
+        
+        proximo = self._obter_estado(destino)
+        estado.proximos[coluna] = proximo
+        return proximo, esvaziou
+    
+    def reconhecer(self, palavra):
+        """
+        Verifica se o AFN aceita a palavra.
+        
+        Percorre os estados em cache como um AFD comum; transições ainda
+        desconhecidas são calculadas na hora. Se o cache encher de novo
+        antes de FATOR_PROGRESSO * limite_estados símbolos processados,
+        o restante da palavra é simulado diretamente sobre conjuntos de
+        estados do AFN.
+        
+        Retorna True se a palavra é aceita, False caso contrário.
+        """
+        indice_simbolo = self.indice_simbolo
+        limite_progresso = FATOR_PROGRESSO * self.limite_estados
+        progresso = self._progresso
+        estado = self._inicial
+        rejeicao = self._rejeicao
+        simbolos = iter(palavra)
+        
+        for simbolo in simbolos:
+            coluna = indice_simbolo.get(simbolo)
+            if coluna is None:
+                aceita = False
+                break
+            
+            proximo = estado.proximos[coluna]
+            if proximo is None:
+                proximo, esvaziou = self._calcular_transicao(estado, coluna)
+                if esvaziou:
+                    rejeicao = self._rejeicao
+                    debatendo = progresso < limite_progresso
+                    progresso = 0
+                    if debatendo:
+                        self.palavras_em_modo_afn += 1
+                        aceita = self._reconhecer_afn(proximo.mascara, simbolos)
+                        break
+            
+            estado = proximo
+            if estado is rejeicao:
+                aceita = False
+                break
+            progresso += 1
+        else:
+            aceita = estado.final
+        
+        self._progresso = progresso
+        return aceita
+    
+    def _reconhecer_afn(self, mascara, simbolos):
+        """
+        Consome o restante dos símbolos avançando diretamente a máscara
+        de estados do AFN, sem usar o cache.
+        """
+        indice_simbolo = self.indice_simbolo
+        sucessores = self.sucessores
+        
+        for simbolo in simbolos:
+            if not mascara:
+                return False
+            coluna = indice_simbolo.get(simbolo)
+            if coluna is None:
+                return False
+            mascara = passo_mascara(sucessores[coluna], mascara)
+        
+        return bool(mascara & self.indexado.finais)
+
+
+class SimuladorAFN:
+    """
+    Reconhecedor bit-paralelo que executa o AFN diretamente.
+    
+    O conjunto de estados ativos é um único inteiro (um bit por estado).
+    Cada passo é o OR das máscaras sucessoras dos estados ativos. O passo
+    visita só os bytes não-nulos da máscara, saltando de um para o outro
+    com bit_length(), então o custo depende dos estados ativos, e não do
+    tamanho do AFN. Um byte com um único estado ativo custa uma consulta
+    aos sucessores; um byte com vários usa uma tabela de 256 posições
+    (para aquele símbolo e aquele grupo de 8 estados) com o OR dos
+    sucessores, criada no primeiro uso.
+    
+    As tabelas guardam máscaras do tamanho do AFN, então a memória total
+    delas é limitada a LIMITE_MEMORIA_TABELAS; esgotado o limite, os bytes
+    sem tabela são processados estado a estado.
+    
+    Não executa determinização nem minimização: indicado quando só é
+    preciso reconhecer palavras, e não exportar o AFD.
+    """
+    
+    def __init__(self, afn):
+        self.indexado = indexar_afn(afn)
+        self.indice_simbolo = {s: c for c, s in enumerate(self.indexado.simbolos)}
+        self.sucessores = montar_sucessores_por_simbolo(self.indexado)
+        self.num_bytes = max(1, (len(self.indexado.nomes) + 7) // 8)
+        
+        # tabelas[coluna][byte] = tabela de 256 máscaras, criada no primeiro uso
+        self.tabelas = [[None] * self.num_bytes for _ in self.indexado.simbolos]
+        
+        # Cada tabela tem 256 inteiros de até num_bytes bytes (mais o
+        # cabeçalho do int e o ponteiro da lista)
+        tamanho_tabela = 256 * (self.num_bytes + 40)
+        self.tabelas_restantes = LIMITE_MEMORIA_TABELAS // tamanho_tabela
+    
+    def _montar_tabela(self, coluna, indice_byte):
+        """
+        Monta a tabela de 256 posições para um símbolo e um byte da máscara.
+        Cada entrada reaproveita a de um valor com um bit a menos.
+        """
+        sucessores = self.sucessores[coluna]
+        base = indice_byte * 8
+        tabela = [0] * 256
+        
+        for valor in range(1, 256):
+            bit = valor & -valor
+            estado = base + bit.bit_length() - 1
+            destino = sucessores[estado] if estado < len(sucessores) else 0
+            tabela[valor] = tabela[valor ^ bit] | destino
+        
+        self.tabelas[coluna][indice_byte] = tabela
+        self.tabelas_restantes -= 1
+        return tabela
+    
+    def passo(self, mascara, coluna):
+        """Avança a máscara de estados ativos por um símbolo (coluna)."""
+        tamanho = (mascara.bit_length() + 7) >> 3
+        
+        # Máscara densa: percorrer todos os bytes é mais barato que saltar
+        if mascara.bit_count() * 2 >= tamanho:
+            return self._passo_denso(mascara.to_bytes(tamanho, 'little'), coluna)
+        
+        sucessores = self.sucessores[coluna]
+        tabelas_simbolo = self.tabelas[coluna]
+        destino = 0
+        
+        while mascara:
+            # Byte não-nulo mais alto da máscara
+            indice_byte = (mascara.bit_length() - 1) >> 3
+            deslocamento = indice_byte << 3
+            valor = mascara >> deslocamento
+            mascara ^= valor << deslocamento
+            destino |= self._passo_byte(sucessores, tabelas_simbolo, coluna, indice_byte, valor)
+        
+        return destino
+    
+    def _passo_denso(self, valores, coluna):
+        """Avança percorrendo todos os bytes da máscara, em ordem."""
+        sucessores = self.sucessores[coluna]
+        tabelas_simbolo = self.tabelas[coluna]
+        destino = 0
+        
+        for indice_byte, valor in enumerate(valores):
+            if valor:
+                tabela = tabelas_simbolo[indice_byte]
+                if tabela is not None:
+                    destino |= tabela[valor]
+                else:
+                    destino |= self._passo_byte(sucessores, tabelas_simbolo, coluna, indice_byte, valor)
+        
+        return destino
+    
+    def _passo_byte(self, sucessores, tabelas_simbolo, coluna, indice_byte, valor):
+        """
+        Retorna o OR dos sucessores dos estados ativos de um byte da
+        máscara: pela tabela do byte, se houver (ou se valer a pena criá-la
+        e ainda couber no limite), ou estado a estado.
+        """
+        tabela = tabelas_simbolo[indice_byte]
+        if tabela is None and valor & (valor - 1) and self.tabelas_restantes > 0:
+            tabela = self._montar_tabela(coluna, indice_byte)
+        if tabela is not None:
+            return tabela[valor]
+        
+        destino = 0
+        base = indice_byte << 3
+        while valor:
+            bit = valor & -valor
+            valor ^= bit
+            destino |= sucessores[base + bit.bit_length() - 1]
+        return destino
+    
+    def reconhecer(self, palavra):
+        """
+        Verifica se o AFN aceita a palavra.
+        
+        Retorna True se a palavra é aceita, False caso contrário.
+        """
+        indice_simbolo = self.indice_simbolo
+        mascara = self.indexado.inicial
+        
+        for simbolo in palavra:
+            coluna = indice_simbolo.get(simbolo)
+            if coluna is None:
+                return False
+            mascara = self.passo(mascara, coluna)
+            if not mascara:
+                return False
+        
+        return bool(mascara & self.indexado.finais)
@@ -0,0 +1,244 @@
+"""
+Testes diferenciais da minimização.
+
+Compara minimizar_afd (algoritmo de Hopcroft) com a versão anterior,
+por refinamento de assinaturas, sobre gramáticas geradas por
+benchmarks/geradores.py: os dois AFDs mínimos devem ter a mesma
+quantidade de estados e aceitar as mesmas palavras. Cobre também o poço
+implícito, a partição inicial por rótulos (uniao.py) e o compilador
+incremental (incremental.py).
+
+Uso: python -m unittest discover tests
+"""
+
+import itertools
+import os
+import random
+import sys
+import unittest
+
+# Permite importar os módulos do projeto e os geradores dos benchmarks
+DIRETORIO_TESTES = os.path.dirname(os.path.abspath(__file__))
+DIRETORIO_PROJETO = os.path.dirname(DIRETORIO_TESTES)
+sys.path.insert(0, DIRETORIO_PROJETO)
+sys.path.insert(0, os.path.join(DIRETORIO_PROJETO, 'benchmarks'))
+
+from automato import Automato, reconhecer_palavra
+from gramatica import parsear_gramatica
+from conversao import converter_gramatica_para_afn, determinizar_afn
+from minimizacao import (
+    remover_inalcancaveis, completar_com_estado_poco, minimizar_afd, remover_estado_poco
+)
+from uniao import compilar_uniao, determinizar_uniao
+from incremental import CompiladorIncremental
+
+import geradores
+
+
+# Quantidade de gramáticas aleatórias por teste
+NUM_GRAMATICAS = 40
+
+# Tamanho máximo das palavras comparadas (todas as palavras até ele)
+COMPRIMENTO_MAXIMO = 5
+
+# Símbolo fora do alfabeto de todas as gramáticas geradas
+SIMBOLO_DESCONHECIDO = '#'
+
+
+def minimizar_por_assinaturas(afd, rotulos=None):
+    """
+    Versão anterior de minimizar_afd: refina a partição agrupando os
+    estados de cada bloco pela assinatura (bloco destino de cada símbolo,
+    -1 para transições indefinidas) até nada mudar.
+    
+    Com 'rotulos', os estados finais começam separados por rótulo, como
+    em minimizar_afd.
+    
+    Retorna: AFD mínimo equivalente
+    """
+    estados_nao_finais = afd.estados - afd.estados_finais
+    
+    if rotulos is None:
+        particao = [afd.estados_finais.copy(), estados_nao_finais.copy()]
+    else:
+        grupos = {}
+        for estado in afd.estados_finais:
+            grupos.setdefault(rotulos.get(estado), set()).add(estado)
+        particao = list(grupos.values()) + [estados_nao_finais.copy()]
+    
+    particao = [bloco for bloco in particao if bloco]
+    simbolos = sorted(afd.alfabeto)
+    
+    def obter_destino_bloco(estado, simbolo, bloco_de):
+        transicao = afd.obter_transicao(estado, simbolo)
+        if transicao is None:
+            return -1
+        if isinstance(transicao, set):
+            transicao = next(iter(transicao))
+        return bloco_de[transicao]
+    
+    # Refina partições até estabilizar
+    mudou = True
+    while mudou:
+        mudou = False
+        bloco_de = {estado: i for i, bloco in enumerate(particao) for estado in bloco}
+        nova_particao = []
+        
+        for bloco in particao:
+            sub_blocos = {}
+            for estado in bloco:
+                assinatura = tuple(
+                    obter_destino_bloco(estado, simbolo, bloco_de) for simbolo in simbolos
+                )
+                sub_blocos.setdefault(assinatura, set()).add(estado)
+            
+            if len(sub_blocos) > 1:
+                mudou = True
+            nova_particao.extend(sub_blocos.values())
+        
+        particao = nova_particao
+    
+    # Constrói o AFD mínimo a partir da partição final
+    bloco_de = {estado: i for i, bloco in enumerate(particao) for estado in bloco}
+    
+    afd_minimo = Automato()
+    afd_minimo.alfabeto = afd.alfabeto.copy()
+    afd_minimo.estado_inicial = 'q' + str(bloco_de[afd.estado_inicial])
+    
+    for i, bloco in enumerate(particao):
+        nome_bloco = 'q' + str(i)
+        afd_minimo.adicionar_estado(nome_bloco)
+        if bloco & afd.estados_finais:
+            afd_minimo.adicionar_estado_final(nome_bloco)
+        
+        estado_representante = next(iter(bloco))
+        for simbolo in simbolos:
+            destino = obter_destino_bloco(estado_representante, simbolo, bloco_de)
+            if destino >= 0:
+                afd_minimo.adicionar_transicao_afd(nome_bloco, simbolo, 'q' + str(destino))
+    
+    return afd_minimo
+
+
+def pipeline_anterior(afd):
+    """
+    Etapas 6 a 8 como eram antes do poço implícito: completa com o
+    estado poço, minimiza por assinaturas e remove o poço.
+    """
+    completo = completar_com_estado_poco(afd)
+    return remover_estado_poco(minimizar_por_assinaturas(completo))
+
+
+def gerar_gramaticas(semente):
+    """
+    Gera NUM_GRAMATICAS gramáticas aleatórias de tamanhos variados.
+    Retorna: lista de (gramatica, nao_terminal_inicial)
+    """
+    gerador = random.Random(semente)
+    gramaticas = []
+    
+    for i in range(NUM_GRAMATICAS):
+        texto = geradores.gramatica_aleatoria(
+            gerador.randint(1, 8), gerador.randint(1, 3),
+            producoes_por_nao_terminal=gerador.randint(1, 4),
+            prob_terminal=gerador.choice([0.1, 0.3]),
+            semente=semente * 1000 + i
+        )
+        gramaticas.append(parsear_gramatica(texto))
+    
+    return gramaticas
+
+
+def afd_alcancavel(gramatica, nao_terminal_inicial):
+    """AFD da gramática sem estados inalcançáveis (antes das etapas 6 a 8)."""
+    afn = converter_gramatica_para_afn(gramatica, nao_terminal_inicial)
+    return remover_inalcancaveis(determinizar_afn(afn))
+
+
+def palavras(alfabeto):
+    """Todas as palavras até COMPRIMENTO_MAXIMO, com um símbolo desconhecido."""
+    simbolos = sorted(alfabeto) + [SIMBOLO_DESCONHECIDO]
+    for comprimento in range(COMPRIMENTO_MAXIMO + 1):
+        yield from itertools.product(simbolos, repeat=comprimento)
+
+
+class TestMinimizacaoDiferencial(unittest.TestCase):
+    """minimizar_afd contra a minimização por assinaturas."""
+    
+    def assertMesmoAFD(self, afd, esperado):
+        """Mesma quantidade de estados e mesmas palavras aceitas."""
+        self.assertEqual(len(afd.estados), len(esperado.estados))
+        for palavra in palavras(afd.alfabeto | esperado.alfabeto):
+            self.assertEqual(
+                reconhecer_palavra(afd, palavra), reconhecer_palavra(esperado, palavra),
+                f"palavra {''.join(palavra)!r}"
+            )
+    
+    def test_afd_completo(self):
+        for gramatica in gerar_gramaticas(1):
+            with self.subTest(gramatica=gramatica):
+                completo = completar_com_estado_poco(afd_alcancavel(*gramatica))
+                self.assertMesmoAFD(minimizar_afd(completo), minimizar_por_assinaturas(completo))
+    
+    def test_afd_incompleto(self):
+        # Transições indefinidas são um destino distinto de todos os estados
+        for gramatica in gerar_gramaticas(2):
+            with self.subTest(gramatica=gramatica):
+                afd = afd_alcancavel(*gramatica)
+                self.assertMesmoAFD(minimizar_afd(afd), minimizar_por_assinaturas(afd))
+    
+    def test_poco_implicito(self):
+        for gramatica in gerar_gramaticas(3):
+            with self.subTest(gramatica=gramatica):
+                afd = afd_alcancavel(*gramatica)
+                afd_minimo = minimizar_afd(afd, poco_implicito=True)
+                self.assertMesmoAFD(afd_minimo, pipeline_anterior(afd))
+                
+                # Mesmo resultado, inclusive nos nomes, das três etapas atuais
+                explicito = remover_estado_poco(minimizar_afd(completar_com_estado_poco(afd)))
+                self.assertEqual(afd_minimo.estados, explicito.estados)
+                self.assertEqual(afd_minimo.estados_finais, explicito.estados_finais)
+                self.assertEqual(afd_minimo.transicoes, explicito.transicoes)
+    
+    def test_rotulos_uniao(self):
+        gramaticas = gerar_gramaticas(4)
+        
+        for inicio in range(0, NUM_GRAMATICAS, 4):
+            grupo = {i: gramaticas[i] for i in range(inicio, inicio + 4)}
+            with self.subTest(gramaticas=list(grupo)):
+                classificador = compilar_uniao(grupo)
+                
+                afns = [converter_gramatica_para_afn(*grupo[i]) for i in grupo]
+                afd, rotulos = determinizar_uniao(afns)
+                completo = completar_com_estado_poco(afd)
+                esperado = remover_estado_poco(minimizar_por_assinaturas(completo, rotulos))
+                self.assertEqual(len(classificador.afd.estados), len(esperado.estados))
+                
+                minimos = {i: pipeline_anterior(afd_alcancavel(*grupo[i])) for i in grupo}
+                for palavra in palavras(afd.alfabeto):
+                    aceitas = frozenset(i for i, afd_minimo in minimos.items()
+                                        if reconhecer_palavra(afd_minimo, palavra))
+                    self.assertEqual(classificador.classificar(palavra), aceitas,
+                                     f"palavra {''.join(palavra)!r}")
+    
+    def test_compilador_incremental(self):
+        gramaticas = gerar_gramaticas(5)
+        
+        # Cada gramática vira uma nova versão da anterior (mesmo inicial)
+        gramatica, inicial = gramaticas[0]
+        compilador = CompiladorIncremental(gramatica, inicial)
+        afd_minimo = compilador.afd_minimo()
+        
+        for proxima, proximo_inicial in gramaticas[1:]:
+            if proximo_inicial != inicial:
+                continue
+            with self.subTest(gramatica=gramatica):
+                self.assertMesmoAFD(afd_minimo, pipeline_anterior(afd_alcancavel(gramatica, inicial)))
+            gramatica = proxima
+            afd_minimo = compilador.recarregar(gramatica)
+        
+        self.assertMesmoAFD(afd_minimo, pipeline_anterior(afd_alcancavel(gramatica, inicial)))
+
+
+if __name__ == '__main__':
+    unittest.main()
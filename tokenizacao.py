@@ -0,0 +1,140 @@
+"""
+Módulo de reconhecimento de texto com terminais de vários caracteres.
+
+Gramáticas com terminais como 'if<A>' ou 'ab<B>' geram AFDs cujo
+alfabeto tem símbolos de vários caracteres ('if', 'ab'). Este módulo é
+responsável por:
+- Montar uma árvore de prefixos (trie) com os símbolos do alfabeto
+- Segmentar o texto em símbolos pelo casamento mais longo (maximal
+  munch), de forma determinística e sem retrocesso na segmentação
+- Reconhecer o texto em uma única passada, segmentando e percorrendo a
+  tabela do AFD compilado ao mesmo tempo
+
+Custo: em cada posição, a trie é percorrida no máximo pelo comprimento
+do maior símbolo, então o tempo é linear no tamanho do texto (com fator
+limitado por esse comprimento, que depende só da gramática).
+
+O casamento mais longo escolhe uma única segmentação: com os símbolos
+'a', 'b' e 'ab', o texto 'ab' vira sempre ['ab']. Se a linguagem depende
+de outras segmentações, converta a gramática com expandir_terminais=True
+(ver conversao.py), que reconhece o texto caractere a caractere.
+"""
+
+from compilado import como_compilado
+
+
+class Tokenizador:
+    """
+    Segmentador de texto nos símbolos de um alfabeto.
+    
+    A trie é guardada em listas paralelas: filhos[no] = {caractere: no}
+    e simbolos[no] = símbolo que termina no nó (ou None). O nó 0 é a raiz.
+    """
+    
+    def __init__(self, alfabeto):
+        self.filhos = [{}]
+        self.simbolos = [None]
+        
+        for simbolo in sorted(alfabeto):
+            no = 0
+            for caractere in simbolo:
+                proximo = self.filhos[no].get(caractere)
+                if proximo is None:
+                    proximo = len(self.filhos)
+                    self.filhos[no][caractere] = proximo
+                    self.filhos.append({})
+                    self.simbolos.append(None)
+                no = proximo
+            self.simbolos[no] = simbolo
+    
+    def proximo_simbolo(self, texto, inicio):
+        """
+        Encontra o maior símbolo do alfabeto que começa em 'inicio'.
+        
+        Retorna: (símbolo, posição seguinte), ou (None, inicio) se nenhum
+        símbolo começa nessa posição
+        """
+        filhos = self.filhos
+        simbolos = self.simbolos
+        simbolo = None
+        fim = inicio
+        no = 0
+        
+        for i in range(inicio, len(texto)):
+            no = filhos[no].get(texto[i])
+            if no is None:
+                break
+            if simbolos[no] is not None:
+                simbolo = simbolos[no]
+                fim = i + 1
+        
+        return simbolo, fim
+    
+    def segmentar(self, texto):
+        """
+        Divide o texto em símbolos pelo casamento mais longo.
+        Lança ValueError se algum trecho não começa com um símbolo.
+        
+        Retorna: lista de símbolos
+        """
+        simbolos = []
+        posicao = 0
+        
+        while posicao < len(texto):
+            simbolo, posicao_seguinte = self.proximo_simbolo(texto, posicao)
+            if simbolo is None:
+                raise ValueError(
+                    f"Nenhum símbolo do alfabeto na posição {posicao}: "
+                    f"{texto[posicao:posicao + 10]!r}"
+                )
+            simbolos.append(simbolo)
+            posicao = posicao_seguinte
+        
+        return simbolos
+
+
+class ReconhecedorTokenizado:
+    """
+    Reconhece texto com um AFD cujo alfabeto tem símbolos de vários
+    caracteres, segmentando e percorrendo a tabela na mesma passada.
+    
+    Atributos:
+        compilado: AFDCompilado do AFD
+        tokenizador: Tokenizador com o alfabeto do AFD
+    """
+    
+    def __init__(self, afd):
+        self.compilado = como_compilado(afd)
+        self.tokenizador = Tokenizador(self.compilado.indice_simbolo)
+    
+    def reconhecer(self, texto):
+        """
+        Retorna True se a segmentação do texto pelo casamento mais longo
+        é aceita pelo AFD. O texto é rejeitado assim que um trecho não
+        começa com um símbolo ou a tabela leva a um estado morto.
+        """
+        compilado = self.compilado
+        tabela = compilado.tabela
+        indice_simbolo = compilado.indice_simbolo
+        k = len(compilado.simbolos)
+        proximo_simbolo = self.tokenizador.proximo_simbolo
+        estado = 0
+        posicao = 0
+        
+        while posicao < len(texto):
+            simbolo, posicao = proximo_simbolo(texto, posicao)
+            if simbolo is None:
+                return False
+            estado = tabela[estado * k + indice_simbolo[simbolo]]
+            if estado < 0:
+                return False
+        
+        return compilado.eh_final(estado)
+
+
+def reconhecer_texto(afd, texto):
+    """
+    Atalho para ReconhecedorTokenizado(afd).reconhecer(texto).
+    Para reconhecer muitos textos, crie o reconhecedor uma vez.
+    """
+    return ReconhecedorTokenizado(afd).reconhecer(texto)
@@ -0,0 +1,230 @@
+"""
+Módulo de união rotulada de várias gramáticas.
+
+Este módulo é responsável por:
+- Compilar várias gramáticas em um único AFD, em que cada estado final
+  carrega o conjunto de gramáticas que aceitam as palavras que terminam
+  nele (rótulo)
+- Minimizar esse AFD sem misturar rótulos diferentes
+- Classificar uma palavra contra todas as gramáticas em uma única
+  passada
+
+Construção:
+    1. Cada gramática é convertida em AFN (converter_gramatica_para_afn)
+    2. Os AFNs são numerados juntos, com estados disjuntos, em um único
+       AFNIndexado cujo conjunto inicial tem o estado inicial de cada um
+    3. A construção de subconjuntos sobre esse AFN é a construção do
+       produto: cada subconjunto guarda em que estado cada gramática está.
+       O rótulo de um subconjunto é o conjunto das gramáticas que têm um
+       estado final nele
+    4. minimizar_afd recebe os rótulos: a partição inicial separa os
+       estados finais por rótulo, e o AFD mínimo mantém os rótulos
+
+O AFD da união pode ter até o produto dos tamanhos dos AFDs das
+gramáticas. Isso não acontece com gramáticas que se distinguem logo nos
+primeiros símbolos (palavras-chave, classes de tokens), mas várias
+gramáticas com ciclos longos e independentes podem explodir; nesse caso,
+compile-as em grupos menores.
+
+Uso:
+    classificador = compilar_uniao({'inteiro': (gramatica1, 'S'),
+                                    'hexa': (gramatica2, 'H')})
+    classificador.classificar('0a1')  # frozenset({'hexa'})
+"""
+
+from collections import deque
+
+from automato import Automato
+from conversao import AFNIndexado, converter_gramatica_para_afn, construir_subconjuntos
+from minimizacao import minimizar_afd
+from compilado import compilar
+
+
+# Rótulo dos estados que não aceitam nenhuma gramática
+SEM_ROTULO = frozenset()
+
+
+def indexar_uniao(afns):
+    """
+    Numera os estados de vários AFNs em um único AFNIndexado.
+    
+    O estado 'e' do AFN de posição i recebe o nome 'i:e'; os conjuntos
+    de estados dos AFNs ficam disjuntos, e o conjunto inicial reúne os
+    estados iniciais de todos.
+    
+    Retorna: (AFNIndexado, dono), onde dono[j] é a posição do AFN ao qual
+    pertence o estado de índice j
+    """
+    simbolos = sorted(set().union(*(afn.alfabeto for afn in afns)))
+    coluna_simbolo = {simbolo: c for c, simbolo in enumerate(simbolos)}
+    
+    nomes = []
+    dono = []
+    indice_estado = {}
+    for i, afn in enumerate(afns):
+        for estado in sorted(afn.estados):
+            indice_estado[(i, estado)] = len(nomes)
+            nomes.append(f"{i}:{estado}")
+            dono.append(i)
+    
+    indexado = AFNIndexado(nomes=nomes, simbolos=simbolos)
+    
+    for i, afn in enumerate(afns):
+        indexado.inicial |= 1 << indice_estado[(i, afn.estado_inicial)]
+        for estado in afn.estados_finais:
+            indexado.finais |= 1 << indice_estado[(i, estado)]
+        
+        for estado in sorted(afn.estados):
+            saidas_estado = []
+            for simbolo, destinos in afn.transicoes.get(estado, {}).items():
+                mascara = 0
+                for destino in destinos:
+                    mascara |= 1 << indice_estado[(i, destino)]
+                saidas_estado.append((coluna_simbolo[simbolo], mascara))
+            indexado.saidas.append(sorted(saidas_estado))
+    
+    return indexado, dono
+
+
+def determinizar_uniao(afns, contadores=None):
+    """
+    Determiniza a união dos AFNs (construção do produto sobre
+    subconjuntos), com os estados nomeados 'D0', 'D1', ... na ordem de
+    descoberta.
+    
+    Se 'contadores' (dict) for informado, registra
+    'subconjuntos_explorados'.
+    
+    Retorna: (AFD, rotulos), onde rotulos[estado] é o frozenset das
+    posições dos AFNs que aceitam no estado (só para estados finais)
+    """
+    indexado, dono = indexar_uniao(afns)
+    conjuntos, transicoes = construir_subconjuntos(indexado)
+    
+    if contadores is not None:
+        contadores['subconjuntos_explorados'] = len(conjuntos)
+    
+    nomes_afd = ['D' + str(i) for i in range(len(conjuntos))]
+    simbolos = indexado.simbolos
+    
+    afd = Automato()
+    afd.alfabeto = set(simbolos)
+    afd.definir_estado_inicial(nomes_afd[0])
+    rotulos = {}
+    
+    for i, conjunto in enumerate(conjuntos):
+        nome = nomes_afd[i]
+        afd.adicionar_estado(nome)
+        
+        # Rótulo: AFNs com algum estado final no subconjunto
+        aceitos = conjunto & indexado.finais
+        if aceitos:
+            rotulo = set()
+            while aceitos:
+                bit = aceitos & -aceitos
+                aceitos ^= bit
+                rotulo.add(dono[bit.bit_length() - 1])
+            rotulos[nome] = frozenset(rotulo)
+            afd.adicionar_estado_final(nome)
+        
+        linha = transicoes[i]
+        transicoes[i] = None
+        for coluna, destino in linha.items():
+            afd.adicionar_transicao_afd(nome, simbolos[coluna], nomes_afd[destino])
+    
+    return afd, rotulos
+
+
+def transferir_rotulos(afd, afd_minimo, rotulos):
+    """
+    Leva os rótulos dos estados de um AFD para os estados do AFD mínimo
+    equivalente, percorrendo os dois juntos a partir dos estados iniciais.
+    
+    Retorna: dict {estado do AFD mínimo: rótulo}
+    """
+    rotulos_minimo = {}
+    visitados = {afd_minimo.estado_inicial}
+    fila = deque([(afd.estado_inicial, afd_minimo.estado_inicial)])
+    
+    while fila:
+        estado, estado_minimo = fila.popleft()
+        if estado in rotulos:
+            rotulos_minimo[estado_minimo] = rotulos[estado]
+        
+        transicoes_estado = afd.transicoes.get(estado, {})
+        for simbolo, destino_minimo in afd_minimo.transicoes.get(estado_minimo, {}).items():
+            if destino_minimo not in visitados:
+                visitados.add(destino_minimo)
+                fila.append((transicoes_estado[simbolo], destino_minimo))
+    
+    return rotulos_minimo
+
+
+class ClassificadorUniao:
+    """
+    AFD mínimo da união rotulada de várias gramáticas.
+    
+    Atributos:
+        identificadores: Tupla com o identificador de cada gramática
+        afd: AFD mínimo (Automato); seus estados finais são os que
+             aceitam ao menos uma gramática
+        rotulos: dict {estado final do AFD: frozenset de identificadores}
+        compilado: AFDCompilado do AFD, usado por classificar
+    """
+    
+    def __init__(self, identificadores, afd, rotulos):
+        self.identificadores = tuple(identificadores)
+        self.afd = afd
+        self.rotulos = rotulos
+        self.compilado = compilar(afd)
+        self._rotulo_indice = tuple(
+            rotulos.get(nome, SEM_ROTULO) for nome in self.compilado.nomes_estados
+        )
+    
+    def classificar(self, palavra):
+        """
+        Percorre a palavra uma única vez e retorna o frozenset dos
+        identificadores das gramáticas que a aceitam (vazio se nenhuma).
+        """
+        compilado = self.compilado
+        tabela = compilado.tabela
+        indice_simbolo = compilado.indice_simbolo
+        k = len(compilado.simbolos)
+        estado = 0
+        
+        for simbolo in palavra:
+            coluna = indice_simbolo.get(simbolo)
+            if coluna is None:
+                return SEM_ROTULO
+            estado = tabela[estado * k + coluna]
+            if estado < 0:
+                return SEM_ROTULO
+        
+        return self._rotulo_indice[estado]
+
+
+def compilar_uniao(gramaticas, contadores=None):
+    """
+    Compila várias gramáticas em um único AFD mínimo rotulado.
+    
+    'gramaticas' é um dict {identificador: (gramatica, nao_terminal_inicial)},
+    como retornado por parsear_gramatica para cada uma.
+    
+    Se 'contadores' (dict) for informado, registra os contadores da
+    determinização e da minimização.
+    
+    Retorna: ClassificadorUniao
+    """
+    identificadores = list(gramaticas)
+    afns = [converter_gramatica_para_afn(*gramaticas[i]) for i in identificadores]
+    
+    afd, rotulos = determinizar_uniao(afns, contadores)
+    del afns
+    
+    afd_minimo = minimizar_afd(afd, contadores, poco_implicito=True, rotulos=rotulos)
+    rotulos_minimo = {
+        estado: frozenset(identificadores[i] for i in rotulo)
+        for estado, rotulo in transferir_rotulos(afd, afd_minimo, rotulos).items()
+    }
+    
+    return ClassificadorUniao(identificadores, afd_minimo, rotulos_minimo)